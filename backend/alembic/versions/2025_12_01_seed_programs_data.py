@@ -9,10 +9,12 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.sql import text
 import json
-import os
-from pathlib import Path
+import re
 import uuid
 from datetime import datetime
+from pathlib import Path
+
+from app.core.bulk_load import load_rows
 
 # revision identifiers, used by Alembic.
 revision = 'seed_programs_001'
@@ -20,6 +22,84 @@ down_revision = None
 branch_labels = None
 depends_on = None
 
+# The programs table as of this revision, frozen here so later model changes
+# do not change what this migration writes
+programs = sa.table(
+    'programs',
+    sa.column('id', sa.String),
+    sa.column('university_name', sa.String),
+    sa.column('program_name', sa.String),
+    sa.column('degree_type', sa.String),
+    sa.column('country', sa.String),
+    sa.column('program_url', sa.String),
+    sa.column('deadline', sa.DateTime),
+    sa.column('description', sa.Text),
+    sa.column('required_documents', sa.JSON),
+    sa.column('tags', sa.JSON),
+    sa.column('features', sa.JSON),
+    sa.column('english_test_required', sa.Boolean),
+    sa.column('average_match_score', sa.Float),
+    sa.column('is_active', sa.Boolean),
+    sa.column('is_featured', sa.Boolean),
+    sa.column('created_at', sa.DateTime),
+    sa.column('updated_at', sa.DateTime),
+)
+COLUMNS = [column.name for column in programs.columns]
+# Lengths of the String columns at this revision
+MAX_LENGTHS = {'university_name': 255, 'program_name': 255, 'degree_type': 50, 'country': 100, 'program_url': 500}
+
+
+def _text(value):
+    if value is None:
+        return None
+    value = re.sub(r'\s+', ' ', str(value)).strip()
+    return value or None
+
+
+def _deadline(value):
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def seed_rows(seed_data, now):
+    """Rows in COLUMNS order and (record, reason) rejections; a frozen copy of the seed normalization"""
+    rows, rejected, seen_urls = [], [], set()
+    for program in seed_data:
+        values = {
+            'university_name': _text(program.get('university')),
+            'program_name': _text(program.get('title')),
+            'degree_type': _text(program.get('degree_type')) or 'Other',
+            'country': _text(program.get('country')) or 'Not Specified',
+            'program_url': _text(program.get('program_url')),
+        }
+        if not values['university_name'] or not values['program_name']:
+            rejected.append((program, 'missing university or title'))
+            continue
+        if values['program_url'] and values['program_url'] in seen_urls:
+            rejected.append((program, 'duplicate program'))
+            continue
+        seen_urls.add(values['program_url'])
+        values = {name: value[:MAX_LENGTHS[name]] if value else value for name, value in values.items()}
+        requirements = _text(program.get('requirements'))
+        values.update(
+            id=str(uuid.uuid4()),
+            deadline=_deadline(program.get('deadline')),
+            description=_text(program.get('description')),
+            required_documents=[requirements] if requirements else None,
+            tags=[],
+            features=[],
+            english_test_required=True,
+            average_match_score=0.0,
+            is_active=True,
+            is_featured=False,
+            created_at=now,
+            updated_at=now,
+        )
+        rows.append(tuple(values[name] for name in COLUMNS))
+    return rows, rejected
+
 
 def upgrade() -> None:
     """
@@ -50,64 +130,14 @@ def upgrade() -> None:
     
     print(f"Loading {len(seed_data)} programs into database...")
     
-    # Prepare insert statement
-    insert_query = text("""
-        INSERT INTO programs (
-            id, university_name, program_name, degree_type, country, 
-            program_url, deadline, description, required_documents,
-            created_at, updated_at
-        ) VALUES (
-            :id, :university_name, :program_name, :degree_type, :country,
-            :program_url, :deadline, :description, :required_documents,
-            :created_at, :updated_at
-        )
-    """)
+    # One bulk load (COPY on PostgreSQL); the catalog sync columns are added
+    # and backfilled by a later revision
+    rows, rejected = seed_rows(seed_data, datetime.utcnow())
+    for program, reason in rejected:
+        print(f"Skipped program '{program.get('title')}': {reason}")
+    report = load_rows(connection, programs, COLUMNS, rows)
     
-    # Insert each program
-    inserted_count = 0
-    for program in seed_data:
-        try:
-            # Generate UUID for program
-            program_id = str(uuid.uuid4())
-            now = datetime.utcnow()
-            
-            # Map JSON fields to database columns
-            # title -> program_name
-            # university -> university_name
-            # program_url -> program_url
-            # country -> country
-            # degree_type -> degree_type
-            # requirements -> required_documents (as JSON)
-            # description -> description
-            
-            # Prepare required_documents as JSON if requirements exists
-            required_docs = None
-            if program.get('requirements'):
-                required_docs = json.dumps([program['requirements']])
-            
-            # Use defaults for required NOT NULL fields
-            degree_type = program.get('degree_type') or 'Other'
-            country = program.get('country') or 'Not Specified'
-            
-            connection.execute(insert_query, {
-                'id': program_id,
-                'university_name': program.get('university'),
-                'program_name': program.get('title'),
-                'degree_type': degree_type,
-                'country': country,
-                'program_url': program.get('program_url'),
-                'deadline': program.get('deadline'),
-                'description': program.get('description'),
-                'required_documents': required_docs,
-                'created_at': now,
-                'updated_at': now
-            })
-            inserted_count += 1
-        except Exception as e:
-            print(f"Error inserting program '{program.get('title')}': {str(e)}")
-            continue
-    
-    print(f"Successfully inserted {inserted_count} programs into database.")
+    print(f"Successfully inserted {report.rows} programs into database ({report.rows_per_second:,.0f} rows/s).")
 
 
 def downgrade() -> None:
@@ -128,16 +158,13 @@ def downgrade() -> None:
     with open(json_path, 'r', encoding='utf-8') as f:
         seed_data = json.load(f)
     
-    # Delete programs by matching program_url
-    delete_query = text("DELETE FROM programs WHERE program_url = :url")
-    
-    deleted_count = 0
-    for program in seed_data:
-        try:
-            result = connection.execute(delete_query, {'url': program.get('program_url')})
-            deleted_count += result.rowcount
-        except Exception as e:
-            print(f"Error deleting program '{program.get('title')}': {str(e)}")
-            continue
+    # Delete programs by matching program_url, in one statement
+    urls = [program['program_url'] for program in seed_data if program.get('program_url')]
+    if not urls:
+        return
+    delete_query = text("DELETE FROM programs WHERE program_url IN :urls").bindparams(
+        sa.bindparam('urls', expanding=True)
+    )
+    result = connection.execute(delete_query, {'urls': urls})
     
-    print(f"Successfully deleted {deleted_count} programs from database.")
+    print(f"Successfully deleted {result.rowcount} programs from database.")
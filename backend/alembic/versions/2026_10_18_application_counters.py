@@ -0,0 +1,55 @@
+"""application_counters
+
+Revision ID: application_counters_004
+Revises: partition_notifications_003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+import re
+
+# revision identifiers, used by Alembic.
+revision = 'application_counters_004'
+down_revision = 'partition_notifications_003'
+branch_labels = None
+depends_on = None
+
+APPLICATION_NUMBER_RE = re.compile(r'^([A-Z0-9]+)-(\d{4})-(\d+)$')
+
+
+def upgrade() -> None:
+    """
+    Add the per-(prefix, year) counter table used to allocate application
+    numbers, seeded with the highest number already in use, and allow
+    applications for programs without a deadline.
+    """
+    counters = op.create_table(
+        'application_counters',
+        sa.Column('prefix', sa.String(length=10), primary_key=True),
+        sa.Column('year', sa.Integer(), primary_key=True),
+        sa.Column('value', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    connection = op.get_bind()
+    highest = {}
+    for (application_id,) in connection.execute(text("SELECT application_id FROM applications")):
+        match = APPLICATION_NUMBER_RE.match(application_id or '')
+        if not match:
+            continue
+        key = (match.group(1), int(match.group(2)))
+        highest[key] = max(highest.get(key, 0), int(match.group(3)))
+
+    if highest:
+        op.bulk_insert(counters, [
+            {'prefix': prefix, 'year': year, 'value': value}
+            for (prefix, year), value in highest.items()
+        ])
+
+    op.alter_column('applications', 'deadline', existing_type=sa.DateTime(), nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('applications', 'deadline', existing_type=sa.DateTime(), nullable=False)
+    op.drop_table('application_counters')
@@ -0,0 +1,91 @@
+"""catalog_sync
+
+Revision ID: catalog_sync_005
+Revises: application_counters_004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.program_import import SYNCED_FIELDS, content_hash, natural_key
+
+# revision identifiers, used by Alembic.
+revision = 'catalog_sync_005'
+down_revision = 'application_counters_004'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 1000
+
+
+def upgrade() -> None:
+    """
+    Add the natural key and content hash used by the catalog sync, backfilled
+    for existing programs, and the program change log.
+    """
+    op.add_column('programs', sa.Column('natural_key', sa.String(length=64), nullable=True))
+    op.add_column('programs', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    programs = sa.table(
+        'programs',
+        sa.column('id', sa.String),
+        sa.column('natural_key', sa.String),
+        sa.column('content_hash', sa.String),
+        sa.column('created_at', sa.DateTime),
+        sa.column('university_name', sa.String),
+        sa.column('program_name', sa.String),
+        sa.column('degree_type', sa.String),
+        sa.column('country', sa.String),
+        sa.column('program_url', sa.String),
+        sa.column('deadline', sa.DateTime),
+        sa.column('description', sa.Text),
+        sa.column('required_documents', sa.JSON),
+    )
+
+    # Oldest row wins when several existing programs share a key; the others
+    # keep a NULL key and are left alone by the sync
+    connection = op.get_bind()
+    seen = set()
+    updates = []
+    rows = connection.execute(
+        sa.select(programs.c.id, *[programs.c[name] for name in SYNCED_FIELDS])
+        .order_by(programs.c.created_at, programs.c.id)
+    ).mappings()
+    for row in rows:
+        key = natural_key(row['program_url'], row['university_name'], row['program_name'])
+        if key in seen:
+            continue
+        seen.add(key)
+        updates.append({'row_id': row['id'], 'natural_key': key, 'content_hash': content_hash(row)})
+
+    statement = (
+        programs.update()
+        .where(programs.c.id == sa.bindparam('row_id'))
+        .values(natural_key=sa.bindparam('natural_key'), content_hash=sa.bindparam('content_hash'))
+    )
+    for start in range(0, len(updates), BACKFILL_BATCH):
+        connection.execute(statement, updates[start:start + BACKFILL_BATCH])
+
+    op.create_index('ix_programs_natural_key', 'programs', ['natural_key'], unique=True)
+
+    op.create_table(
+        'program_changes',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('sync_id', sa.String(length=36), nullable=False),
+        sa.Column('program_id', sa.String(), nullable=False),
+        sa.Column('natural_key', sa.String(length=64), nullable=True),
+        sa.Column('change_type', sa.String(length=20), nullable=False),
+        sa.Column('changed_fields', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_program_changes_sync_id', 'program_changes', ['sync_id'])
+    op.create_index('ix_program_changes_program_id', 'program_changes', ['program_id'])
+    op.create_index('ix_program_changes_created_at', 'program_changes', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('program_changes')
+    op.drop_index('ix_programs_natural_key', table_name='programs')
+    op.drop_column('programs', 'content_hash')
+    op.drop_column('programs', 'natural_key')
@@ -0,0 +1,31 @@
+"""deadline_reminders
+
+Revision ID: deadline_reminders_002
+Revises: seed_programs_001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'deadline_reminders_002'
+down_revision = 'seed_programs_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add the (deadline, id) index used by the deadline reminder range scan
+    and the dedupe key used to avoid sending the same reminder twice.
+    """
+    op.create_index('ix_applications_deadline_id', 'applications', ['deadline', 'id'])
+    op.add_column('notifications', sa.Column('dedupe_key', sa.String(length=150), nullable=True))
+    op.create_index('ix_notifications_dedupe_key', 'notifications', ['dedupe_key'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_dedupe_key', table_name='notifications')
+    op.drop_column('notifications', 'dedupe_key')
+    op.drop_index('ix_applications_deadline_id', table_name='applications')
@@ -0,0 +1,125 @@
+"""partition_notifications_activities
+
+Revision ID: partition_notifications_003
+Revises: deadline_reminders_002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+from datetime import datetime
+
+from app.core.partitioning import (
+    add_months,
+    create_default_partition_sql,
+    month_start,
+    partition_range_sql,
+)
+
+# revision identifiers, used by Alembic.
+revision = 'partition_notifications_003'
+down_revision = 'deadline_reminders_002'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+# Constraints and indexes are not copied by CREATE TABLE ... (LIKE ...),
+# so they are recreated explicitly on the new partitioned parent.
+TABLES = {
+    'notifications': {
+        'foreign_keys': [
+            "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE",
+            "FOREIGN KEY (related_application_id) REFERENCES applications (id) ON DELETE SET NULL",
+            "FOREIGN KEY (related_program_id) REFERENCES programs (id) ON DELETE SET NULL",
+        ],
+        'indexes': {
+            'ix_notifications_user_id': ['user_id'],
+            'ix_notifications_is_read': ['is_read'],
+            'ix_notifications_created_at': ['created_at'],
+            'ix_notifications_dedupe_key': ['dedupe_key'],
+            'ix_notifications_user_id_created_at': ['user_id', 'created_at'],
+        },
+    },
+    'activities': {
+        'foreign_keys': [
+            "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE",
+            "FOREIGN KEY (related_application_id) REFERENCES applications (id) ON DELETE SET NULL",
+            "FOREIGN KEY (related_document_id) REFERENCES documents (id) ON DELETE SET NULL",
+            "FOREIGN KEY (related_program_id) REFERENCES programs (id) ON DELETE SET NULL",
+        ],
+        'indexes': {
+            'ix_activities_user_id': ['user_id'],
+            'ix_activities_created_at': ['created_at'],
+            'ix_activities_user_id_created_at': ['user_id', 'created_at'],
+        },
+    },
+}
+
+
+def _convert_to_partitioned(connection, table: str, spec: dict) -> None:
+    legacy = f"{table}_unpartitioned"
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+        f"PARTITION BY RANGE (created_at)"
+    )
+
+    # Partitions covering every existing row plus the upcoming months
+    oldest = connection.exec_driver_sql(f"SELECT MIN(created_at) FROM {legacy}").scalar()
+    current = month_start(datetime.utcnow())
+    first_month = month_start(oldest) if oldest else current
+    op.execute(create_default_partition_sql(table))
+    for statement in partition_range_sql(table, first_month, add_months(current, MONTHS_AHEAD)):
+        op.execute(statement)
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+    op.execute(f"DROP TABLE {legacy}")
+
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)")
+    for foreign_key in spec['foreign_keys']:
+        op.execute(f"ALTER TABLE {table} ADD {foreign_key}")
+    for name, columns in spec['indexes'].items():
+        op.create_index(name, table, columns)
+
+
+def _convert_to_plain(table: str, spec: dict) -> None:
+    legacy = f"{table}_partitioned"
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+    op.execute(f"DROP TABLE {legacy} CASCADE")
+
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+    for foreign_key in spec['foreign_keys']:
+        op.execute(f"ALTER TABLE {table} ADD {foreign_key}")
+    for name, columns in spec['indexes'].items():
+        if name != f"ix_{table}_user_id_created_at":
+            op.create_index(name, table, columns)
+
+
+def upgrade() -> None:
+    """
+    Convert notifications and activities into tables partitioned by month
+    on created_at. Other dialects only get the per-user recency index.
+    """
+    connection = op.get_bind()
+
+    if connection.dialect.name != 'postgresql':
+        for table in TABLES:
+            op.create_index(f"ix_{table}_user_id_created_at", table, ['user_id', 'created_at'])
+        return
+
+    for table, spec in TABLES.items():
+        _convert_to_partitioned(connection, table, spec)
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+
+    if connection.dialect.name != 'postgresql':
+        for table in TABLES:
+            op.drop_index(f"ix_{table}_user_id_created_at", table_name=table)
+        return
+
+    for table, spec in TABLES.items():
+        _convert_to_plain(table, spec)
@@ -0,0 +1,35 @@
+"""program_pages
+
+Revision ID: program_pages_006
+Revises: catalog_sync_005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'program_pages_006'
+down_revision = 'catalog_sync_005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Fetch cache of the program page enrichment crawler"""
+    op.create_table(
+        'program_pages',
+        sa.Column('program_id', sa.String(), primary_key=True),
+        sa.Column('url', sa.String(length=500), nullable=False),
+        sa.Column('etag', sa.String(length=255), nullable=True),
+        sa.Column('last_modified', sa.String(length=64), nullable=True),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('error', sa.String(length=255), nullable=True),
+        sa.Column('extracted', sa.JSON(), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_program_pages_fetched_at', 'program_pages', ['fetched_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('program_pages')
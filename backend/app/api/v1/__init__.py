@@ -1,23 +1,42 @@
 """
 API v1 Router - combines all endpoint routers
+
+Endpoint modules are listed by name and imported when the router is built,
+skipping the ones in API_DISABLED_ROUTERS, so a worker dedicated to part of
+the API does not import (or serve) the rest.
 """
+from typing import Iterable
+
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import (
-    auth,
-    programs,
-    applications,
-    documents,
-    notifications,
-    dashboard
+from app.core.config import settings
+from app.core.plugins import import_string
+
+# (endpoint module, prefix, tag)
+ROUTERS = (
+    ("auth", "/auth", "Authentication"),
+    ("programs", "/programs", "Programs"),
+    ("applications", "/applications", "Applications"),
+    ("documents", "/documents", "Documents"),
+    ("notifications", "/notifications", "Notifications"),
+    ("dashboard", "/dashboard", "Dashboard"),
+    ("bootstrap", "/bootstrap", "Bootstrap"),
+    ("admin", "/admin", "Admin"),
 )
 
-api_router = APIRouter()
 
-# Include all endpoint routers
-api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-api_router.include_router(programs.router, prefix="/programs", tags=["Programs"])
-api_router.include_router(applications.router, prefix="/applications", tags=["Applications"])
-api_router.include_router(documents.router, prefix="/documents", tags=["Documents"])
-api_router.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+def build_api_router(disabled: Iterable[str] = ()) -> APIRouter:
+    disabled = set(disabled)
+    unknown = disabled - {module for module, _, _ in ROUTERS}
+    if unknown:
+        raise ValueError(f"Unknown routers in API_DISABLED_ROUTERS: {', '.join(sorted(unknown))}")
+
+    router = APIRouter()
+    for module, prefix, tag in ROUTERS:
+        if module in disabled:
+            continue
+        router.include_router(import_string(f"app.api.v1.endpoints.{module}:router"), prefix=prefix, tags=[tag])
+    return router
+
+
+api_router = build_api_router(settings.get_disabled_routers())
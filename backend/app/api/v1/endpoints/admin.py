@@ -0,0 +1,153 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from typing import List, Optional
+from datetime import datetime
+
+from app.core.profiling import profile_store, profiling_config, pyinstrument_profiler
+from app.core.query_stats import query_stats
+from app.core.responses import StreamingJSONArrayResponse, stream_rows
+from app.models.user import User
+from app.models.program import Program
+from app.models.application import Application, ApplicationStatus
+from app.dependencies.auth import get_current_admin_user
+from app.schemas.program import PROGRAM_FIELDS
+from app.schemas.application import APPLICATION_FIELDS
+from app.schemas.admin import ProfilingConfigResponse, ProfilingConfigUpdate
+
+router = APIRouter()
+
+
+@router.get("/export/programs")
+async def export_programs(
+    fields: Optional[str] = Query(None, description="Comma-separated program fields"),
+    view: Optional[str] = Query(None, description="Named fieldset: summary or detail"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Export the whole program catalog as a streamed JSON array (admin only)"""
+    query = (
+        select(*PROGRAM_FIELDS.columns(PROGRAM_FIELDS.resolve(fields, view)))
+        .order_by(Program.id)
+    )
+    
+    return StreamingJSONArrayResponse(
+        stream_rows(query),
+        filename=f"programs-{datetime.utcnow():%Y%m%d}.json"
+    )
+
+
+@router.get("/export/applications")
+async def export_applications(
+    status: Optional[ApplicationStatus] = None,
+    created_after: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated application fields"),
+    view: Optional[str] = Query(None, description="Named fieldset: summary or detail"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Export applications of all users as a streamed JSON array (admin only)"""
+    application_fields = APPLICATION_FIELDS.resolve(fields, view)
+    if "user_id" not in application_fields:
+        application_fields.insert(1, "user_id")
+    
+    query = select(*APPLICATION_FIELDS.columns(application_fields))
+    
+    if status:
+        query = query.where(Application.status == status)
+    
+    if created_after:
+        query = query.where(Application.created_at >= created_after)
+    
+    query = query.order_by(Application.created_at, Application.id)
+    
+    return StreamingJSONArrayResponse(
+        stream_rows(query),
+        filename=f"applications-{datetime.utcnow():%Y%m%d}.json"
+    )
+
+
+def _profiling_config_response() -> ProfilingConfigResponse:
+    return ProfilingConfigResponse(
+        **profiling_config.__dict__,
+        call_tree_profiler="pyinstrument" if pyinstrument_profiler.available else "cProfile"
+    )
+
+
+@router.get("/profiling", response_model=ProfilingConfigResponse)
+async def get_profiling_config(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Current profiling settings of this worker (admin only)"""
+    return _profiling_config_response()
+
+
+@router.patch("/profiling", response_model=ProfilingConfigResponse)
+async def update_profiling_config(
+    config_data: ProfilingConfigUpdate,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Change profiling settings of this worker at runtime (admin only)"""
+    update_data = config_data.model_dump(exclude_unset=True, exclude_none=True)
+    for field, value in update_data.items():
+        setattr(profiling_config, field, value)
+    
+    if "buffer_size" in update_data:
+        profile_store.resize(profiling_config.buffer_size)
+    
+    return _profiling_config_response()
+
+
+@router.get("/profiles", response_model=List[dict])
+async def list_profiles(
+    slow_only: bool = False,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Most recent request profiles, newest first (admin only)"""
+    return [
+        profile.summary()
+        for profile in profile_store.list()
+        if profile.slow or not slow_only
+    ]
+
+
+@router.get("/profiles/{profile_id}", response_model=dict)
+async def get_profile(
+    profile_id: int,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Full profile with SQL statements and call tree (admin only)"""
+    profile = profile_store.get(profile_id)
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    return profile.to_dict()
+
+
+@router.delete("/profiles", status_code=204)
+async def clear_profiles(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Empty the profile buffer (admin only)"""
+    profile_store.clear()
+    
+    return None
+
+
+@router.get("/query-stats", response_model=dict)
+async def get_query_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """SQL statements, database time and affected rows per route for this worker (admin only)"""
+    return {
+        "n_plus_one_threshold": query_stats.n_plus_one_threshold,
+        "routes": query_stats.snapshot(),
+    }
+
+
+@router.delete("/query-stats", status_code=204)
+async def reset_query_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Reset the per-route SQL statistics (admin only)"""
+    query_stats.reset()
+    
+    return None
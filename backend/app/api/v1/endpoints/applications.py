@@ -1,36 +1,88 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, insert
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from datetime import datetime
+from collections import defaultdict
+import uuid
 
 from app.core.database import get_db
 from app.models.user import User
 from app.models.application import Application, ApplicationStatus
 from app.models.program import Program
-from app.models.activity import Activity
+from app.models.activity import ActivityType
+from app.services.activity_recorder import activity_recorder
+from app.services.application_numbers import (
+    allocate_application_number,
+    allocate_application_numbers,
+    application_prefix
+)
 from app.dependencies.auth import get_current_active_user
 from app.schemas.application import (
     ApplicationResponse,
     ApplicationCreate,
     ApplicationUpdate,
-    ApplicationWithProgram
+    ApplicationWithProgram,
+    ApplicationBatchCreate,
+    ApplicationBatchItem,
+    ApplicationBatchResponse,
+    APPLICATION_FIELDS
 )
+from app.schemas.program import PROGRAM_FIELDS
 
 router = APIRouter()
 
 
+PROGRAM_PREFIX = "program__"
+
+# Update/submit only need the program's name for the activity entry
+PROGRAM_NAME_ONLY = PROGRAM_FIELDS.load_only(["university_name", "program_name"])
+
+
+def _application_with_program_query(application_fields=None, program_fields=None):
+    """Flat column select of applications joined to their program"""
+    application_fields = application_fields or APPLICATION_FIELDS.resolve()
+    program_fields = program_fields or PROGRAM_FIELDS.resolve()
+    return (
+        select(
+            *APPLICATION_FIELDS.columns(application_fields),
+            *[column.label(f"{PROGRAM_PREFIX}{column.key}") for column in PROGRAM_FIELDS.columns(program_fields)]
+        )
+        .select_from(Application)
+        .outerjoin(Program, Program.id == Application.program_id)
+    )
+
+
+def _application_with_program(row) -> dict:
+    item = {}
+    program = {}
+    for key, value in row.items():
+        if key.startswith(PROGRAM_PREFIX):
+            program[key[len(PROGRAM_PREFIX):]] = value
+        else:
+            item[key] = value
+    item["program"] = program if program["id"] is not None else {}
+    return item
+
+
 @router.get("/", response_model=List[ApplicationWithProgram])
 async def list_applications(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     status: Optional[ApplicationStatus] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated application fields"),
+    program_fields: Optional[str] = Query(None, description="Comma-separated program fields"),
+    view: Optional[str] = Query(None, description="Named fieldset: summary or detail"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get list of current user's applications"""
-    query = select(Application).options(selectinload(Application.program))
+    query = _application_with_program_query(
+        APPLICATION_FIELDS.resolve(fields, view),
+        PROGRAM_FIELDS.resolve(program_fields, view)
+    )
     query = query.where(Application.user_id == current_user.id)
     
     if status:
@@ -39,42 +91,30 @@ async def list_applications(
     query = query.offset(skip).limit(limit).order_by(Application.created_at.desc())
     
     result = await db.execute(query)
-    applications = result.scalars().all()
-    
-    # Convert to response format with program data
-    response = []
-    for app in applications:
-        app_dict = app.to_dict()
-        app_dict['program'] = app.program.to_dict() if app.program else {}
-        response.append(ApplicationWithProgram(**app_dict))
     
-    return response
+    # Rows go straight to JSON; response_model is kept for the OpenAPI schema only
+    return ORJSONResponse([_application_with_program(row) for row in result.mappings()])
 
 
 @router.get("/{application_id}", response_model=ApplicationWithProgram)
 async def get_application(
-    application_id: int,
+    application_id: str,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get specific application by ID"""
     result = await db.execute(
-        select(Application)
-        .options(selectinload(Application.program))
-        .where(and_(
+        _application_with_program_query().where(and_(
             Application.id == application_id,
             Application.user_id == current_user.id
         ))
     )
-    application = result.scalar_one_or_none()
+    row = result.mappings().one_or_none()
     
-    if not application:
+    if not row:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    app_dict = application.to_dict()
-    app_dict['program'] = application.program.to_dict() if application.program else {}
-    
-    return ApplicationWithProgram(**app_dict)
+    return ORJSONResponse(_application_with_program(row))
 
 
 @router.post("/", response_model=ApplicationResponse, status_code=201)
@@ -93,13 +133,9 @@ async def create_application(
     if not program:
         raise HTTPException(status_code=404, detail="Program not found")
     
-    # Generate application ID
-    app_count = await db.execute(
-        select(Application).where(Application.user_id == current_user.id)
-    )
-    count = len(app_count.scalars().all())
-    
-    application_id = f"{program.university[:3].upper()}-{datetime.now().year}-{count + 1:03d}"
+    # Generate application ID (atomic per-prefix counter, no table scan); the
+    # counter row stays locked until the commit below
+    application_id = await allocate_application_number(db, application_prefix(program.university_name))
     
     # Create application
     application = Application(
@@ -108,30 +144,128 @@ async def create_application(
         application_id=application_id,
         notes=application_data.notes,
         status=ApplicationStatus.DRAFT,
-        progress=0
+        deadline=program.deadline,
+        days_left=(program.deadline - datetime.utcnow()).days if program.deadline else None,
+        completion_percentage=0
     )
     
     db.add(application)
+    await db.commit()
+    await db.refresh(application)
     
     # Log activity
-    activity = Activity(
+    activity_recorder.record(
+        db,
         user_id=current_user.id,
-        action_type="application_created",
-        description=f"Started application for {program.program_name} at {program.university}",
-        related_entity_type="application",
-        related_entity_id=application.id
+        activity_type=ActivityType.APPLICATION_UPDATE,
+        title="Application started",
+        description=f"Started application for {program.program_name} at {program.university_name}",
+        related_application_id=application.id,
+        related_program_id=program.id
     )
-    db.add(activity)
-    
-    await db.commit()
-    await db.refresh(application)
     
     return application
 
 
+@router.post("/batch", response_model=ApplicationBatchResponse, status_code=201)
+async def create_applications_batch(
+    batch_data: ApplicationBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create applications for several programs in one transaction"""
+    # Keep the first occurrence of each program, report repeats
+    program_ids = list(dict.fromkeys(batch_data.program_ids))
+    
+    # Validate all programs with one query
+    program_result = await db.execute(
+        select(Program.id, Program.university_name, Program.program_name, Program.deadline)
+        .where(Program.id.in_(program_ids))
+    )
+    programs = {row.id: row for row in program_result}
+    
+    # Skip programs the user already applied to
+    existing_result = await db.execute(
+        select(Application.program_id).where(and_(
+            Application.user_id == current_user.id,
+            Application.program_id.in_(list(programs))
+        ))
+    )
+    already_applied = set(existing_result.scalars().all())
+    
+    to_create = [pid for pid in program_ids if pid in programs and pid not in already_applied]
+    
+    # Allocate application numbers in bulk, one counter update per prefix, in
+    # sorted order so concurrent batches lock the counter rows consistently
+    by_prefix = defaultdict(list)
+    for program_id in to_create:
+        by_prefix[application_prefix(programs[program_id].university_name)].append(program_id)
+    numbers = {}
+    for prefix in sorted(by_prefix):
+        allocated = await allocate_application_numbers(db, prefix, len(by_prefix[prefix]))
+        numbers.update(zip(by_prefix[prefix], allocated))
+    
+    now = datetime.utcnow()
+    rows = {}
+    for program_id in to_create:
+        deadline = programs[program_id].deadline
+        rows[program_id] = {
+            "id": str(uuid.uuid4()),
+            "user_id": current_user.id,
+            "program_id": program_id,
+            "application_id": numbers[program_id],
+            "status": ApplicationStatus.DRAFT,
+            "deadline": deadline,
+            "days_left": (deadline - now).days if deadline else None,
+            "notes": batch_data.notes,
+            "completion_percentage": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+    
+    if rows:
+        await db.execute(insert(Application.__table__).values(list(rows.values())))
+        await activity_recorder.record_many(
+            [
+                {
+                    "user_id": current_user.id,
+                    "activity_type": ActivityType.APPLICATION_UPDATE,
+                    "title": "Application started",
+                    "description": f"Started application for {programs[program_id].program_name} at {programs[program_id].university_name}",
+                    "related_application_id": row["id"],
+                    "related_program_id": program_id,
+                }
+                for program_id, row in rows.items()
+            ],
+            db=db,
+            transactional=True
+        )
+        await db.commit()
+    
+    results = []
+    seen = set()
+    for program_id in batch_data.program_ids:
+        if program_id in seen:
+            results.append(ApplicationBatchItem(program_id=program_id, status="duplicate"))
+            continue
+        seen.add(program_id)
+        if program_id not in programs:
+            results.append(ApplicationBatchItem(program_id=program_id, status="not_found"))
+        elif program_id in already_applied:
+            results.append(ApplicationBatchItem(program_id=program_id, status="already_applied"))
+        else:
+            results.append(ApplicationBatchItem(
+                program_id=program_id,
+                status="created",
+                application=ApplicationResponse(**rows[program_id])
+            ))
+    
+    return ApplicationBatchResponse(created=len(rows), results=results)
+
+
 @router.patch("/{application_id}", response_model=ApplicationResponse)
 async def update_application(
-    application_id: int,
+    application_id: str,
     application_data: ApplicationUpdate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -139,7 +273,7 @@ async def update_application(
     """Update application"""
     result = await db.execute(
         select(Application)
-        .options(selectinload(Application.program))
+        .options(selectinload(Application.program).options(PROGRAM_NAME_ONLY))
         .where(and_(
             Application.id == application_id,
             Application.user_id == current_user.id
@@ -155,33 +289,34 @@ async def update_application(
     for field, value in update_data.items():
         setattr(application, field, value)
     
+    await db.commit()
+    await db.refresh(application)
+    
     # Log activity if status changed
     if 'status' in update_data:
-        activity = Activity(
+        activity_recorder.record(
+            db,
             user_id=current_user.id,
-            action_type="application_status_changed",
+            activity_type=ActivityType.APPLICATION_UPDATE,
+            title="Application status updated",
             description=f"Application status changed to {update_data['status']} for {application.program.program_name}",
-            related_entity_type="application",
-            related_entity_id=application.id
+            related_application_id=application.id,
+            related_program_id=application.program_id
         )
-        db.add(activity)
-    
-    await db.commit()
-    await db.refresh(application)
     
     return application
 
 
 @router.post("/{application_id}/submit", response_model=ApplicationResponse)
 async def submit_application(
-    application_id: int,
+    application_id: str,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Submit application"""
     result = await db.execute(
         select(Application)
-        .options(selectinload(Application.program))
+        .options(selectinload(Application.program).options(PROGRAM_NAME_ONLY))
         .where(and_(
             Application.id == application_id,
             Application.user_id == current_user.id
@@ -197,18 +332,20 @@ async def submit_application(
     
     # Update status
     application.status = ApplicationStatus.SUBMITTED
-    application.submitted_at = datetime.utcnow()
-    application.progress = 100
+    application.submitted_date = datetime.utcnow()
+    application.completion_percentage = 100
     
-    # Log activity
-    activity = Activity(
+    # Submission is part of the audit trail, so it commits with the status change
+    activity_recorder.record(
+        db,
+        transactional=True,
         user_id=current_user.id,
-        action_type="application_submitted",
-        description=f"Submitted application for {application.program.program_name} at {application.program.university}",
-        related_entity_type="application",
-        related_entity_id=application.id
+        activity_type=ActivityType.APPLICATION_SUBMIT,
+        title="Application submitted",
+        description=f"Submitted application for {application.program.program_name} at {application.program.university_name}",
+        related_application_id=application.id,
+        related_program_id=application.program_id
     )
-    db.add(activity)
     
     await db.commit()
     await db.refresh(application)
@@ -218,7 +355,7 @@ async def submit_application(
 
 @router.delete("/{application_id}", status_code=204)
 async def delete_application(
-    application_id: int,
+    application_id: str,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
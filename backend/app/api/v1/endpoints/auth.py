@@ -8,10 +8,11 @@ from datetime import datetime
 from typing import Optional
 
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token, create_refresh_token, decode_token
 from app.schemas.user import UserCreate, UserLogin, UserResponse, TokenResponse
 from app.models.user import User
-from app.models.activity import Activity, ActivityType
+from app.models.activity import ActivityType
+from app.services.activity_recorder import activity_recorder
 
 router = APIRouter()
 
@@ -38,23 +39,22 @@ async def register(
     user = User(
         email=user_data.email,
         full_name=user_data.full_name,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash_async(user_data.password),
         profile_completion="15"  # Initial profile completion
     )
     
     db.add(user)
-    await db.flush()
+    await db.commit()
+    await db.refresh(user)
     
-    # Create activity
-    activity = Activity(
+    # Log activity
+    activity_recorder.record(
+        db,
         user_id=user.id,
         activity_type=ActivityType.PROFILE_UPDATE,
         title="Account created",
         description=f"Welcome to NoApplAI, {user.full_name}!"
     )
-    db.add(activity)
-    await db.commit()
-    await db.refresh(user)
     
     # Create tokens
     access_token = create_access_token({"sub": user.id})
@@ -91,7 +91,7 @@ async def login(
     result = await db.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(pwd, user.hashed_password):
+    if not user or not await verify_password_async(pwd, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
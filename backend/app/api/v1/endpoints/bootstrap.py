@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.partitioning import retained
+from app.models.user import User
+from app.models.document import Document
+from app.models.notification import Notification
+from app.models.program import Program
+from app.dependencies.auth import get_current_active_user
+from app.api.v1.endpoints.dashboard import get_dashboard_data
+from app.schemas.user import UserResponse
+from app.schemas.document import DOCUMENT_FIELDS
+from app.schemas.program import PROGRAM_FIELDS
+
+router = APIRouter()
+
+SECTIONS = ("user", "dashboard", "documents", "notifications", "programs")
+
+
+async def _user_section(current_user: User, **_):
+    return UserResponse.model_validate(current_user)
+
+
+async def _dashboard_section(db: AsyncSession, current_user: User, **_):
+    return await get_dashboard_data(db=db, current_user=current_user)
+
+
+async def _documents_section(db: AsyncSession, current_user: User, document_fields: list, **_):
+    result = await db.execute(
+        select(*DOCUMENT_FIELDS.columns(document_fields))
+        .where(Document.user_id == current_user.id)
+        .order_by(Document.created_at.desc())
+    )
+    items = [dict(row) for row in result.mappings()]
+
+    by_status = {}
+    for item in items:
+        status = getattr(item.get("status"), "value", item.get("status"))
+        if status is not None:
+            by_status[status] = by_status.get(status, 0) + 1
+
+    return {"total": len(items), "by_status": by_status, "items": items}
+
+
+async def _notifications_section(db: AsyncSession, current_user: User, **_):
+    result = await db.execute(
+        select(func.count(Notification.id)).where(and_(
+            Notification.user_id == current_user.id,
+            Notification.is_read == False,
+            Notification.is_deleted == False,
+            retained(Notification.created_at, settings.NOTIFICATION_RETENTION_MONTHS)
+        ))
+    )
+    return {"unread_count": result.scalar() or 0}
+
+
+async def _programs_section(db: AsyncSession, program_fields: list, programs_limit: int, **_):
+    result = await db.execute(
+        select(*PROGRAM_FIELDS.columns(program_fields))
+        .order_by(Program.deadline.asc())
+        .limit(programs_limit)
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+SECTION_LOADERS = {
+    "user": _user_section,
+    "dashboard": _dashboard_section,
+    "documents": _documents_section,
+    "notifications": _notifications_section,
+    "programs": _programs_section,
+}
+
+
+@router.get("/")
+async def get_bootstrap(
+    sections: Optional[str] = Query(None, description=f"Comma-separated sections: {', '.join(SECTIONS)} (default: all)"),
+    document_fields: Optional[str] = Query(None, description="Comma-separated document fields"),
+    document_view: str = Query("summary", description="Named document fieldset: summary or detail"),
+    program_fields: Optional[str] = Query(None, description="Comma-separated program fields"),
+    program_view: str = Query("summary", description="Named program fieldset: summary or detail"),
+    programs_limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Everything the frontend needs on first load, in one request.
+    The user is authenticated once; sections load one after another on the
+    request's session (cheap indexed queries), so a page load holds a single
+    pooled connection.
+    """
+    if sections:
+        requested = [section.strip() for section in sections.split(",") if section.strip()]
+        unknown = [section for section in requested if section not in SECTION_LOADERS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+    else:
+        requested = list(SECTIONS)
+    requested = list(dict.fromkeys(requested))
+
+    options = {
+        "db": db,
+        "current_user": current_user,
+        "document_fields": DOCUMENT_FIELDS.resolve(document_fields, document_view),
+        "program_fields": PROGRAM_FIELDS.resolve(program_fields, program_view),
+        "programs_limit": programs_limit,
+    }
+
+    return {section: await SECTION_LOADERS[section](**options) for section in requested}
@@ -4,14 +4,16 @@ from sqlalchemy import select, and_, func
 from datetime import datetime, timedelta
 from typing import List
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.partitioning import retained
 from app.models.user import User
 from app.models.application import Application, ApplicationStatus
 from app.models.document import Document
 from app.models.notification import Notification
-from app.models.activity import Activity
 from app.models.program import Program
 from app.dependencies.auth import get_current_active_user
+from app.services.activity_feed import activity_feed
 from app.schemas.dashboard import (
     DashboardData,
     DashboardStats,
@@ -21,6 +23,14 @@ from app.schemas.dashboard import (
 
 router = APIRouter()
 
+ACTIVE_STATUSES = (
+    ApplicationStatus.DRAFT,
+    ApplicationStatus.SUBMITTED,
+    ApplicationStatus.REVIEW,
+    ApplicationStatus.INTERVIEW,
+)
+ACCEPTED_STATUSES = (ApplicationStatus.OFFER, ApplicationStatus.ACCEPTED)
+
 
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
@@ -29,18 +39,18 @@ async def get_dashboard_stats(
 ):
     """Get dashboard statistics for current user"""
     
-    # Count applications by status
-    app_result = await db.execute(
-        select(Application).where(Application.user_id == current_user.id)
+    # Count applications by status (one grouped query)
+    status_result = await db.execute(
+        select(Application.status, func.count(Application.id))
+        .where(Application.user_id == current_user.id)
+        .group_by(Application.status)
     )
-    applications = app_result.scalars().all()
+    by_status = dict(status_result.all())
     
-    total_applications = len(applications)
-    active_applications = len([a for a in applications if a.status in [
-        ApplicationStatus.DRAFT, ApplicationStatus.SUBMITTED, ApplicationStatus.UNDER_REVIEW
-    ]])
-    submitted_applications = len([a for a in applications if a.status != ApplicationStatus.DRAFT])
-    accepted_applications = len([a for a in applications if a.status == ApplicationStatus.OFFER_RECEIVED])
+    total_applications = sum(by_status.values())
+    active_applications = sum(by_status.get(s, 0) for s in ACTIVE_STATUSES)
+    submitted_applications = total_applications - by_status.get(ApplicationStatus.DRAFT, 0)
+    accepted_applications = sum(by_status.get(s, 0) for s in ACCEPTED_STATUSES)
     
     # Count documents
     doc_result = await db.execute(
@@ -51,7 +61,7 @@ async def get_dashboard_stats(
     # Count upcoming deadlines (within 30 days)
     thirty_days_from_now = datetime.utcnow() + timedelta(days=30)
     deadline_result = await db.execute(
-        select(Application)
+        select(func.count(Application.id))
         .join(Program)
         .where(and_(
             Application.user_id == current_user.id,
@@ -60,7 +70,7 @@ async def get_dashboard_stats(
             Program.deadline >= datetime.utcnow()
         ))
     )
-    upcoming_deadlines = len(deadline_result.scalars().all())
+    upcoming_deadlines = deadline_result.scalar() or 0
     
     return DashboardStats(
         total_applications=total_applications,
@@ -80,15 +90,7 @@ async def get_recent_activities(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get recent activity feed for current user"""
-    result = await db.execute(
-        select(Activity)
-        .where(Activity.user_id == current_user.id)
-        .order_by(Activity.created_at.desc())
-        .limit(limit)
-    )
-    activities = result.scalars().all()
-    
-    return activities
+    return await activity_feed.recent(db, current_user.id, limit)
 
 
 @router.get("/deadlines", response_model=List[UpcomingDeadline])
@@ -116,7 +118,7 @@ async def get_upcoming_deadlines(
         deadlines.append(UpcomingDeadline(
             application_id=application.id,
             program_name=program.program_name,
-            university=program.university,
+            university=program.university_name,
             deadline=program.deadline,
             days_left=days_left,
             status=application.status
@@ -145,7 +147,9 @@ async def get_dashboard_data(
     notif_result = await db.execute(
         select(func.count(Notification.id)).where(and_(
             Notification.user_id == current_user.id,
-            Notification.is_read == False
+            Notification.is_read == False,
+            Notification.is_deleted == False,
+            retained(Notification.created_at, settings.NOTIFICATION_RETENTION_MONTHS)
         ))
     )
     unread_notifications = notif_result.scalar() or 0
@@ -9,7 +9,8 @@ import uuid
 from app.core.database import get_db
 from app.models.user import User
 from app.models.document import Document, DocumentType, DocumentStatus
-from app.models.activity import Activity, ActivityType
+from app.models.activity import ActivityType
+from app.services.activity_recorder import activity_recorder
 from app.dependencies.auth import get_current_active_user
 from app.schemas.document import DocumentResponse, DocumentUpdate, DocumentWithUrl
 
@@ -109,10 +110,9 @@ async def upload_cv(
         status=DocumentStatus.PENDING_VERIFICATION
     )
     db.add(document)
-    activity = Activity(user_id=current_user.id, activity_type=ActivityType.DOCUMENT_UPLOAD, title="CV uploaded", description=f"Uploaded CV: {file.filename}", related_document_id=document.id)
-    db.add(activity)
     await db.commit()
     await db.refresh(document)
+    activity_recorder.record(db, user_id=current_user.id, activity_type=ActivityType.DOCUMENT_UPLOAD, title="CV uploaded", description=f"Uploaded CV: {file.filename}", related_document_id=document.id)
     return document
 
 
@@ -138,10 +138,9 @@ async def upload_transcript(
         status=DocumentStatus.PENDING_VERIFICATION
     )
     db.add(document)
-    activity = Activity(user_id=current_user.id, activity_type=ActivityType.DOCUMENT_UPLOAD, title="Transcript uploaded", description=f"Uploaded Transcript: {file.filename}", related_document_id=document.id)
-    db.add(activity)
     await db.commit()
     await db.refresh(document)
+    activity_recorder.record(db, user_id=current_user.id, activity_type=ActivityType.DOCUMENT_UPLOAD, title="Transcript uploaded", description=f"Uploaded Transcript: {file.filename}", related_document_id=document.id)
     return document
 
 
@@ -167,10 +166,9 @@ async def upload_language_certificate(
         status=DocumentStatus.PENDING_VERIFICATION
     )
     db.add(document)
-    activity = Activity(user_id=current_user.id, activity_type=ActivityType.DOCUMENT_UPLOAD, title="Language certificate uploaded", description=f"Uploaded Language Certificate: {file.filename}", related_document_id=document.id)
-    db.add(activity)
     await db.commit()
     await db.refresh(document)
+    activity_recorder.record(db, user_id=current_user.id, activity_type=ActivityType.DOCUMENT_UPLOAD, title="Language certificate uploaded", description=f"Uploaded Language Certificate: {file.filename}", related_document_id=document.id)
     return document
 
 
@@ -224,17 +222,17 @@ async def delete_document(
     
     # TODO: Delete from S3/MinIO
     
+    await db.delete(document)
+    await db.commit()
+    
     # Log activity
-    activity = Activity(
+    activity_recorder.record(
+        db,
         user_id=current_user.id,
         activity_type=ActivityType.DOCUMENT_UPLOAD,
         title=f"{document.name} deleted",
         description=f"Deleted document: {document.filename}"
     )
-    db.add(activity)
-    
-    await db.delete(document)
-    await db.commit()
     
     return None
 
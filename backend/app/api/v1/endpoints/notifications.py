@@ -2,12 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, update
 from typing import List
+from datetime import datetime
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.partitioning import retained
 from app.models.user import User
 from app.models.notification import Notification
 from app.dependencies.auth import get_current_active_user
-from app.schemas.notification import NotificationResponse, NotificationUpdate
+from app.schemas.notification import (
+    NotificationResponse,
+    NotificationUpdate,
+    NotificationBulkAction,
+    NotificationBulkResult
+)
 
 router = APIRouter()
 
@@ -21,7 +29,11 @@ async def list_notifications(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get list of current user's notifications"""
-    query = select(Notification).where(Notification.user_id == current_user.id)
+    query = select(Notification).where(and_(
+        Notification.user_id == current_user.id,
+        Notification.is_deleted == False,
+        retained(Notification.created_at, settings.NOTIFICATION_RETENTION_MONTHS)
+    ))
     
     if unread_only:
         query = query.where(Notification.is_read == False)
@@ -43,7 +55,9 @@ async def get_unread_count(
     result = await db.execute(
         select(Notification).where(and_(
             Notification.user_id == current_user.id,
-            Notification.is_read == False
+            Notification.is_read == False,
+            Notification.is_deleted == False,
+            retained(Notification.created_at, settings.NOTIFICATION_RETENTION_MONTHS)
         ))
     )
     count = len(result.scalars().all())
@@ -53,7 +67,7 @@ async def get_unread_count(
 
 @router.get("/{notification_id}", response_model=NotificationResponse)
 async def get_notification(
-    notification_id: int,
+    notification_id: str,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -74,7 +88,7 @@ async def get_notification(
 
 @router.patch("/{notification_id}", response_model=NotificationResponse)
 async def mark_notification_read(
-    notification_id: int,
+    notification_id: str,
     notification_data: NotificationUpdate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -119,9 +133,94 @@ async def mark_all_read(
     return {"message": "All notifications marked as read"}
 
 
+async def _bulk_update(
+    db: AsyncSession,
+    current_user: User,
+    selection: NotificationBulkAction,
+    condition,
+    values: dict
+) -> NotificationBulkResult:
+    """
+    Apply `values` to the selected notifications in a single UPDATE.
+    Only rows that actually change (matching `condition`) are counted.
+    """
+    if not selection.ids and selection.notification_type is None and selection.before is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide notification ids or at least one filter (notification_type, before)"
+        )
+    
+    conditions = [
+        Notification.user_id == current_user.id,
+        Notification.is_deleted == False,
+        condition
+    ]
+    if selection.ids:
+        conditions.append(Notification.id.in_(selection.ids))
+    if selection.notification_type is not None:
+        conditions.append(Notification.notification_type == selection.notification_type)
+    if selection.before is not None:
+        conditions.append(Notification.created_at < selection.before)
+    
+    result = await db.execute(
+        update(Notification)
+        .where(and_(*conditions))
+        .values(**values)
+        .returning(Notification.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = len(result.all())
+    
+    await db.commit()
+    
+    return NotificationBulkResult(updated=updated)
+
+
+@router.post("/bulk/read", response_model=NotificationBulkResult)
+async def bulk_mark_read(
+    selection: NotificationBulkAction,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Mark selected notifications as read"""
+    return await _bulk_update(
+        db, current_user, selection,
+        Notification.is_read == False,
+        {"is_read": True, "read_at": datetime.utcnow()}
+    )
+
+
+@router.post("/bulk/unread", response_model=NotificationBulkResult)
+async def bulk_mark_unread(
+    selection: NotificationBulkAction,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Mark selected notifications as unread"""
+    return await _bulk_update(
+        db, current_user, selection,
+        Notification.is_read == True,
+        {"is_read": False, "read_at": None}
+    )
+
+
+@router.post("/bulk/delete", response_model=NotificationBulkResult)
+async def bulk_delete(
+    selection: NotificationBulkAction,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Soft-delete selected notifications"""
+    return await _bulk_update(
+        db, current_user, selection,
+        Notification.is_deleted == False,
+        {"is_deleted": True}
+    )
+
+
 @router.delete("/{notification_id}", status_code=204)
 async def delete_notification(
-    notification_id: int,
+    notification_id: str,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
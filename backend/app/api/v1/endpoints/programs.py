@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 from typing import List, Optional
 from datetime import datetime
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.plugins import PluginNotAvailable
 from app.models.user import User
 from app.models.program import Program
 from app.dependencies.auth import get_current_active_user
-from app.schemas.program import ProgramResponse, ProgramCreate, ProgramUpdate, ProgramRecommendation
+from app.plugins import recommenders
+from app.schemas.program import ProgramResponse, ProgramCreate, ProgramUpdate, ProgramRecommendation, PROGRAM_FIELDS
 
 router = APIRouter()
 
@@ -21,11 +25,14 @@ async def list_programs(
     degree_type: Optional[str] = None,
     location: Optional[str] = None,
     min_deadline: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated program fields"),
+    view: Optional[str] = Query(None, description="Named fieldset: summary or detail"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get list of programs with optional filters"""
-    query = select(Program)
+    # Only the requested columns are read (the catalog grid uses view=summary)
+    query = select(*PROGRAM_FIELDS.columns(PROGRAM_FIELDS.resolve(fields, view)))
     
     # Apply filters
     conditions = []
@@ -54,9 +61,9 @@ async def list_programs(
     query = query.offset(skip).limit(limit).order_by(Program.deadline.asc())
     
     result = await db.execute(query)
-    programs = result.scalars().all()
     
-    return programs
+    # Sparse rows do not fit ProgramResponse, which stays for the OpenAPI schema
+    return ORJSONResponse([dict(row) for row in result.mappings()])
 
 
 @router.get("/{program_id}", response_model=ProgramResponse)
@@ -156,23 +163,8 @@ async def get_ai_recommendations(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get AI-powered program recommendations based on user profile"""
-    # TODO: Implement AI matching logic with OpenAI
-    # For now, return programs ordered by average match score
-    
-    result = await db.execute(
-        select(Program)
-        .order_by(Program.average_match_score.desc().nullslast())
-        .limit(limit)
-    )
-    programs = result.scalars().all()
-    
-    recommendations = [
-        ProgramRecommendation(
-            program=program,
-            match_score=program.average_match_score or 0.0,
-            match_reasons=["Profile match", "Academic fit", "Location preference"]
-        )
-        for program in programs
-    ]
-    
-    return recommendations
+    try:
+        recommender = recommenders.get(settings.RECOMMENDER)
+    except PluginNotAvailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return await recommender.recommend(db, current_user, limit)
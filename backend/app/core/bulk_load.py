@@ -0,0 +1,146 @@
+"""
+Bulk ingestion into a table
+
+On PostgreSQL rows are streamed through COPY ... FROM STDIN (CSV) on the
+connection's own driver: psycopg2 (sync engines, scripts) or asyncpg (the
+async engine, Alembic migrations). Other dialects get executemany INSERTs in
+batches of `batch_size`. Either way the caller's transaction is used; nothing
+is committed here.
+
+Rows are tuples in `columns` order. JSON columns take Python lists/dicts,
+Enum columns enum members or their names. Omitted columns get their
+Python-side defaults (`Column(default=...)`) on both paths: COPY does not
+apply them, so they are filled in before the rows are sent.
+"""
+import csv
+import enum
+import io
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, List, Sequence, Tuple
+
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+COPY_CHUNK_SIZE = 50_000  # Rows per COPY, bounds the CSV buffer held in memory
+COPY_NULL = "\\N"
+COPY_DRIVERS = ("psycopg2", "asyncpg")
+
+
+@dataclass
+class LoadReport:
+    table: str
+    rows: int
+    seconds: float
+    method: str
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.rows:,} rows into {self.table} via {self.method} in {self.seconds:.2f} s "
+            f"({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+def _copy_value(value):
+    """CSV text for one value as PostgreSQL's COPY expects it"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return COPY_NULL
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_buffer(rows: Iterable[Sequence]) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(value) for value in row])
+    buffer.seek(0)
+    return buffer
+
+
+def _python_defaults(table: Table, columns: Sequence[str]) -> List[Tuple[str, object]]:
+    """(name, ColumnDefault) of omitted columns with a scalar or callable Python-side default"""
+    defaults = []
+    for column in table.columns:
+        default = getattr(column, "default", None)
+        if column.name in columns or default is None:
+            continue
+        if default.is_scalar or default.is_callable:
+            defaults.append((column.name, default))
+    return defaults
+
+
+def _default_values(defaults: List[Tuple[str, object]]) -> Tuple:
+    # Callables are evaluated per row, as an INSERT would (fresh lists, ids, timestamps)
+    return tuple(default.arg if default.is_scalar else default.arg(None) for _, default in defaults)
+
+
+def _copy(connection: Connection, table: Table, columns: Sequence[str], rows: List[Sequence]):
+    buffer = _csv_buffer(rows)
+    pool_connection = connection.connection
+    driver = connection.dialect.driver
+
+    if driver == "psycopg2":
+        with pool_connection.driver_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                buffer,
+            )
+    else:
+        # asyncpg: run the coroutine from SQLAlchemy's greenlet bridge
+        source = io.BytesIO(buffer.getvalue().encode("utf-8"))
+        pool_connection.dbapi_connection.await_(
+            pool_connection.driver_connection.copy_to_table(
+                table.name, source=source, columns=list(columns), format="csv", null=COPY_NULL,
+            )
+        )
+
+
+def load_rows(
+    connection: Connection,
+    table: Table,
+    columns: Sequence[str],
+    rows: Sequence[Sequence],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> LoadReport:
+    """Insert `rows` into `table` with COPY where available, executemany batches otherwise"""
+    started = time.perf_counter()
+    use_copy = connection.dialect.name == "postgresql" and connection.dialect.driver in COPY_DRIVERS
+
+    if use_copy:
+        defaults = _python_defaults(table, columns)
+        copy_columns = [*columns, *(name for name, _ in defaults)]
+        for start in range(0, len(rows), COPY_CHUNK_SIZE):
+            chunk = rows[start:start + COPY_CHUNK_SIZE]
+            if defaults:
+                chunk = [tuple(row) + _default_values(defaults) for row in chunk]
+            _copy(connection, table, copy_columns, chunk)
+    else:
+        statement = table.insert()
+        for start in range(0, len(rows), batch_size):
+            connection.execute(statement, [dict(zip(columns, row)) for row in rows[start:start + batch_size]])
+
+    report = LoadReport(
+        table=table.name,
+        rows=len(rows),
+        seconds=time.perf_counter() - started,
+        method="COPY" if use_copy else "executemany",
+    )
+    logger.info(f"Bulk load: {report}")
+    return report
@@ -0,0 +1,259 @@
+"""
+Response compression
+
+- CompressionMiddleware: content-negotiated brotli/gzip for dynamic responses.
+  Bodies below a minimum size are sent as-is; the compression level drops as
+  the body grows so large payloads do not cost disproportionate CPU. Streaming
+  responses are compressed chunk by chunk with a sync flush, so clients still
+  receive data as soon as it is produced.
+- PrecompressedStaticFiles: serves `<file>.br` / `<file>.gz` variants written
+  at build time (see precompress_static.py), so static assets are never
+  compressed per request.
+
+Brotli is optional: without the `brotli` package only gzip is offered.
+"""
+import gzip
+import mimetypes
+import os
+import re
+import stat
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+BROTLI = "br"
+GZIP = "gzip"
+
+# (max body size, gzip level, brotli quality); the last entry covers the rest
+COMPRESSION_LEVELS = (
+    (64 * 1024, 6, 5),
+    (1024 * 1024, 5, 4),
+    (None, 3, 2),
+)
+
+COMPRESSIBLE_TYPES = re.compile(r"^(text/|application/(json|javascript|xml|.*\+json|.*\+xml)|image/svg\+xml)")
+
+# Built asset names carry a content hash (app.3f2a9c1e.js) and never change
+HASHED_ASSET = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+PRECOMPRESSED_SUFFIXES = {BROTLI: ".br", GZIP: ".gz"}
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can produce, in order of preference"""
+    return [BROTLI, GZIP] if brotli is not None else [GZIP]
+
+
+def negotiate_encoding(accept_encoding: str, supported: Sequence[str]) -> Optional[str]:
+    """
+    Pick the first of `supported` the client accepts (q > 0), honouring
+    explicit q-values and the `*` wildcard
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+
+    for encoding in supported:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compression_levels(size: Optional[int]) -> Tuple[int, int]:
+    """(gzip level, brotli quality) for a body of `size` bytes (None: unknown)"""
+    for max_size, gzip_level, brotli_quality in COMPRESSION_LEVELS:
+        if max_size is not None and size is not None and size <= max_size:
+            return gzip_level, brotli_quality
+    return COMPRESSION_LEVELS[-1][1], COMPRESSION_LEVELS[-1][2]
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    gzip_level, brotli_quality = compression_levels(len(body))
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding: str):
+        gzip_level, brotli_quality = compression_levels(None)
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes, final: bool) -> bytes:
+        if self.encoding == BROTLI:
+            data = self._compressor.process(chunk)
+            return data + (self._compressor.finish() if final else self._compressor.flush())
+        data = self._compressor.compress(chunk)
+        return data + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    return bool(COMPRESSIBLE_TYPES.match(headers.get("content-type", "")))
+
+
+def _add_vary(headers: MutableHeaders):
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """Brotli/gzip response compression with a minimum size and adaptive level"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk decides the encoding
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(scope=start)
+
+            if not _is_compressible(headers) or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            _add_vary(headers)
+
+            if not more_body:
+                body = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            # Streaming response: length is unknown up front
+            del headers["Content-Length"]
+            self.compressor = _StreamCompressor(self.encoding)
+            await self.send(start)
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        await self.send({
+            "type": "http.response.body",
+            "body": self.compressor.compress(body, final=not more_body),
+            "more_body": more_body,
+        })
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that prefers build-time `.br`/`.gz` variants and sets cache
+    headers: hashed asset names are immutable, everything else (HTML entry
+    points) is revalidated with its ETag on every use
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        response = None
+
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""), list(PRECOMPRESSED_SUFFIXES))
+        candidates = [encoding] if encoding else []
+        # Fall back to gzip when the client prefers an encoding we have no file for
+        if encoding == BROTLI and negotiate_encoding(request_headers.get("accept-encoding", ""), [GZIP]):
+            candidates.append(GZIP)
+
+        for candidate in candidates:
+            variant = f"{full_path}{PRECOMPRESSED_SUFFIXES[candidate]}"
+            try:
+                variant_stat = os.stat(variant)
+            except OSError:
+                continue
+            if not stat.S_ISREG(variant_stat.st_mode):
+                continue
+            response = FileResponse(
+                variant,
+                status_code=status_code,
+                stat_result=variant_stat,
+                media_type=mimetypes.guess_type(str(full_path))[0] or "text/plain",
+                headers={"Content-Encoding": candidate, "Vary": "Accept-Encoding"},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                response = NotModifiedResponse(response.headers)
+            break
+
+        if response is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers["Vary"] = "Accept-Encoding"
+
+        response.headers["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if HASHED_ASSET.search(str(full_path)) else REVALIDATE_CACHE_CONTROL
+        )
+        return response
@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     
     # Database (Required)
     DATABASE_URL: str
+    DATABASE_POOL_SIZE: int = 20  # Ignored for SQLite, which does not use a QueuePool
+    DATABASE_MAX_OVERFLOW: int = 10
+    DB_BOOT_MODE: str = "create_all"  # Worker startup: "create_all" (dev), "verify" (check Alembic head, no DDL) or "skip"
+    DB_EXPECTED_REVISION: Optional[str] = None  # Revision "verify" requires; defaults to the head of alembic/versions
     
     # Redis (Required)
     REDIS_URL: str
@@ -30,6 +34,99 @@ class Settings(BaseSettings):
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:8000"
     LOG_LEVEL: str = "INFO"
     
+    # Compression & static frontend
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes; smaller responses are sent uncompressed
+    FRONTEND_DIR: str = "../frontend"  # Served at FRONTEND_MOUNT_PATH when present
+    FRONTEND_MOUNT_PATH: str = "/app"
+    
+    # Request profiling (settings can also be changed at runtime via /admin/profiling)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled with a call tree
+    PROFILING_SLOW_THRESHOLD_MS: float = 1000.0  # Slower requests are always kept
+    PROFILING_PROFILE_ALL: bool = False  # Call tree for every request (cheap with pyinstrument)
+    PROFILING_BUFFER_SIZE: int = 50
+    PROFILING_MAX_STATEMENTS: int = 200  # SQL statements kept per profile
+    
+    # SQL query statistics per route (debug mode adds X-DB-* response headers)
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5  # Identical statements per request flagged as N+1
+    
+    # Metrics (/metrics, Prometheus format)
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None  # Shared by all workers; empty it before starting them
+    METRICS_SAMPLE_INTERVAL_SECONDS: float = 5.0  # DB pool sampling
+    
+    # Event-loop monitoring (lag metrics and blocked-loop stack capture)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.25
+    LOOP_BLOCKED_THRESHOLD_SECONDS: float = 0.1
+    LOOP_ASYNCIO_DEBUG: Optional[bool] = None  # asyncio debug mode; defaults to DEBUG
+    
+    # Password hashing (bcrypt runs on this many threads, off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    
+    # ORM
+    ORM_LAZY_LOAD_GUARD: bool = False  # Raise on implicit lazy loads (enable in tests/CI)
+    
+    # Plugins & worker roles (optional subsystems are imported on first use)
+    RECOMMENDER: str = "match_score"  # Engine behind /programs/recommendations/ai
+    PLUGINS_PRELOAD: str = ""  # "kind:name,..." imported at startup, for dedicated workers
+    API_DISABLED_ROUTERS: str = ""  # Endpoint modules this worker does not import or serve, e.g. "admin"
+    
+    # Applications
+    APPLICATION_BATCH_MAX_SIZE: int = 50
+    
+    # Program catalog sync
+    CATALOG_SYNC_BATCH_SIZE: int = 500  # Rows per INSERT ... ON CONFLICT statement
+    CATALOG_INVALIDATION_CHANNEL: str = "catalog:programs"  # Redis pub/sub channel for changed ids; empty disables
+    
+    # Program page enrichment (enrich_programs.py)
+    ENRICHMENT_MAX_CONNECTIONS: int = 32  # Pooled httpx connections across all hosts
+    ENRICHMENT_PER_HOST_CONCURRENCY: int = 2  # Concurrent requests per host
+    ENRICHMENT_TIMEOUT_SECONDS: float = 15.0
+    ENRICHMENT_MAX_PAGE_BYTES: int = 2_000_000  # Larger pages are truncated before extraction
+    ENRICHMENT_PROCESSES: int = 2  # HTML extraction workers
+    ENRICHMENT_USER_AGENT: str = "NoApplAI-Enrichment/1.0"
+    
+    # Deadline reminders
+    DEADLINE_REMINDERS_ENABLED: bool = False
+    DEADLINE_REMINDER_INTERVAL_SECONDS: int = 3600
+    DEADLINE_REMINDER_OFFSETS_DAYS: str = "30,14,7,3,1"
+    DEADLINE_REMINDER_BATCH_SIZE: int = 5000
+    
+    # Retention (notifications & activities)
+    RETENTION_ENABLED: bool = False
+    RETENTION_INTERVAL_SECONDS: int = 86400
+    NOTIFICATION_RETENTION_MONTHS: int = 12
+    ACTIVITY_RETENTION_MONTHS: int = 12
+    RETENTION_ARCHIVE_SCHEMA: Optional[str] = None  # Detached partitions are moved here instead of dropped
+    SOFT_DELETE_GRACE_DAYS: int = 30
+    PARTITION_MONTHS_AHEAD: int = 3
+    
+    # Activity log (write-behind)
+    ACTIVITY_WRITE_BEHIND: bool = True
+    ACTIVITY_FLUSH_BATCH_SIZE: int = 500
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 1.0
+    ACTIVITY_SPILL_DIR: str = "var/activity_spill"
+    ACTIVITY_SPILL_FSYNC: bool = False
+    
+    # Activity feed read model ("redis" or "memory")
+    ACTIVITY_FEED_BACKEND: str = "redis"
+    ACTIVITY_FEED_SIZE: int = 50
+    ACTIVITY_FEED_MAX_USERS: int = 10000  # memory backend only
+    ACTIVITY_FEED_TTL_SECONDS: int = 86400  # redis backend only
+    ACTIVITY_FEED_REDIS_TIMEOUT_SECONDS: float = 0.25  # Connect/read timeout; slower Redis falls back to the DB
+    ACTIVITY_FEED_RETRY_SECONDS: float = 30.0  # How long Redis is skipped after a failure
+    
+    def get_deadline_reminder_offsets(self):
+        """Convert reminder offsets string to a sorted list of days"""
+        return sorted({int(day) for day in self.DEADLINE_REMINDER_OFFSETS_DAYS.split(",") if day.strip()})
+    
+    def get_disabled_routers(self):
+        """Convert disabled routers string to a set of endpoint module names"""
+        return {name.strip() for name in self.API_DISABLED_ROUTERS.split(",") if name.strip()}
+    
     def get_cors_origins_list(self):
         """Convert CORS string to list"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
@@ -1,20 +1,27 @@
 """
 Database session management and initialization
 """
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
+from sqlalchemy.orm import Session, declarative_base, raiseload
+from typing import AsyncGenerator, Optional
 
 from app.core.config import settings
+from app.core.schema_check import verify_schema
+
+
+def engine_options(database_url: str) -> dict:
+    """create_async_engine keyword arguments; pool sizing only applies to QueuePool dialects"""
+    options = {"echo": settings.DEBUG, "pool_pre_ping": True}
+    if not database_url.startswith("sqlite"):
+        # aiosqlite uses a NullPool / StaticPool, which reject pool sizing arguments
+        options["pool_size"] = settings.DATABASE_POOL_SIZE
+        options["max_overflow"] = settings.DATABASE_MAX_OVERFLOW
+    return options
+
 
 # Create async engine (simplified)
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_size=20,  # Fixed pool size
-    max_overflow=10,  # Fixed max overflow
-    pool_pre_ping=True,
-)
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -29,6 +36,47 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
+def _selects_entities(statement) -> bool:
+    return any(
+        description.get("entity") is not None and description["expr"] is description["entity"]
+        for description in statement.column_descriptions
+    )
+
+
+def install_lazy_load_guard(session_class=Session):
+    """
+    Make every relationship that a query did not load explicitly raise on
+    access instead of lazy loading it, so accidental N+1 queries fail loudly
+    """
+    @event.listens_for(session_class, "do_orm_execute")
+    def _raise_on_lazy_load(orm_execute_state):
+        if (
+            orm_execute_state.is_select
+            and not orm_execute_state.is_relationship_load
+            and not orm_execute_state.is_column_load
+            and _selects_entities(orm_execute_state.statement)
+        ):
+            orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
+if settings.ORM_LAZY_LOAD_GUARD:
+    install_lazy_load_guard()
+
+
+def get_dialect_insert(dialect_name: str):
+    """
+    Return the dialect-specific `insert` construct, which adds
+    ON CONFLICT support (PostgreSQL and SQLite)
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT is not supported for dialect '{dialect_name}'")
+    return insert
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting database session
@@ -44,10 +92,20 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def init_db():
+async def init_db(mode: Optional[str] = None):
     """
-    Initialize database tables
+    Prepare the database for this worker according to DB_BOOT_MODE:
+    create missing tables ("create_all"), check the Alembic revision without
+    any DDL ("verify"), or do nothing ("skip")
     """
+    mode = mode or settings.DB_BOOT_MODE
+    if mode == "skip":
+        return
+    if mode == "verify":
+        await verify_schema(engine, settings.DB_EXPECTED_REVISION)
+        return
+    if mode != "create_all":
+        raise ValueError(f"Unknown DB_BOOT_MODE '{mode}' (create_all, verify or skip)")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
@@ -0,0 +1,77 @@
+"""
+Sparse fieldsets for list endpoints
+
+Clients pick the fields they need either by name (`?fields=id,program_name`)
+or through a named view (`?view=summary`). The selection is translated into
+a column-level select (`FieldSet.columns`) or, for ORM entity queries, a
+`load_only` option (`FieldSet.load_only`), so unused columns such as large
+Text/JSON fields are never read from the database.
+"""
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy.orm import load_only
+
+from app.core.config import settings
+
+
+class FieldSet:
+    """Selectable fields and named views of one model"""
+
+    def __init__(
+        self,
+        model,
+        views: Dict[str, Sequence[str]],
+        default_view: str,
+        required: Sequence[str] = ("id",),
+        hidden: Sequence[str] = (),
+    ):
+        self.model = model
+        # Hidden columns are internal bookkeeping and never selectable
+        self.available = [column.key for column in model.__table__.columns if column.key not in hidden]
+        self.required = list(required)
+        self.views = {name: self._validate(fields) for name, fields in views.items()}
+        self.default_view = default_view
+
+    def _validate(self, fields: Sequence[str]) -> List[str]:
+        unknown = [field for field in fields if field not in self.available]
+        if unknown:
+            raise ValueError(f"Unknown {self.model.__name__} fields: {', '.join(unknown)}")
+        return list(fields)
+
+    def resolve(self, fields: Optional[str] = None, view: Optional[str] = None) -> List[str]:
+        """
+        Field names for a request: explicit `fields` win over `view`,
+        required fields are always included, declaration order is kept.
+        """
+        if fields:
+            requested = {field.strip() for field in fields.split(",") if field.strip()}
+            unknown = sorted(requested - set(self.available))
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        else:
+            view = view or self.default_view
+            if view not in self.views:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown view '{view}', expected one of: {', '.join(self.views)}"
+                )
+            requested = set(self.views[view])
+
+        requested.update(self.required)
+        return [field for field in self.available if field in requested]
+
+    def columns(self, names: Sequence[str]) -> list:
+        """Table columns for a column-level select"""
+        return [self.model.__table__.c[name] for name in names]
+
+    def load_only(self, names: Sequence[str]):
+        """
+        load_only option for ORM entity queries. With the lazy-load guard
+        enabled, touching a column outside the fieldset raises instead of
+        silently emitting one query per row.
+        """
+        return load_only(
+            *[getattr(self.model, name) for name in names],
+            raiseload=settings.ORM_LAZY_LOAD_GUARD
+        )
@@ -0,0 +1,137 @@
+"""
+Event-loop lag monitor and blocking-call detector
+
+- A heartbeat task sleeps LOOP_MONITOR_INTERVAL_SECONDS at a time and records
+  how late it wakes up (scheduling lag) in the event_loop_lag_* metrics.
+- A watchdog thread watches that heartbeat. When the loop has not run it for
+  longer than LOOP_BLOCKED_THRESHOLD_SECONDS, the watchdog captures the loop
+  thread's current stack (the code that is blocking it) and, once the loop
+  recovers, logs the stall with that stack and counts it in
+  event_loop_blocked_total. This works in production, unlike asyncio's debug
+  mode.
+- With LOOP_ASYNCIO_DEBUG (on by default when DEBUG is set) the loop also runs
+  in asyncio debug mode with slow_callback_duration set to the threshold;
+  asyncio's "Executing <Handle> took N seconds" reports are counted in
+  event_loop_slow_callbacks_total.
+
+Load tests can fail on a non-zero event_loop_blocked_total to catch handlers
+that do synchronous work on the loop.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core.metrics import (
+    EVENT_LOOP_BLOCKED,
+    EVENT_LOOP_BLOCKED_DURATION,
+    EVENT_LOOP_LAG,
+    EVENT_LOOP_LAG_HISTOGRAM,
+    EVENT_LOOP_SLOW_CALLBACKS,
+)
+
+logger = logging.getLogger(__name__)
+
+STACK_LIMIT = 30
+
+
+class _SlowCallbackCounter(logging.Handler):
+    """Counts asyncio debug-mode slow callback reports"""
+
+    def emit(self, record: logging.LogRecord):
+        if isinstance(record.msg, str) and record.msg.startswith("Executing ") and " took " in record.msg:
+            EVENT_LOOP_SLOW_CALLBACKS.inc()
+
+
+class LoopMonitor:
+    def __init__(self, interval: float, blocked_threshold: float, asyncio_debug: bool = False):
+        self.interval = interval
+        self.blocked_threshold = blocked_threshold
+        self.asyncio_debug = asyncio_debug
+        self._heartbeat = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._slow_callback_counter: Optional[_SlowCallbackCounter] = None
+
+    def start(self):
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+
+        if self.asyncio_debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.blocked_threshold
+            self._slow_callback_counter = _SlowCallbackCounter()
+            logging.getLogger("asyncio").addHandler(self._slow_callback_counter)
+
+        self._task = loop.create_task(self._heartbeat_loop())
+        self._stopping.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+        if self._slow_callback_counter is not None:
+            logging.getLogger("asyncio").removeHandler(self._slow_callback_counter)
+            self._slow_callback_counter = None
+
+    async def _heartbeat_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._heartbeat = time.monotonic()
+            lag = max(0.0, loop.time() - expected)
+            EVENT_LOOP_LAG.set(lag)
+            EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+
+    def _loop_stack(self) -> str:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return "<loop thread stack unavailable>"
+        return "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+
+    def _watch(self):
+        """Runs in the watchdog thread"""
+        check_every = max(self.blocked_threshold / 2, 0.01)
+        stalled_beat = None
+        stall_stack = None
+
+        while not self._stopping.wait(check_every):
+            beat = self._heartbeat
+            overdue = time.monotonic() - beat - self.interval
+
+            if stalled_beat is not None and beat != stalled_beat:
+                # The heartbeat ran again: report the finished stall
+                duration = beat - stalled_beat - self.interval
+                EVENT_LOOP_BLOCKED.inc()
+                EVENT_LOOP_BLOCKED_DURATION.observe(max(duration, 0.0))
+                logger.warning(
+                    f"Event loop blocked for {duration * 1000:.0f} ms "
+                    f"(threshold {self.blocked_threshold * 1000:.0f} ms). Stack at detection:\n{stall_stack}"
+                )
+                stalled_beat = None
+                stall_stack = None
+
+            if stalled_beat is None and overdue > self.blocked_threshold:
+                # New stall: capture what the loop thread is running right now
+                stalled_beat = beat
+                stall_stack = self._loop_stack()
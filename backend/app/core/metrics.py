@@ -0,0 +1,197 @@
+"""
+Prometheus metrics
+
+Exposed at /metrics in the Prometheus text format. With several uvicorn or
+gunicorn workers, set METRICS_MULTIPROC_DIR to an empty directory shared by
+the workers: every worker writes its samples to memory-mapped files there and
+a scrape of any worker aggregates all of them (prometheus_client's
+multiprocess mode). The directory must be emptied before the workers start.
+
+Metric updates are plain in-process increments (one uncontended lock per
+labelled value), so they are cheap on the request path. Gauges that describe
+the worker itself are sampled periodically rather than on every request: DB
+pool stats by RuntimeSampler, event-loop lag by loop_monitor.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+# prometheus_client reads the multiprocess directory at import time
+if settings.METRICS_MULTIPROC_DIR:
+    os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.METRICS_MULTIPROC_DIR)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send  # noqa: E402
+
+from app.core.sql_trace import route_template  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# HTTP
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method"],
+    multiprocess_mode="livesum",
+)
+
+# Database
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed", ["route"])
+DB_TIME = Counter("db_time_seconds_total", "Time spent executing SQL", ["route"])
+DB_AFFECTED_ROWS = Counter("db_affected_rows_total", "Rows affected by INSERT/UPDATE/DELETE", ["route"])
+DB_N_PLUS_ONE = Counter("db_n_plus_one_requests_total", "Requests with a suspected N+1 pattern", ["route"])
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured connection pool size", multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections in use", multiprocess_mode="livesum")
+DB_POOL_CHECKED_IN = Gauge("db_pool_checked_in", "Idle connections in the pool", multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections opened beyond the pool size", multiprocess_mode="livesum")
+
+# Caches
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups", ["cache", "result"])
+
+# Password hashing thread pool
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "bcrypt operations waiting for or running on the hashing pool",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "bcrypt operation time including queueing", ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Event loop (see loop_monitor)
+EVENT_LOOP_LAG = Gauge("event_loop_lag_seconds", "Most recent event-loop scheduling lag", multiprocess_mode="max")
+EVENT_LOOP_LAG_HISTOGRAM = Histogram("event_loop_lag_seconds_distribution", "Event-loop scheduling lag", buckets=LAG_BUCKETS)
+EVENT_LOOP_BLOCKED = Counter("event_loop_blocked_total", "Stalls where the event loop did not run for longer than the threshold")
+EVENT_LOOP_BLOCKED_DURATION = Histogram(
+    "event_loop_blocked_duration_seconds", "Duration of event-loop stalls", buckets=LAG_BUCKETS,
+)
+EVENT_LOOP_SLOW_CALLBACKS = Counter(
+    "event_loop_slow_callbacks_total", "Callbacks reported slow by asyncio debug mode",
+)
+
+
+def record_cache_lookup(cache: str, result: str):
+    """result: hit, miss or error"""
+    CACHE_REQUESTS.labels(cache, result).inc()
+
+
+def record_route_queries(route: str, trace, n_plus_one: bool):
+    DB_STATEMENTS.labels(route).inc(trace.count)
+    DB_TIME.labels(route).inc(trace.total_ms / 1000)
+    DB_AFFECTED_ROWS.labels(route).inc(trace.affected_rows)
+    if n_plus_one:
+        DB_N_PLUS_ONE.labels(route).inc()
+
+
+def sample_pool(engine):
+    """Copy connection pool counters into gauges (QueuePool only)"""
+    pool = engine.sync_engine.pool
+    for gauge, attribute in (
+        (DB_POOL_SIZE, "size"),
+        (DB_POOL_CHECKED_OUT, "checkedout"),
+        (DB_POOL_CHECKED_IN, "checkedin"),
+        (DB_POOL_OVERFLOW, "overflow"),
+    ):
+        method = getattr(pool, attribute, None)
+        if method is not None:
+            gauge.set(method())
+
+
+def render_metrics():
+    """(body, content type) for a scrape, aggregating all workers in multiprocess mode"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead():
+    """Drop this worker's live gauges from the shared directory on shutdown"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Request count, latency histogram and in-flight gauge per route template"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = route_template(scope, UNMATCHED_ROUTE)
+            HTTP_REQUESTS.labels(method, route, status_code).inc()
+            HTTP_REQUEST_DURATION.labels(method, route, status_code).observe(time.perf_counter() - started)
+
+
+class RuntimeSampler:
+    """Periodic per-worker sampling of DB connection pool stats"""
+
+    def __init__(self, engine, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                sample_pool(self.engine)
+            except Exception as e:
+                logger.warning(f"Connection pool sampling failed: {e}")
+            await asyncio.sleep(self.interval)
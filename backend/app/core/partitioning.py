@@ -0,0 +1,201 @@
+"""
+Monthly range partitioning helpers for append-mostly tables
+
+On PostgreSQL, tables registered with `register_monthly_partitioning` are
+created as `PARTITION BY RANGE (created_at)` parents with one child table per
+calendar month (`<table>_pYYYY_MM`) plus a DEFAULT partition. Retention then
+detaches and drops (or archives) whole months, which is O(1) compared to
+DELETE-ing millions of rows and never bloats the remaining indexes.
+
+Other dialects (SQLite in tests) keep ordinary tables and fall back to
+batched DELETEs by created_at.
+"""
+import logging
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Table, delete, event, func, select, text, true
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITION_SUFFIX_RE = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    month_index = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=month_index // 12, month=month_index % 12 + 1, day=1)
+
+
+def retention_cutoff(months: int, now: Optional[datetime] = None) -> datetime:
+    """Start of the oldest month that is still retained"""
+    return add_months(month_start(now or datetime.utcnow()), -(months - 1))
+
+
+def retained(column, months: int):
+    """
+    `column >= retention_cutoff(months)` while retention is enabled, so reads
+    skip rows about to be dropped and the scan stays in retained partitions;
+    no restriction otherwise, since nothing deletes the older rows then
+    """
+    if not settings.RETENTION_ENABLED:
+        return true()
+    return column >= retention_cutoff(months)
+
+
+def partition_name(table_name: str, month: datetime) -> str:
+    return f"{table_name}_p{month.year:04d}_{month.month:02d}"
+
+
+def parse_partition_month(table_name: str, name: str) -> Optional[datetime]:
+    if not name.startswith(f"{table_name}_p"):
+        return None
+    match = PARTITION_SUFFIX_RE.search(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(table_name: str, month: datetime) -> str:
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table_name, start)} "
+        f"PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    )
+
+
+def create_default_partition_sql(table_name: str) -> str:
+    return f"CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT"
+
+
+def partition_range_sql(table_name: str, first_month: datetime, last_month: datetime) -> List[str]:
+    """CREATE statements for every month in [first_month, last_month]"""
+    statements = []
+    month = month_start(first_month)
+    last_month = month_start(last_month)
+    while month <= last_month:
+        statements.append(create_partition_sql(table_name, month))
+        month = add_months(month, 1)
+    return statements
+
+
+def initial_partition_sql(table_name: str, months_ahead: Optional[int] = None, now: Optional[datetime] = None) -> List[str]:
+    """DEFAULT partition plus monthly ones up to `months_ahead` (default PARTITION_MONTHS_AHEAD) months from now"""
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    current = month_start(now or datetime.utcnow())
+    return [create_default_partition_sql(table_name)] + partition_range_sql(
+        table_name, current, add_months(current, months_ahead)
+    )
+
+
+def register_monthly_partitioning(table: Table, months_ahead: Optional[int] = None):
+    """
+    Create the DEFAULT and upcoming monthly partitions whenever the parent
+    table is created through `metadata.create_all` on PostgreSQL, as far
+    ahead as the retention job keeps them (PARTITION_MONTHS_AHEAD unless
+    `months_ahead` is given).
+    """
+    @event.listens_for(table, "after_create")
+    def _create_initial_partitions(target, connection, **kw):
+        if connection.dialect.name != "postgresql":
+            return
+        for statement in initial_partition_sql(target.name, months_ahead):
+            connection.execute(text(statement))
+
+
+def is_partitioned(connection, table_name: str) -> bool:
+    """Whether `table_name` is a partitioned parent on this connection"""
+    if connection.dialect.name != "postgresql":
+        return False
+    result = connection.execute(
+        text("SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :name"),
+        {"name": table_name},
+    )
+    return result.scalar() is not None
+
+
+def list_partitions(connection, table_name: str) -> List[Tuple[str, datetime]]:
+    """Monthly partitions of `table_name` as (name, month) pairs, oldest first"""
+    result = connection.execute(
+        text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :name
+        """),
+        {"name": table_name},
+    )
+    partitions = []
+    for (name,) in result:
+        month = parse_partition_month(table_name, name)
+        if month is not None:
+            partitions.append((name, month))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def ensure_partitions(connection, table_name: str, months_ahead: int, now: Optional[datetime] = None):
+    """Create missing partitions up to `months_ahead` months from now"""
+    for statement in initial_partition_sql(table_name, months_ahead, now):
+        connection.execute(text(statement))
+
+
+def drop_expired_partitions(
+    connection,
+    table_name: str,
+    cutoff: datetime,
+    archive_schema: Optional[str] = None,
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Detach every monthly partition that ends on or before `cutoff` and either
+    drop it or move it to `archive_schema`. Returns the affected partitions.
+    """
+    expired = [name for name, month in list_partitions(connection, table_name) if add_months(month, 1) <= cutoff]
+    if dry_run:
+        return expired
+
+    if expired and archive_schema:
+        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+
+    for name in expired:
+        connection.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {name}"))
+        if archive_schema:
+            connection.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+            logger.info(f"Archived partition {name} to schema {archive_schema}")
+        else:
+            connection.execute(text(f"DROP TABLE {name}"))
+            logger.info(f"Dropped partition {name}")
+    return expired
+
+
+def delete_rows_in_batches(
+    connection,
+    table: Table,
+    condition,
+    batch_size: int = 5000,
+    dry_run: bool = False,
+) -> int:
+    """
+    Delete rows matching `condition` a batch at a time so no single statement
+    holds locks on (or rewrites) a large part of the table.
+    """
+    if dry_run:
+        return connection.execute(select(func.count()).select_from(table).where(condition)).scalar() or 0
+
+    deleted = 0
+    while True:
+        batch = select(table.c.id).where(condition).limit(batch_size)
+        result = connection.execute(delete(table).where(table.c.id.in_(batch)))
+        deleted += result.rowcount or 0
+        if not result.rowcount or result.rowcount < batch_size:
+            return deleted
@@ -0,0 +1,137 @@
+"""
+Lazy imports and plugin registries
+
+Optional subsystems with heavy dependencies (call-tree profiling, the
+recommendation engine, and later storage drivers or AI validation) are
+registered by import path and imported on first use. A worker that never
+uses one never pays for importing it, and a missing optional dependency
+only fails the feature that needs it.
+
+    recommenders = registry("recommender")
+    recommenders.register("match_score", "app.services.recommendations:MatchScoreRecommender")
+    recommenders.get("match_score")  # imported and instantiated here, once
+
+Dedicated workers can import what they need up front with PLUGINS_PRELOAD
+("recommender:match_score,..."), see preload().
+"""
+import importlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PluginNotAvailable(LookupError):
+    """The plugin is not registered, or its module (or a dependency) failed to import"""
+
+
+def import_string(path: str) -> Any:
+    """Import "package.module:attribute", or "package.module" for the module itself"""
+    module_path, _, attribute = path.partition(":")
+    module = importlib.import_module(module_path)
+    if not attribute:
+        return module
+    target = module
+    for name in attribute.split("."):
+        target = getattr(target, name)
+    return target
+
+
+class LazyImport:
+    """An import path resolved on first load(); the result (or the ImportError) is cached"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value = None
+        self._error: Optional[ImportError] = None
+
+    def load(self) -> Any:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    try:
+                        self._value = import_string(self.path)
+                    except ImportError as e:
+                        self._error = e
+                    self._loaded = True
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def load_optional(self) -> Any:
+        """The imported object, or None when it cannot be imported"""
+        try:
+            return self.load()
+        except ImportError:
+            return None
+
+    @property
+    def available(self) -> bool:
+        return self.load_optional() is not None
+
+
+class PluginRegistry:
+    """Named factories of one kind, imported and instantiated on first get()"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._factories: Dict[str, LazyImport] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, path: str):
+        """`path` points to a class or a zero-argument factory"""
+        self._factories[name] = LazyImport(path)
+        self._instances.pop(name, None)
+
+    def names(self) -> List[str]:
+        return sorted(self._factories)
+
+    def loaded(self) -> List[str]:
+        return sorted(self._instances)
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        factory = self._factories.get(name)
+        if factory is None:
+            raise PluginNotAvailable(f"Unknown {self.kind} '{name}' (registered: {', '.join(self.names()) or 'none'})")
+        with self._lock:
+            if name not in self._instances:
+                try:
+                    self._instances[name] = factory.load()()
+                except ImportError as e:
+                    raise PluginNotAvailable(f"{self.kind} '{name}' is not available: {e}") from e
+                logger.info(f"Loaded {self.kind} plugin '{name}' from {factory.path}")
+            return self._instances[name]
+
+
+_registries: Dict[str, PluginRegistry] = {}
+
+
+def registry(kind: str) -> PluginRegistry:
+    """The registry for a kind of plugin, created on first use"""
+    if kind not in _registries:
+        _registries[kind] = PluginRegistry(kind)
+    return _registries[kind]
+
+
+def preload(spec: str) -> List[str]:
+    """
+    Load the plugins listed in `spec` ("kind:name,kind:name"); returns the
+    loaded ones. Failures are logged, not raised: the plugin then fails on
+    first use like it would without preloading.
+    """
+    loaded = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        kind, _, name = item.partition(":")
+        try:
+            registry(kind).get(name)
+            loaded.append(item)
+        except PluginNotAvailable as e:
+            logger.warning(f"Plugin preload failed: {e}")
+    return loaded
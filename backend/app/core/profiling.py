@@ -0,0 +1,238 @@
+"""
+Request profiling
+
+ProfilingMiddleware profiles a random fraction of requests
+(PROFILING_SAMPLE_RATE) and keeps every request slower than
+PROFILING_SLOW_THRESHOLD_MS. Each kept profile holds the SQL statements the
+request executed (see sql_trace) and, for profiled requests, a call tree.
+The last PROFILING_BUFFER_SIZE profiles live in an in-process ring buffer
+exposed through the admin endpoints, which can also change the settings at
+runtime.
+
+Call trees come from pyinstrument when it is installed (a sampling profiler,
+cheap enough for PROFILING_PROFILE_ALL) and from cProfile otherwise. cProfile
+profiles the whole thread, so concurrent requests can appear in its output,
+and only one cProfile session runs at a time.
+"""
+import cProfile
+import io
+import itertools
+import logging
+import pstats
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.plugins import LazyImport
+from app.core.sql_trace import current_trace, end_trace, route_template, start_trace
+
+logger = logging.getLogger(__name__)
+
+# Imported on the first profiled request, not at startup
+pyinstrument_profiler = LazyImport("pyinstrument:Profiler")
+
+CPROFILE_TOP_FUNCTIONS = 40
+
+
+@dataclass
+class ProfilingConfig:
+    """Runtime-adjustable profiling settings"""
+
+    enabled: bool = False
+    sample_rate: float = 0.0
+    slow_threshold_ms: float = 1000.0
+    profile_all: bool = False
+    buffer_size: int = 50
+    max_statements: int = 200
+
+    @classmethod
+    def from_settings(cls) -> "ProfilingConfig":
+        return cls(
+            enabled=settings.PROFILING_ENABLED,
+            sample_rate=settings.PROFILING_SAMPLE_RATE,
+            slow_threshold_ms=settings.PROFILING_SLOW_THRESHOLD_MS,
+            profile_all=settings.PROFILING_PROFILE_ALL,
+            buffer_size=settings.PROFILING_BUFFER_SIZE,
+            max_statements=settings.PROFILING_MAX_STATEMENTS,
+        )
+
+
+@dataclass
+class RequestProfile:
+    id: int
+    method: str
+    path: str
+    route: str
+    status_code: Optional[int]
+    duration_ms: float
+    started_at: datetime
+    sampled: bool
+    slow: bool
+    sql_count: int
+    sql_time_ms: float
+    sql_statements: List[Dict] = field(default_factory=list)
+    sql_dropped: int = 0
+    profiler: Optional[str] = None
+    call_tree: Optional[str] = None
+
+    def summary(self) -> Dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "duration_ms": round(self.duration_ms, 3),
+            "started_at": self.started_at,
+            "sampled": self.sampled,
+            "slow": self.slow,
+            "sql_count": self.sql_count,
+            "sql_time_ms": round(self.sql_time_ms, 3),
+            "has_call_tree": self.call_tree is not None,
+        }
+
+    def to_dict(self) -> Dict:
+        data = self.summary()
+        data.update(
+            sql_statements=self.sql_statements,
+            sql_dropped=self.sql_dropped,
+            profiler=self.profiler,
+            call_tree=self.call_tree,
+        )
+        return data
+
+
+class _CallTreeProfiler:
+    """pyinstrument if available, cProfile otherwise"""
+
+    _cprofile_active = False
+
+    def __init__(self):
+        self.name = None
+        self._profiler = None
+
+    def start(self):
+        profiler_class = pyinstrument_profiler.load_optional()
+        if profiler_class is not None:
+            self.name = "pyinstrument"
+            self._profiler = profiler_class(async_mode="enabled")
+            self._profiler.start()
+        elif not _CallTreeProfiler._cprofile_active:
+            _CallTreeProfiler._cprofile_active = True
+            self.name = "cProfile"
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self) -> Optional[str]:
+        if self._profiler is None:
+            return None
+        if self.name == "pyinstrument":
+            self._profiler.stop()
+            return self._profiler.output_text(unicode=False, color=False)
+
+        self._profiler.disable()
+        _CallTreeProfiler._cprofile_active = False
+        output = io.StringIO()
+        pstats.Stats(self._profiler, stream=output).sort_stats("cumulative").print_stats(CPROFILE_TOP_FUNCTIONS)
+        return output.getvalue()
+
+
+class ProfileStore:
+    """Ring buffer of the most recent kept profiles"""
+
+    def __init__(self, size: int):
+        self._profiles: Deque[RequestProfile] = deque(maxlen=size)
+        self._ids = itertools.count(1)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, profile: RequestProfile):
+        self._profiles.append(profile)
+
+    def resize(self, size: int):
+        self._profiles = deque(self._profiles, maxlen=size)
+
+    def list(self) -> List[RequestProfile]:
+        return list(reversed(self._profiles))
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        return next((profile for profile in self._profiles if profile.id == profile_id), None)
+
+    def clear(self):
+        self._profiles.clear()
+
+
+profiling_config = ProfilingConfig.from_settings()
+profile_store = ProfileStore(profiling_config.buffer_size)
+
+
+class ProfilingMiddleware:
+    """Samples requests and records slow ones into profile_store"""
+
+    def __init__(self, app: ASGIApp, config: ProfilingConfig = profiling_config, store: ProfileStore = profile_store):
+        self.app = app
+        self.config = config
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.config.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        sampled = random.random() < self.config.sample_rate
+        call_tree_profiler = None
+        if sampled or self.config.profile_all:
+            call_tree_profiler = _CallTreeProfiler()
+            call_tree_profiler.start()
+
+        status_code = None
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        owns_trace = current_trace() is None
+        trace = start_trace(self.config.max_statements)
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if owns_trace:
+                end_trace()
+            call_tree = call_tree_profiler.stop() if call_tree_profiler else None
+
+            slow = duration_ms >= self.config.slow_threshold_ms
+            if sampled or slow:
+                self.store.add(RequestProfile(
+                    id=self.store.next_id(),
+                    method=scope.get("method", ""),
+                    path=scope.get("path", ""),
+                    route=route_template(scope),
+                    status_code=status_code,
+                    duration_ms=duration_ms,
+                    started_at=started_at,
+                    sampled=sampled,
+                    slow=slow,
+                    sql_count=trace.count,
+                    sql_time_ms=trace.total_ms,
+                    sql_statements=[statement.to_dict() for statement in trace.statements],
+                    sql_dropped=trace.dropped,
+                    profiler=call_tree_profiler.name if call_tree_profiler else None,
+                    call_tree=call_tree,
+                ))
+                if slow:
+                    logger.warning(
+                        f"Slow request {scope.get('method')} {route_template(scope)}: "
+                        f"{duration_ms:.0f} ms, {trace.count} SQL statements ({trace.total_ms:.0f} ms)"
+                    )
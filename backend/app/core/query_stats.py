@@ -0,0 +1,127 @@
+"""
+Per-route SQL statistics and N+1 detection
+
+QueryStatsMiddleware traces the SQL of every request (see sql_trace) and
+attributes statement count, database time and rows affected by
+INSERT/UPDATE/DELETE to the route template
+("GET /api/v1/applications/{application_id}"). A statement whose SQL text
+repeats QUERY_N_PLUS_ONE_THRESHOLD times within one request is flagged as a
+suspected N+1 and logged once per route and statement.
+
+In debug mode the request's numbers are also returned as response headers:
+
+    X-DB-Query-Count, X-DB-Time-Ms, X-DB-Affected-Rows, X-DB-N-Plus-One
+"""
+import logging
+from dataclasses import asdict, dataclass
+from typing import Dict, Set, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import record_route_queries
+from app.core.sql_trace import current_trace, end_trace, route_template, start_trace
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_LOG_LENGTH = 300
+UNMATCHED_ROUTE = "<unmatched>"  # Keeps 404 scans and static files from adding one key per path
+
+
+@dataclass
+class RouteQueryStats:
+    requests: int = 0
+    statements: int = 0
+    db_time_ms: float = 0.0
+    affected_rows: int = 0
+    max_statements: int = 0
+    n_plus_one_requests: int = 0
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["db_time_ms"] = round(self.db_time_ms, 3)
+        data["avg_statements"] = round(self.statements / self.requests, 2) if self.requests else 0.0
+        data["avg_db_time_ms"] = round(self.db_time_ms / self.requests, 3) if self.requests else 0.0
+        return data
+
+
+class QueryStatsRegistry:
+    """Per-worker aggregation of traced requests by route"""
+
+    def __init__(self, n_plus_one_threshold: int):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._routes: Dict[str, RouteQueryStats] = {}
+        self._reported: Set[Tuple[str, str]] = set()
+
+    def record(self, route: str, trace) -> int:
+        """Add one request's trace; returns the number of suspected N+1 statements"""
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = RouteQueryStats()
+
+        suspects = trace.repeated(self.n_plus_one_threshold)
+
+        stats.requests += 1
+        stats.statements += trace.count
+        stats.db_time_ms += trace.total_ms
+        stats.affected_rows += trace.affected_rows
+        stats.max_statements = max(stats.max_statements, trace.count)
+        if suspects:
+            stats.n_plus_one_requests += 1
+        if settings.METRICS_ENABLED:
+            record_route_queries(route, trace, bool(suspects))
+
+        for statement, count in suspects:
+            if (route, statement) not in self._reported:
+                self._reported.add((route, statement))
+                logger.warning(
+                    f"Suspected N+1 in {route}: statement executed {count} times in one request: "
+                    f"{' '.join(statement.split())[:STATEMENT_LOG_LENGTH]}"
+                )
+
+        return len(suspects)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {route: stats.to_dict() for route, stats in sorted(self._routes.items())}
+
+    def reset(self):
+        self._routes.clear()
+        self._reported.clear()
+
+
+query_stats = QueryStatsRegistry(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+
+
+class QueryStatsMiddleware:
+    """Attributes each request's SQL to its route, optionally as debug headers"""
+
+    def __init__(self, app: ASGIApp, registry: QueryStatsRegistry = query_stats, debug_headers: bool = False):
+        self.app = app
+        self.registry = registry
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        owns_trace = current_trace() is None
+        # Counts only; statements are kept when the profiler owns the trace
+        trace = start_trace(max_statements=0)
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(trace.count)
+                headers["X-DB-Time-Ms"] = f"{trace.total_ms:.3f}"
+                headers["X-DB-Affected-Rows"] = str(trace.affected_rows)
+                headers["X-DB-N-Plus-One"] = str(len(trace.repeated(self.registry.n_plus_one_threshold)))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if self.debug_headers else send)
+        finally:
+            if owns_trace:
+                end_trace()
+            self.registry.record(f"{scope.get('method', '')} {route_template(scope, UNMATCHED_ROUTE)}", trace)
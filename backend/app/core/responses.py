@@ -0,0 +1,72 @@
+"""
+Streaming JSON responses for large collections
+
+StreamingJSONArrayResponse encodes rows one at a time with orjson while they
+are read from a server-side cursor, so memory stays flat regardless of the
+result size and the first bytes go out as soon as the first rows arrive.
+"""
+from typing import Any, AsyncIterator, Callable, Dict, Mapping, Optional
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+from app.core.database import AsyncSessionLocal
+
+STREAM_YIELD_PER = 500  # Rows fetched from the cursor per round trip
+STREAM_FLUSH_BYTES = 64 * 1024  # Encoded bytes buffered before a chunk is sent
+
+
+async def stream_rows(
+    statement,
+    transform: Callable[[Mapping], Dict[str, Any]] = dict,
+    yield_per: int = STREAM_YIELD_PER,
+    session_factory=AsyncSessionLocal,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Rows of a column-level select, read incrementally.
+    Runs in its own session: the request's get_db session is closed before a
+    streaming body is sent.
+    """
+    async with session_factory() as session:
+        result = await session.stream(statement.execution_options(yield_per=yield_per))
+        async for row in result.mappings():
+            yield transform(row)
+
+
+async def _encode_array(items: AsyncIterator[Any], flush_bytes: int) -> AsyncIterator[bytes]:
+    buffer = bytearray(b"[")
+    first = True
+    async for item in items:
+        if not first:
+            buffer += b","
+        buffer += orjson.dumps(item)
+        first = False
+        if len(buffer) >= flush_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b"]"
+    yield bytes(buffer)
+
+
+class StreamingJSONArrayResponse(StreamingResponse):
+    """JSON array response encoded incrementally from an async iterator"""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        items: AsyncIterator[Any],
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        filename: Optional[str] = None,
+        flush_bytes: int = STREAM_FLUSH_BYTES,
+    ):
+        headers = dict(headers or {})
+        if filename:
+            headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        super().__init__(
+            _encode_array(items, flush_bytes),
+            status_code=status_code,
+            headers=headers,
+            media_type=self.media_type,
+        )
@@ -0,0 +1,83 @@
+"""
+Lightweight in-process periodic task runner
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs an async callable every `interval_seconds` on the event loop.
+
+    Failures are logged and the task keeps running; the next run is
+    scheduled relative to the end of the previous one so runs never overlap.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], Awaitable[object]],
+        run_on_start: bool = True,
+    ):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.run_on_start = run_on_start
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the task on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"periodic:{self.name}")
+
+    async def stop(self):
+        """Cancel the task and wait for it to finish"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        if not self.run_on_start:
+            await asyncio.sleep(self.interval_seconds)
+        while True:
+            try:
+                await self.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Periodic task '{self.name}' failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval_seconds)
+
+
+class Scheduler:
+    """
+    Registry of periodic tasks started and stopped with the application lifespan
+    """
+
+    def __init__(self):
+        self.tasks: List[PeriodicTask] = []
+
+    def add(self, task: PeriodicTask) -> PeriodicTask:
+        self.tasks.append(task)
+        return task
+
+    def start(self):
+        for task in self.tasks:
+            logger.info(f"Starting periodic task '{task.name}' every {task.interval_seconds}s")
+            task.start()
+
+    async def stop(self):
+        for task in self.tasks:
+            await task.stop()
+
+
+scheduler = Scheduler()
@@ -0,0 +1,119 @@
+"""
+Schema revision check for booting without DDL
+
+With DB_BOOT_MODE=verify, workers do not run metadata.create_all (one
+catalog introspection query per table, on every worker, racing Alembic
+during deploys). They read alembic_version once and compare it with the
+head of alembic/versions instead:
+
+- database at the head: boot
+- database behind the head, or never migrated: SchemaVersionError, so the
+  worker fails fast instead of serving against a stale schema
+- database at a revision this code does not know: a newer release has
+  already migrated it (rolling deploy); boot with a warning
+
+The migration scripts are parsed, not imported: they import the app and
+would make every worker start pay for it.
+"""
+import ast
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+REVISION = re.compile(r"^revision\s*=\s*(.+)$", re.MULTILINE)
+DOWN_REVISION = re.compile(r"^down_revision\s*=\s*(.+)$", re.MULTILINE)
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema does not match the migrations this code expects"""
+
+
+def revision_graph(versions_dir: Path = VERSIONS_DIR) -> Dict[str, Tuple[str, ...]]:
+    """revision -> its down revisions, read from the migration scripts"""
+    graph = {}
+    for path in sorted(versions_dir.glob("*.py")):
+        source = path.read_text(encoding="utf-8")
+        revision = REVISION.search(source)
+        if not revision:
+            continue
+        down = DOWN_REVISION.search(source)
+        down_revision = ast.literal_eval(down.group(1).strip()) if down else None
+        if down_revision is None:
+            down_revision = ()
+        elif isinstance(down_revision, str):
+            down_revision = (down_revision,)
+        graph[ast.literal_eval(revision.group(1).strip())] = tuple(down_revision)
+    return graph
+
+
+def script_heads(graph: Dict[str, Tuple[str, ...]]) -> Set[str]:
+    parents = {parent for down in graph.values() for parent in down}
+    return set(graph) - parents
+
+
+def _ancestors(graph: Dict[str, Tuple[str, ...]], revisions: Set[str]) -> Set[str]:
+    seen: Set[str] = set()
+    pending = list(revisions)
+    while pending:
+        revision = pending.pop()
+        for parent in graph.get(revision, ()):
+            if parent not in seen:
+                seen.add(parent)
+                pending.append(parent)
+    return seen
+
+
+async def database_revisions(engine: AsyncEngine) -> Set[str]:
+    """The revisions stamped in alembic_version (one query when the table exists)"""
+    # Connection errors propagate as they are; only a missing table is a schema problem
+    async with engine.connect() as conn:
+        try:
+            rows = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            return {row[0] for row in rows}
+        except DBAPIError as e:
+            await conn.rollback()
+            if await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("alembic_version")):
+                raise
+            raise SchemaVersionError(
+                "Database has no alembic_version table; run `alembic upgrade head` (or `alembic stamp head` "
+                "on a database created by create_all) before starting the app"
+            ) from e
+
+
+async def verify_schema(engine: AsyncEngine, expected: Optional[str] = None, versions_dir: Path = VERSIONS_DIR) -> Set[str]:
+    """
+    Check the database revision against `expected` (default: the script
+    head). Returns the database revisions; raises SchemaVersionError when the
+    schema is outdated.
+    """
+    graph = revision_graph(versions_dir)
+    heads = {expected} if expected else script_heads(graph)
+    current = await database_revisions(engine)
+
+    if current == heads:
+        return current
+    if not current:
+        raise SchemaVersionError(f"Database is not migrated (expected {', '.join(sorted(heads))}); run `alembic upgrade head`")
+
+    unknown = current - set(graph)
+    if unknown and not (current - unknown):
+        logger.warning(
+            f"Database is at revision {', '.join(sorted(unknown))}, newer than this code "
+            f"({', '.join(sorted(heads))}); continuing"
+        )
+        return current
+
+    state = "outdated" if current & _ancestors(graph, heads) else "not at the expected revision"
+    raise SchemaVersionError(
+        f"Database schema is {state}: at {', '.join(sorted(current))}, expected {', '.join(sorted(heads))}; "
+        f"run `alembic upgrade head`"
+    )
@@ -0,0 +1,132 @@
+"""
+Per-request SQL tracing
+
+Cursor-level SQLAlchemy events record every statement executed while a
+RequestTrace is active in the current context (set by request middleware).
+Outside a trace the listeners only do a context variable lookup.
+
+SQLAlchemy's asyncio layer runs the DBAPI calls in a greenlet that inherits
+the caller's context, so statements are attributed to the request that
+awaited them.
+"""
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("sql_trace", default=None)
+
+QUERY_START_KEY = "sql_trace_query_start"
+
+
+@dataclass
+class TracedStatement:
+    statement: str
+    duration_ms: float
+    affected_rows: Optional[int]  # INSERT/UPDATE/DELETE only
+
+    def to_dict(self) -> Dict:
+        return {"statement": self.statement, "duration_ms": round(self.duration_ms, 3), "affected_rows": self.affected_rows}
+
+
+@dataclass
+class RequestTrace:
+    """Statements executed during one request"""
+
+    max_statements: int = 200
+    statements: List[TracedStatement] = field(default_factory=list)
+    count: int = 0
+    total_ms: float = 0.0
+    affected_rows: int = 0
+    dropped: int = 0
+    statement_counts: Counter = field(default_factory=Counter)
+
+    def add(self, statement: str, duration_ms: float, affected_rows: Optional[int]):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.affected_rows += affected_rows or 0
+        self.statement_counts[statement] += 1
+        if len(self.statements) < self.max_statements:
+            self.statements.append(TracedStatement(statement, duration_ms, affected_rows))
+        else:
+            self.dropped += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Statements executed at least `threshold` times with the same SQL
+        text, i.e. one query per row of an earlier result (suspected N+1)
+        """
+        return [(statement, count) for statement, count in self.statement_counts.most_common() if count >= threshold]
+
+
+def start_trace(max_statements: int = 200) -> RequestTrace:
+    """Start a trace for the current request, or join the one already active"""
+    trace = _current_trace.get()
+    if trace is None:
+        trace = RequestTrace(max_statements=max_statements)
+        _current_trace.set(trace)
+    return trace
+
+
+def end_trace():
+    _current_trace.set(None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+def _affected_rows(cursor, context) -> Optional[int]:
+    """
+    cursor.rowcount for INSERT/UPDATE/DELETE. For SELECTs it is 0 or -1 on
+    most drivers (rows are only known once fetched), so those count as None.
+    """
+    if context is None or not (context.isinsert or context.isupdate or context.isdelete):
+        return None
+    rowcount = getattr(cursor, "rowcount", -1)
+    return rowcount if rowcount is not None and rowcount >= 0 else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_trace.get() is not None:
+        conn.info.setdefault(QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    starts = conn.info.get(QUERY_START_KEY)
+    if trace is None or not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    trace.add(statement, duration_ms, _affected_rows(cursor, context))
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get(QUERY_START_KEY) if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def install_sql_trace(engine: Engine):
+    """Register the cursor listeners on a (sync) engine once"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def route_template(scope, default: Optional[str] = None) -> str:
+    """
+    Route path template (/applications/{application_id}). Requests that did
+    not match an API route get `default`, or their raw path if not given.
+    """
+    route = scope.get("route")
+    root_path = scope.get("root_path", "")
+    if route is not None and getattr(route, "path", None):
+        return f"{root_path}{route.path}"
+    return default if default is not None else scope.get("path", "")
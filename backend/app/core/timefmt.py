@@ -0,0 +1,49 @@
+"""
+Relative time formatting ("3 hours ago")
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
+
+
+def _plural(count: int, unit: str) -> str:
+    return f"{count} {unit}{'s' if count > 1 else ''} ago"
+
+
+def time_ago(created_at: Optional[datetime], now: Optional[datetime] = None, long_units: bool = False) -> str:
+    """
+    Return a human-readable time ago string.
+    `long_units` additionally collapses old timestamps into months and years.
+    """
+    if not created_at:
+        return "Unknown"
+
+    diff = (now or datetime.utcnow()) - created_at
+    days = diff.days
+
+    if long_units and days > 365:
+        return _plural(days // 365, "year")
+    if long_units and days > 30:
+        return _plural(days // 30, "month")
+    if days > 0:
+        return _plural(days, "day")
+    if diff.seconds > SECONDS_PER_HOUR:
+        return _plural(diff.seconds // SECONDS_PER_HOUR, "hour")
+    if diff.seconds > SECONDS_PER_MINUTE:
+        return _plural(diff.seconds // SECONDS_PER_MINUTE, "minute")
+    return "Just now"
+
+
+def time_ago_many(
+    timestamps: Iterable[Optional[datetime]],
+    now: Optional[datetime] = None,
+    long_units: bool = False,
+) -> List[str]:
+    """
+    Format a whole response's timestamps against a single `now`, so every
+    item in one response is relative to the same instant.
+    """
+    now = now or datetime.utcnow()
+    return [time_ago(created_at, now, long_units) for created_at in timestamps]
@@ -8,7 +8,7 @@ from sqlalchemy import select
 
 from app.core.database import get_db
 from app.core.security import decode_token, verify_token_type
-from app.models.user import User
+from app.models.user import User, UserRole
 
 # HTTP Bearer token authentication
 security = HTTPBearer()
@@ -60,3 +60,17 @@ async def get_current_active_user(
     Get current active user (already verified in get_current_user)
     """
     return current_user
+
+
+async def get_current_admin_user(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """
+    Get current user, requiring the admin role
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
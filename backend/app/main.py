@@ -5,15 +5,28 @@ Main application entry point
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
 import time
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.database import init_db, close_db, engine
+from app.core.metrics import MetricsMiddleware, RuntimeSampler, mark_worker_dead, render_metrics
+from app.core.loop_monitor import LoopMonitor
+from app.core.compression import CompressionMiddleware, PrecompressedStaticFiles
+from app.core.profiling import ProfilingMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.sql_trace import install_sql_trace
+from app.core.scheduler import scheduler, PeriodicTask
+from app.core.plugins import preload
 from app.api.v1 import api_router
+from app.services.deadline_reminders import run_deadline_reminders
+from app.services.retention import run_retention
+from app.services.activity_recorder import activity_recorder
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +35,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+runtime_sampler = RuntimeSampler(engine, settings.METRICS_SAMPLE_INTERVAL_SECONDS)
+loop_monitor = LoopMonitor(
+    settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    settings.LOOP_BLOCKED_THRESHOLD_SECONDS,
+    asyncio_debug=settings.DEBUG if settings.LOOP_ASYNCIO_DEBUG is None else settings.LOOP_ASYNCIO_DEBUG,
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -29,14 +49,48 @@ async def lifespan(app: FastAPI):
     Application lifespan manager
     """
     logger.info("Starting up NoApplAI Backend...")
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    
     # Initialize database
     await init_db()
-    logger.info("Database initialized")
+    logger.info(f"Database initialized ({settings.DB_BOOT_MODE})")
+    
+    await activity_recorder.start()
+    
+    # Optional subsystems this worker is dedicated to (imports run off the loop)
+    if settings.PLUGINS_PRELOAD:
+        from app import plugins  # noqa: F401  (registers the plugins)
+        loaded = await asyncio.to_thread(preload, settings.PLUGINS_PRELOAD)
+        logger.info(f"Preloaded plugins: {', '.join(loaded) or 'none'}")
+    
+    # Background jobs
+    if settings.DEADLINE_REMINDERS_ENABLED:
+        scheduler.add(PeriodicTask(
+            "deadline_reminders",
+            settings.DEADLINE_REMINDER_INTERVAL_SECONDS,
+            run_deadline_reminders,
+        ))
+    if settings.RETENTION_ENABLED:
+        scheduler.add(PeriodicTask(
+            "retention",
+            settings.RETENTION_INTERVAL_SECONDS,
+            run_retention,
+        ))
+    scheduler.start()
+    
+    if settings.METRICS_ENABLED:
+        runtime_sampler.start()
     
     yield
     
     # Cleanup
     logger.info("Shutting down NoApplAI Backend...")
+    await runtime_sampler.stop()
+    await loop_monitor.stop()
+    mark_worker_dead()
+    await scheduler.stop()
+    await activity_recorder.stop()
     await close_db()
     logger.info("Database connections closed")
 
@@ -50,6 +104,7 @@ app = FastAPI(
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Middleware
@@ -61,6 +116,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (brotli/gzip)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# SQL tracing for the per-route statistics and profiles below
+install_sql_trace(engine.sync_engine)
+
+# SQL statistics per route (see /api/v1/admin/query-stats)
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware, debug_headers=settings.DEBUG)
+
+# Request profiling (sampled and slow requests, see /api/v1/admin/profiles)
+# Added last so it wraps QueryStatsMiddleware and owns the SQL trace
+app.add_middleware(ProfilingMiddleware)
+
+# Request metrics (wraps profiling, SQL stats and compression)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -116,6 +190,14 @@ async def health_check():
     }
 
 
+# Prometheus metrics (aggregated across workers in multiprocess mode)
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
@@ -133,6 +215,14 @@ async def root():
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+# Frontend, with build-time precompressed variants
+if os.path.isdir(settings.FRONTEND_DIR):
+    app.mount(
+        settings.FRONTEND_MOUNT_PATH,
+        PrecompressedStaticFiles(directory=settings.FRONTEND_DIR, html=True),
+        name="frontend",
+    )
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,7 +3,10 @@ Models package initialization
 """
 from app.models.user import User, UserRole
 from app.models.program import Program
+from app.models.program_change import ProgramChange
+from app.models.program_page import ProgramPage
 from app.models.application import Application, ApplicationStatus
+from app.models.application_counter import ApplicationCounter
 from app.models.document import Document, DocumentType, DocumentStatus
 from app.models.notification import Notification, NotificationType
 from app.models.activity import Activity, ActivityType
@@ -12,8 +15,11 @@ __all__ = [
     "User",
     "UserRole",
     "Program",
+    "ProgramChange",
+    "ProgramPage",
     "Application",
     "ApplicationStatus",
+    "ApplicationCounter",
     "Document",
     "DocumentType",
     "DocumentStatus",
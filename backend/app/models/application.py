@@ -1,7 +1,7 @@
 """
 Application model - User's university applications
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLEnum, Integer
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLEnum, Integer, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -27,6 +27,10 @@ class ApplicationStatus(str, enum.Enum):
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Range scans over upcoming deadlines (deadline reminder scheduler)
+        Index("ix_applications_deadline_id", "deadline", "id"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -38,7 +42,7 @@ class Application(Base):
     
     # Dates
     submitted_date = Column(DateTime, nullable=True)
-    deadline = Column(DateTime, nullable=False)
+    deadline = Column(DateTime, nullable=True)  # Copied from the program, which may not have one
     decision_date = Column(DateTime, nullable=True)
     
     # Additional info
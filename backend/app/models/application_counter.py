@@ -0,0 +1,18 @@
+"""
+Application counter model - Sequence source for external application numbers
+"""
+from sqlalchemy import Column, String, Integer
+
+from app.core.database import Base
+
+
+class ApplicationCounter(Base):
+    __tablename__ = "application_counters"
+    
+    # One counter per (university prefix, year), e.g. ("HAR", 2025) -> HAR-2025-001
+    prefix = Column(String(10), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<ApplicationCounter {self.prefix}-{self.year}: {self.value}>"
@@ -1,13 +1,15 @@
 """
 Notification model
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Boolean, Enum as SQLEnum
+from sqlalchemy import Index, Column, String, DateTime, Text, ForeignKey, Boolean, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 import uuid
 
 from app.core.database import Base
+from app.core.partitioning import register_monthly_partitioning
+from app.core.timefmt import time_ago
 
 
 def generate_uuid():
@@ -26,6 +28,12 @@ class NotificationType(str, enum.Enum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Per-user feeds ordered by recency
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        # Monthly partitions on PostgreSQL (see app.core.partitioning)
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -43,8 +51,11 @@ class Notification(Base):
     related_application_id = Column(String, ForeignKey("applications.id", ondelete="SET NULL"), nullable=True)
     related_program_id = Column(String, ForeignKey("programs.id", ondelete="SET NULL"), nullable=True)
     
+    # Deduplication key for system-generated notifications (e.g. deadline:<app_id>:7)
+    dedupe_key = Column(String(150), nullable=True, index=True)
+    
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True, index=True)  # Partition key
     read_at = Column(DateTime, nullable=True)
     
     # Relationships
@@ -53,7 +64,7 @@ class Notification(Base):
     def __repr__(self):
         return f"<Notification {self.title} - Read: {self.is_read}>"
     
-    def to_dict(self):
+    def to_dict(self, now=None):
         return {
             "id": self.id,
             "user_id": self.user_id,
@@ -65,30 +76,12 @@ class Notification(Base):
             "related_program_id": self.related_program_id,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "read_at": self.read_at.isoformat() if self.read_at else None,
-            "time_ago": self.get_time_ago(),
+            "time_ago": self.get_time_ago(now),
         }
     
-    def get_time_ago(self) -> str:
+    def get_time_ago(self, now=None) -> str:
         """Return human-readable time ago string"""
-        if not self.created_at:
-            return "Unknown"
-        
-        now = datetime.utcnow()
-        diff = now - self.created_at
-        
-        if diff.days > 365:
-            years = diff.days // 365
-            return f"{years} year{'s' if years > 1 else ''} ago"
-        elif diff.days > 30:
-            months = diff.days // 30
-            return f"{months} month{'s' if months > 1 else ''} ago"
-        elif diff.days > 0:
-            return f"{diff.days} day{'s' if diff.days > 1 else ''} ago"
-        elif diff.seconds > 3600:
-            hours = diff.seconds // 3600
-            return f"{hours} hour{'s' if hours > 1 else ''} ago"
-        elif diff.seconds > 60:
-            minutes = diff.seconds // 60
-            return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
-        else:
-            return "Just now"
+        return time_ago(self.created_at, now, long_units=True)
+
+
+register_monthly_partitioning(Notification.__table__)
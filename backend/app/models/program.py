@@ -56,6 +56,10 @@ class Program(Base):
     is_active = Column(Boolean, default=True)
     is_featured = Column(Boolean, default=False)
     
+    # Catalog sync bookkeeping (see services.catalog_sync)
+    natural_key = Column(String(64), nullable=True, unique=True, index=True)  # Hash of program_url or university+title
+    content_hash = Column(String(64), nullable=True)  # Hash of the synced fields
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
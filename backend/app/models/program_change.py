@@ -0,0 +1,31 @@
+"""
+Program change model - Log of catalog sync changes
+"""
+from sqlalchemy import Column, String, JSON, DateTime
+from datetime import datetime
+import uuid
+
+from app.core.database import Base
+
+
+def generate_uuid():
+    return str(uuid.uuid4())
+
+
+class ProgramChange(Base):
+    __tablename__ = "program_changes"
+    
+    id = Column(String, primary_key=True, default=generate_uuid)
+    sync_id = Column(String(36), nullable=False, index=True)  # One catalog sync run
+    
+    # No foreign key: the log outlives deleted programs
+    program_id = Column(String, nullable=False, index=True)
+    natural_key = Column(String(64), nullable=True)
+    
+    change_type = Column(String(20), nullable=False)  # created, updated, reactivated, deactivated
+    changed_fields = Column(JSON, default=list)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<ProgramChange {self.change_type} {self.program_id}>"
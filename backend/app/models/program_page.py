@@ -0,0 +1,28 @@
+"""
+Program page model - Fetch cache of program pages for the enrichment crawler
+"""
+from sqlalchemy import Column, String, Integer, JSON, DateTime
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class ProgramPage(Base):
+    __tablename__ = "program_pages"
+    
+    # No foreign key: like program_changes, rows are only bookkeeping
+    program_id = Column(String, primary_key=True)
+    url = Column(String(500), nullable=False)
+    
+    # Validators sent back as If-None-Match / If-Modified-Since
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    
+    status_code = Column(Integer, nullable=True)  # Last response; null after a network error
+    error = Column(String(255), nullable=True)
+    extracted = Column(JSON, nullable=True)  # Fields extracted from the last full response
+    
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<ProgramPage {self.program_id} {self.status_code}>"
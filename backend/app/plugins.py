@@ -0,0 +1,11 @@
+"""
+Plugin manifest - optional subsystems, registered by import path
+
+Nothing listed here is imported until first use (see app.core.plugins).
+Register new engines or drivers here; select them with the matching setting.
+"""
+from app.core.plugins import registry
+
+# RECOMMENDER selects the engine used by /programs/recommendations/ai
+recommenders = registry("recommender")
+recommenders.register("match_score", "app.services.recommendations:MatchScoreRecommender")
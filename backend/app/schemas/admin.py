@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class ProfilingConfigResponse(BaseModel):
+    enabled: bool
+    sample_rate: float
+    slow_threshold_ms: float
+    profile_all: bool
+    buffer_size: int
+    max_statements: int
+    call_tree_profiler: str
+
+
+class ProfilingConfigUpdate(BaseModel):
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = Field(None, ge=0.0, le=1.0)
+    slow_threshold_ms: Optional[float] = Field(None, ge=0.0)
+    profile_all: Optional[bool] = None
+    buffer_size: Optional[int] = Field(None, ge=1, le=1000)
+    max_statements: Optional[int] = Field(None, ge=0, le=10000)
@@ -1,11 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from app.models.application import ApplicationStatus
+from app.core.config import settings
+from app.core.fieldsets import FieldSet
+from app.models.application import Application, ApplicationStatus
 
 
 class ApplicationBase(BaseModel):
-    program_id: int
+    program_id: str
     notes: Optional[str] = None
 
 
@@ -16,18 +18,21 @@ class ApplicationCreate(ApplicationBase):
 class ApplicationUpdate(BaseModel):
     status: Optional[ApplicationStatus] = None
     notes: Optional[str] = None
-    submitted_at: Optional[datetime] = None
+    submitted_date: Optional[datetime] = None
 
 
 class ApplicationResponse(BaseModel):
-    id: int
-    user_id: int
-    program_id: int
+    id: str
+    user_id: str
+    program_id: str
     application_id: str
     status: ApplicationStatus
-    progress: int
+    completion_percentage: Optional[int] = 0
     notes: Optional[str] = None
-    submitted_at: Optional[datetime] = None
+    action_required: Optional[str] = None
+    submitted_date: Optional[datetime] = None
+    deadline: Optional[datetime] = None
+    decision_date: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     
@@ -43,3 +48,39 @@ class ApplicationWithProgram(ApplicationResponse):
 
     class Config:
         from_attributes = True
+
+
+class ApplicationBatchCreate(BaseModel):
+    program_ids: List[str] = Field(..., min_length=1, max_length=settings.APPLICATION_BATCH_MAX_SIZE)
+    notes: Optional[str] = None
+
+
+class ApplicationBatchItem(BaseModel):
+    program_id: str
+    status: str  # created, not_found, already_applied, duplicate
+    application: Optional[ApplicationResponse] = None
+
+
+class ApplicationBatchResponse(BaseModel):
+    created: int
+    results: List[ApplicationBatchItem]
+
+
+# Sparse fieldsets for list endpoints (?fields= / ?view=)
+APPLICATION_FIELDS = FieldSet(
+    Application,
+    views={
+        "summary": [
+            "id",
+            "program_id",
+            "application_id",
+            "status",
+            "completion_percentage",
+            "action_required",
+            "deadline",
+            "days_left",
+        ],
+        "detail": [column.key for column in Application.__table__.columns],
+    },
+    default_view="detail",
+)
@@ -14,17 +14,22 @@ class DashboardStats(BaseModel):
 
 
 class ActivityItem(BaseModel):
-    id: int
-    action_type: str
-    description: str
+    id: str
+    activity_type: str
+    title: str
+    description: Optional[str] = None
+    related_application_id: Optional[str] = None
+    related_document_id: Optional[str] = None
+    related_program_id: Optional[str] = None
     created_at: datetime
+    time_ago: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
 class UpcomingDeadline(BaseModel):
-    application_id: int
+    application_id: str
     program_name: str
     university: str
     deadline: datetime
@@ -1,7 +1,8 @@
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
-from app.models.document import DocumentType, DocumentStatus
+from app.core.fieldsets import FieldSet
+from app.models.document import Document, DocumentType, DocumentStatus
 
 
 class DocumentUpdate(BaseModel):
@@ -39,3 +40,23 @@ class DocumentWithUrl(DocumentResponse):
 
     class Config:
         from_attributes = True
+
+
+# Sparse fieldsets (?fields= / ?view=)
+DOCUMENT_FIELDS = FieldSet(
+    Document,
+    views={
+        "summary": [
+            "id",
+            "document_type",
+            "name",
+            "filename",
+            "file_size",
+            "status",
+            "is_verified",
+            "created_at",
+        ],
+        "detail": [column.key for column in Document.__table__.columns],
+    },
+    default_view="detail",
+)
@@ -1,31 +1,43 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 from app.models.notification import NotificationType
 
 
 class NotificationCreate(BaseModel):
-    user_id: int
+    user_id: str
     type: NotificationType
     title: str
     message: str
-    application_id: Optional[int] = None
-    program_id: Optional[int] = None
+    application_id: Optional[str] = None
+    program_id: Optional[str] = None
 
 
 class NotificationUpdate(BaseModel):
     is_read: bool
 
 
+class NotificationBulkAction(BaseModel):
+    """Selects notifications by id list and/or filter predicates"""
+    ids: Optional[List[str]] = Field(None, max_length=1000)
+    notification_type: Optional[NotificationType] = None
+    before: Optional[datetime] = None
+
+
+class NotificationBulkResult(BaseModel):
+    updated: int
+
+
 class NotificationResponse(BaseModel):
-    id: int
-    user_id: int
-    type: NotificationType
+    id: str
+    user_id: str
+    # Read from the model's notification_type / related_*_id columns
+    type: NotificationType = Field(validation_alias="notification_type")
     title: str
     message: str
     is_read: bool
-    application_id: Optional[int] = None
-    program_id: Optional[int] = None
+    application_id: Optional[str] = Field(None, validation_alias="related_application_id")
+    program_id: Optional[str] = Field(None, validation_alias="related_program_id")
     created_at: datetime
 
     class Config:
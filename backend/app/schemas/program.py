@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
+from app.core.fieldsets import FieldSet
+from app.models.program import Program
 
 
 class ProgramBase(BaseModel):
@@ -74,3 +76,33 @@ class ProgramRecommendation(BaseModel):
     match_score: float
     match_reasons: List[str]
 
+
+
+# Sparse fieldsets for list endpoints (?fields= / ?view=)
+PROGRAM_SUMMARY_FIELDS = [
+    "id",
+    "university_name",
+    "program_name",
+    "degree_type",
+    "country",
+    "city",
+    "logo",
+    "color",
+    "application_fee",
+    "deadline",
+    "tuition_per_year",
+    "average_match_score",
+]
+
+# Catalog sync bookkeeping, not part of the API
+PROGRAM_INTERNAL_FIELDS = ["natural_key", "content_hash"]
+
+PROGRAM_FIELDS = FieldSet(
+    Program,
+    views={
+        "summary": PROGRAM_SUMMARY_FIELDS,
+        "detail": [column.key for column in Program.__table__.columns if column.key not in PROGRAM_INTERNAL_FIELDS],
+    },
+    default_view="detail",
+    hidden=PROGRAM_INTERNAL_FIELDS,
+)
@@ -0,0 +1,334 @@
+"""
+Per-user activity feed read model
+
+Keeps the last ACTIVITY_FEED_SIZE serialized activities of each user in a
+capped list so the dashboard feed is served without querying the activities
+table. Two stores are available:
+
+- "redis": one Redis list per user (LPUSH + LTRIM), shared by all workers;
+  operations time out after ACTIVITY_FEED_REDIS_TIMEOUT_SECONDS and a failure
+  takes Redis out of use for ACTIVITY_FEED_RETRY_SECONDS (reads go to the
+  database meanwhile)
+- "memory": a per-process ring buffer, for single-process setups and tests
+
+A feed is either complete or absent: new activities are only pushed onto
+feeds that already exist (LPUSHX), and a missing feed is rebuilt from the
+database on the next read. Write-behind activities that are not in the
+database yet are merged into rebuilds made by this process, and a feed that
+was absent when one of them was published is invalidated again once the
+recorder has flushed it, so rebuilds by other workers pick it up too.
+Activities written transactionally invalidate the feed after their session
+commits, since they may still roll back.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import and_, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.core.partitioning import retained
+from app.core.timefmt import time_ago_many
+from app.models.activity import Activity
+
+logger = logging.getLogger(__name__)
+
+FEED_FIELDS = (
+    "id",
+    "activity_type",
+    "title",
+    "description",
+    "related_application_id",
+    "related_document_id",
+    "related_program_id",
+)
+
+# Session.info key holding the users whose feeds are dropped on commit
+INVALIDATE_ON_COMMIT = "activity_feed_invalidate"
+
+
+def serialize_activity(activity) -> Dict:
+    """Feed item for an Activity row or a recorder event dict"""
+    source = activity if isinstance(activity, dict) else {
+        field: getattr(activity, field) for field in FEED_FIELDS + ("created_at",)
+    }
+    item = {field: source.get(field) for field in FEED_FIELDS}
+    activity_type = item["activity_type"]
+    item["activity_type"] = getattr(activity_type, "value", activity_type)
+    item["created_at"] = source["created_at"].isoformat()
+    return item
+
+
+def render_items(items: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
+    """Attach time_ago to every item, computed once for the whole response"""
+    created = [datetime.fromisoformat(item["created_at"]) for item in items]
+    for item, label in zip(items, time_ago_many(created, now)):
+        item["time_ago"] = label
+    return items
+
+
+class FeedStoreUnavailable(RuntimeError):
+    """The store failed recently and is skipped until its retry time"""
+
+
+class MemoryFeedStore:
+    """Per-process ring buffers, least recently used users evicted first"""
+
+    def __init__(self, size: int, max_users: int):
+        self.size = size
+        self.max_users = max_users
+        self._feeds: "OrderedDict[str, deque]" = OrderedDict()
+
+    async def push(self, user_id: str, item: Dict) -> bool:
+        feed = self._feeds.get(user_id)
+        if feed is None:
+            return False
+        feed.appendleft(item)
+        return True
+
+    async def read(self, user_id: str, limit: int) -> Optional[List[Dict]]:
+        feed = self._feeds.get(user_id)
+        if feed is None:
+            return None
+        self._feeds.move_to_end(user_id)
+        return [dict(item) for item in list(feed)[:limit]]
+
+    async def fill(self, user_id: str, items: List[Dict]):
+        self._feeds[user_id] = deque(items, maxlen=self.size)
+        self._feeds.move_to_end(user_id)
+        while len(self._feeds) > self.max_users:
+            self._feeds.popitem(last=False)
+
+    async def invalidate(self, user_id: str):
+        self._feeds.pop(user_id, None)
+
+
+class RedisFeedStore:
+    """One capped Redis list per user, newest item first"""
+
+    def __init__(self, size: int, url: str, ttl_seconds: int, timeout: float, retry_seconds: float):
+        self.size = size
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self._client = None
+        self._down_until = 0.0
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+            self._client = redis.from_url(
+                self.url, socket_connect_timeout=self.timeout, socket_timeout=self.timeout,
+            )
+        return self._client
+
+    async def _run(self, operation):
+        """Run `operation(client)`, failing fast while Redis is marked down"""
+        if time.monotonic() < self._down_until:
+            raise FeedStoreUnavailable("Redis feed store is marked down")
+        try:
+            return await operation(self.client)
+        except Exception:
+            self._down_until = time.monotonic() + self.retry_seconds
+            logger.warning(f"Redis feed store failed, skipping it for {self.retry_seconds:.0f} s")
+            raise
+
+    @staticmethod
+    def key(user_id: str) -> str:
+        return f"feed:activities:{user_id}"
+
+    async def push(self, user_id: str, item: Dict) -> bool:
+        key = self.key(user_id)
+
+        async def operation(client):
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.lpushx(key, json.dumps(item))
+                pipe.ltrim(key, 0, self.size - 1)
+                length, _ = await pipe.execute()
+            return length > 0
+
+        return await self._run(operation)
+
+    async def read(self, user_id: str, limit: int) -> Optional[List[Dict]]:
+        key = self.key(user_id)
+
+        async def operation(client):
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.exists(key)
+                pipe.lrange(key, 0, limit - 1)
+                return await pipe.execute()
+
+        exists, raw_items = await self._run(operation)
+        if not exists:
+            return None
+        return [json.loads(raw) for raw in raw_items]
+
+    async def fill(self, user_id: str, items: List[Dict]):
+        key = self.key(user_id)
+
+        async def operation(client):
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                if items:
+                    pipe.rpush(key, *[json.dumps(item) for item in items])
+                    pipe.expire(key, self.ttl_seconds)
+                await pipe.execute()
+
+        await self._run(operation)
+
+    async def invalidate(self, user_id: str):
+        await self._run(lambda client: client.delete(self.key(user_id)))
+
+
+class ActivityFeed:
+    """
+    Capped per-user feed with database fallback
+    """
+
+    def __init__(self, store, size: int):
+        self.store = store
+        self.size = size
+        self._pending: Set[asyncio.Task] = set()
+        # Published write-behind items not flushed yet: user id -> activity id -> item
+        self._unflushed: Dict[str, Dict[str, Dict]] = {}
+        # Unflushed activities whose feed was absent when published: activity id -> user id
+        self._missed: Dict[str, str] = {}
+
+    def _schedule(self, coro):
+        """Run a store update without blocking the caller"""
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task):
+        self._pending.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and not isinstance(error, FeedStoreUnavailable):
+            logger.warning(f"Activity feed update failed: {error}")
+
+    def publish(self, event: Dict):
+        """Append a newly recorded (not yet flushed) activity to its user's feed"""
+        item = serialize_activity(event)
+        self._unflushed.setdefault(event["user_id"], {})[item["id"]] = item
+        self._schedule(self._push(event["user_id"], item))
+
+    async def _push(self, user_id: str, item: Dict):
+        try:
+            appended = await self.store.push(user_id, item)
+        except Exception:
+            appended = False
+            raise
+        finally:
+            if not appended:
+                # Another worker may rebuild the feed before the flush
+                self._missed[item["id"]] = user_id
+
+    def flushed(self, events: List[Dict]):
+        """
+        Forget published activities now in the database, and drop the feeds
+        that were rebuilt while some of them were missing from it
+        """
+        stale = set()
+        for flushed_event in events:
+            user_id = flushed_event["user_id"]
+            items = self._unflushed.get(user_id)
+            if items is not None:
+                items.pop(flushed_event["id"], None)
+                if not items:
+                    del self._unflushed[user_id]
+            if self._missed.pop(flushed_event["id"], None) is not None:
+                stale.add(user_id)
+        for user_id in stale:
+            self.invalidate(user_id)
+
+    def invalidate(self, user_id: str):
+        """Drop a user's feed so the next read rebuilds it from the database"""
+        self._schedule(self.store.invalidate(user_id))
+
+    def invalidate_on_commit(self, db, user_id: str):
+        """Drop a user's feed once `db` commits; a rollback leaves it as is"""
+        session = getattr(db, "sync_session", db)
+        session.info.setdefault(INVALIDATE_ON_COMMIT, set()).add(user_id)
+
+    async def recent(self, db: AsyncSession, user_id: str, limit: int) -> List[Dict]:
+        """Latest activities for a user, newest first, with time_ago rendered"""
+        limit = min(limit, self.size)
+        try:
+            items = await self.store.read(user_id, limit)
+        except Exception as e:
+            if not isinstance(e, FeedStoreUnavailable):
+                logger.warning(f"Activity feed read failed, falling back to database: {e}")
+            record_cache_lookup("activity_feed", "error")
+            return render_items(await self._load(db, user_id, limit))
+
+        record_cache_lookup("activity_feed", "miss" if items is None else "hit")
+        if items is None:
+            items = await self._load(db, user_id, self.size)
+            try:
+                await self.store.fill(user_id, items)
+            except Exception as e:
+                if not isinstance(e, FeedStoreUnavailable):
+                    logger.warning(f"Activity feed fill failed: {e}")
+            items = [dict(item) for item in items[:limit]]
+
+        return render_items(items)
+
+    async def _load(self, db: AsyncSession, user_id: str, limit: int) -> List[Dict]:
+        result = await db.execute(
+            select(*[getattr(Activity, field) for field in FEED_FIELDS], Activity.created_at)
+            .where(and_(
+                Activity.user_id == user_id,
+                retained(Activity.created_at, settings.ACTIVITY_RETENTION_MONTHS)
+            ))
+            .order_by(Activity.created_at.desc())
+            .limit(limit)
+        )
+        items = [serialize_activity(row._asdict()) for row in result]
+
+        unflushed = self._unflushed.get(user_id)
+        if unflushed:
+            merged = {item["id"]: item for item in items}
+            merged.update((activity_id, dict(item)) for activity_id, item in unflushed.items())
+            items = sorted(merged.values(), key=lambda item: item["created_at"], reverse=True)[:limit]
+        return items
+
+
+def _create_store():
+    if settings.ACTIVITY_FEED_BACKEND == "redis":
+        return RedisFeedStore(
+            settings.ACTIVITY_FEED_SIZE,
+            settings.REDIS_URL,
+            settings.ACTIVITY_FEED_TTL_SECONDS,
+            settings.ACTIVITY_FEED_REDIS_TIMEOUT_SECONDS,
+            settings.ACTIVITY_FEED_RETRY_SECONDS,
+        )
+    return MemoryFeedStore(settings.ACTIVITY_FEED_SIZE, settings.ACTIVITY_FEED_MAX_USERS)
+
+
+activity_feed = ActivityFeed(_create_store(), settings.ACTIVITY_FEED_SIZE)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_feeds(session):
+    for user_id in session.info.pop(INVALIDATE_ON_COMMIT, ()):
+        activity_feed.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_feeds(session):
+    session.info.pop(INVALIDATE_ON_COMMIT, None)
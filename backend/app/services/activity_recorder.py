@@ -0,0 +1,317 @@
+"""
+Write-behind activity recorder
+
+Endpoints record timeline activities through `activity_recorder.record(...)`
+instead of inserting an Activity row in their own transaction. Events are
+buffered in memory and written with one multi-row INSERT when the buffer
+reaches ACTIVITY_FLUSH_BATCH_SIZE or every ACTIVITY_FLUSH_INTERVAL_SECONDS.
+
+Crash safety: every event is appended to a per-process journal file in
+ACTIVITY_SPILL_DIR before it is acknowledged. A flush rotates the journal to
+an `.inflight` file and removes it once the INSERT has committed, so on
+restart any journal left behind by a dead process is replayed.
+
+Events that must commit atomically with the caller's changes can opt out with
+`transactional=True`, which simply adds the Activity to the caller's session.
+"""
+import asyncio
+import glob
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.activity import Activity, ActivityType
+from app.services.activity_feed import activity_feed
+
+logger = logging.getLogger(__name__)
+
+activities_table = Activity.__table__
+
+ACTIVITY_FIELDS = {column.name for column in activities_table.columns}
+
+# Keeps multi-row INSERTs well below driver bind-parameter limits
+INSERT_CHUNK_SIZE = 1000
+
+
+def _serialize(event: Dict) -> str:
+    return json.dumps({
+        **event,
+        "activity_type": event["activity_type"].value,
+        "created_at": event["created_at"].isoformat(),
+    })
+
+
+def _deserialize(line: str) -> Dict:
+    event = json.loads(line)
+    event["activity_type"] = ActivityType(event["activity_type"])
+    event["created_at"] = datetime.fromisoformat(event["created_at"])
+    return event
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ActivityRecorder:
+    """
+    Buffers activity events and flushes them in batched INSERTs
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        spill_dir: Optional[str] = None,
+        fsync: Optional[bool] = None,
+        write_behind: Optional[bool] = None,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.batch_size = batch_size or settings.ACTIVITY_FLUSH_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.ACTIVITY_FLUSH_INTERVAL_SECONDS
+        self.spill_dir = Path(spill_dir or settings.ACTIVITY_SPILL_DIR)
+        self.fsync = settings.ACTIVITY_SPILL_FSYNC if fsync is None else fsync
+        self.write_behind = settings.ACTIVITY_WRITE_BEHIND if write_behind is None else write_behind
+        self.session_factory = session_factory
+
+        self._buffer: List[Dict] = []
+        self._retry: List[Tuple[Optional[Path], List[Dict]]] = []
+        self._journal = None
+        self._journal_path: Optional[Path] = None
+        self._sequence = 0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    # Recording
+
+    def build_event(self, **fields) -> Dict:
+        """Validate fields and fill in the id and timestamp"""
+        unknown = set(fields) - ACTIVITY_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown activity fields: {', '.join(sorted(unknown))}")
+        event = {
+            "id": str(uuid.uuid4()),
+            "created_at": datetime.utcnow(),
+            "description": None,
+            "related_application_id": None,
+            "related_document_id": None,
+            "related_program_id": None,
+            **fields,
+        }
+        event["activity_type"] = ActivityType(event["activity_type"])
+        return event
+
+    def record(self, db: Optional[AsyncSession] = None, transactional: bool = False, **fields) -> Dict:
+        """
+        Record an activity.
+
+        With write-behind enabled the event is journaled and buffered; call
+        this after the request's own commit so referenced rows exist when the
+        buffer is flushed. With `transactional=True` (or write-behind disabled)
+        the Activity is added to `db` and committed by the caller.
+        """
+        event = self.build_event(**fields)
+
+        if transactional or not self.write_behind:
+            if db is None:
+                raise ValueError("A session is required for transactional activities")
+            db.add(Activity(**event))
+            activity_feed.invalidate_on_commit(db, event["user_id"])
+            return event
+
+        self._journal_append(event)
+        self._buffer.append(event)
+        activity_feed.publish(event)
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+        return event
+
+    async def record_many(
+        self,
+        events: List[Dict],
+        db: Optional[AsyncSession] = None,
+        transactional: bool = False,
+    ) -> List[Dict]:
+        """
+        Record several activities at once. In transactional mode they are
+        written with multi-row INSERTs inside the caller's transaction.
+        """
+        if not (transactional or not self.write_behind):
+            return [self.record(**fields) for fields in events]
+
+        if db is None:
+            raise ValueError("A session is required for transactional activities")
+        built = [self.build_event(**fields) for fields in events]
+        for start in range(0, len(built), INSERT_CHUNK_SIZE):
+            await db.execute(insert(activities_table).values(built[start:start + INSERT_CHUNK_SIZE]))
+        for user_id in {event["user_id"] for event in built}:
+            activity_feed.invalidate_on_commit(db, user_id)
+        return built
+
+    # Journal
+
+    def _journal_append(self, event: Dict):
+        if self._journal is None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._journal_path = self.spill_dir / f"activities-{os.getpid()}.jsonl"
+            self._journal = open(self._journal_path, "a", encoding="utf-8")
+        self._journal.write(_serialize(event) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _rotate_journal(self) -> Optional[Path]:
+        """Move the current journal aside so new events start a fresh file"""
+        if self._journal is None:
+            return None
+        self._journal.close()
+        self._journal = None
+        self._sequence += 1
+        inflight = self._journal_path.with_suffix(f".{self._sequence}.inflight")
+        os.replace(self._journal_path, inflight)
+        return inflight
+
+    # Flushing
+
+    async def flush(self) -> int:
+        """Write all buffered events. Returns the number of rows inserted."""
+        async with self._flush_lock:
+            if self._buffer:
+                events, self._buffer = self._buffer, []
+                self._retry.append((self._rotate_journal(), events))
+
+            inserted = 0
+            pending, self._retry = self._retry, []
+            for index, (path, events) in enumerate(pending):
+                try:
+                    inserted += await self._insert(events)
+                except Exception as e:
+                    logger.warning(f"Activity flush failed, will retry {len(events)} events: {e}")
+                    self._retry.extend(pending[index:])
+                    break
+                activity_feed.flushed(events)
+                if path is not None:
+                    path.unlink(missing_ok=True)
+            return inserted
+
+    async def _insert(self, events: List[Dict]) -> int:
+        try:
+            async with self.session_factory() as session:
+                for start in range(0, len(events), INSERT_CHUNK_SIZE):
+                    chunk = events[start:start + INSERT_CHUNK_SIZE]
+                    await session.execute(insert(activities_table).values(chunk))
+                await session.commit()
+            return len(events)
+        except IntegrityError:
+            # One bad row (e.g. its user was deleted) must not drop the batch
+            return await self._insert_individually(events)
+
+    async def _insert_individually(self, events: List[Dict]) -> int:
+        inserted = 0
+        async with self.session_factory() as session:
+            for event in events:
+                try:
+                    async with session.begin_nested():
+                        await session.execute(insert(activities_table).values(event))
+                    inserted += 1
+                except IntegrityError as e:
+                    logger.error(f"Dropping activity {event['id']} ({event['title']}): {e.orig}")
+            await session.commit()
+        return inserted
+
+    # Lifecycle
+
+    async def replay_spill_files(self) -> int:
+        """Insert events journaled by processes that exited without flushing"""
+        replayed = 0
+        for name in sorted(glob.glob(str(self.spill_dir / "activities-*"))):
+            path = Path(name)
+            pid = int(path.name.split("-", 1)[1].split(".", 1)[0])
+            if pid != os.getpid() and _pid_alive(pid):
+                continue
+
+            try:
+                replayed += await self._replay_file(path)
+            except Exception as e:
+                logger.error(f"Could not replay activity spill file {path}: {e}", exc_info=True)
+                continue
+            path.unlink(missing_ok=True)
+
+        if replayed:
+            logger.info(f"Replayed {replayed} activities from spill files")
+        return replayed
+
+    async def _replay_file(self, path: Path) -> int:
+        with open(path, encoding="utf-8") as f:
+            events = [_deserialize(line) for line in f if line.strip()]
+        if not events:
+            return 0
+
+        # The process may have died after the INSERT committed but before
+        # the inflight file was removed
+        async with self.session_factory() as session:
+            existing = await session.execute(
+                select(activities_table.c.id).where(activities_table.c.id.in_([e["id"] for e in events]))
+            )
+            existing_ids = {row.id for row in existing}
+
+        events = [e for e in events if e["id"] not in existing_ids]
+        if not events:
+            return 0
+        inserted = await self._insert(events)
+        # Feeds rebuilt while these were lost with their process lack them
+        for user_id in {e["user_id"] for e in events}:
+            activity_feed.invalidate(user_id)
+        return inserted
+
+    async def start(self):
+        if not self.write_behind or self._task is not None:
+            return
+        await self.replay_spill_files()
+        self._task = asyncio.create_task(self._run(), name="activity-recorder")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Activity recorder flush error: {e}", exc_info=True)
+
+
+activity_recorder = ActivityRecorder()
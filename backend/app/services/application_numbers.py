@@ -0,0 +1,66 @@
+"""
+Allocation of external application numbers (e.g. HAR-2025-004)
+
+Numbers come from a per-(prefix, year) row in `application_counters` that is
+incremented with a single atomic upsert:
+
+    INSERT INTO application_counters (prefix, year, value) VALUES (:p, :y, :n)
+    ON CONFLICT (prefix, year) DO UPDATE SET value = application_counters.value + :n
+    RETURNING value
+
+Concurrent callers serialize on the counter row, so every caller receives a
+distinct contiguous range without retries. Allocation runs on the caller's
+session, in the same transaction as the application rows: a request never
+needs a second pooled connection, and a rolled back insert gives its numbers
+back. Allocate right before inserting and commit promptly, since the counter
+row stays locked until then; callers allocating for several prefixes do it in
+sorted prefix order so concurrent transactions cannot deadlock.
+"""
+import re
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_dialect_insert
+from app.models.application_counter import ApplicationCounter
+
+counters_table = ApplicationCounter.__table__
+
+DEFAULT_PREFIX = "APP"
+
+
+def application_prefix(university_name: Optional[str]) -> str:
+    """First three alphanumeric characters of the university name"""
+    letters = re.sub(r"[^A-Za-z0-9]", "", university_name or "")
+    return letters[:3].upper() or DEFAULT_PREFIX
+
+
+def format_application_number(prefix: str, year: int, number: int) -> str:
+    return f"{prefix}-{year}-{number:03d}"
+
+
+async def allocate_application_numbers(
+    db: AsyncSession,
+    prefix: str,
+    count: int = 1,
+    year: Optional[int] = None,
+) -> List[str]:
+    """Reserve `count` consecutive application numbers for a prefix in `db`'s transaction"""
+    if count < 1:
+        return []
+    year = year or datetime.utcnow().year
+
+    insert = get_dialect_insert(db.bind.dialect.name)
+    statement = insert(counters_table).values(prefix=prefix, year=year, value=count)
+    statement = statement.on_conflict_do_update(
+        index_elements=[counters_table.c.prefix, counters_table.c.year],
+        set_={"value": counters_table.c.value + count},
+    ).returning(counters_table.c.value)
+
+    last = (await db.execute(statement)).scalar_one()
+    return [format_application_number(prefix, year, number) for number in range(last - count + 1, last + 1)]
+
+
+async def allocate_application_number(db: AsyncSession, prefix: str, year: Optional[int] = None) -> str:
+    return (await allocate_application_numbers(db, prefix, 1, year))[0]
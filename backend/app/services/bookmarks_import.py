@@ -0,0 +1,278 @@
+"""
+Program catalog ingestion from a browser bookmarks export
+
+Parses Netscape bookmark files (the HTML every browser exports) with an
+event-driven HTMLParser fed in fixed-size chunks, so memory stays bounded by
+the chunk size and one batch of bookmarks regardless of the export size
+(favicons are inlined as base64 and make these files large).
+
+Each bookmark becomes a record in the programs_seed_data.json format:
+university/organization, country and degree type are inferred from the URL
+host and the title with precompiled pattern tables. Batches of bookmarks,
+grouped by folder, are turned into records on a process pool; the resulting
+records go to program_import (bulk load) or catalog_sync.
+"""
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+READ_CHUNK_SIZE = 64 * 1024
+DEFAULT_BATCH_SIZE = 500
+
+
+@dataclass
+class Bookmark:
+    url: str
+    title: str
+    folder: Tuple[str, ...]
+    added_at: Optional[datetime] = None
+
+
+class BookmarkParser(HTMLParser):
+    """
+    Incremental Netscape bookmark parser. Folders are <H3> headings followed
+    by a <DL> list; links are <A HREF=...>title</A>. Completed bookmarks are
+    passed to `emit` as soon as their </A> is seen.
+    """
+
+    def __init__(self, emit: Callable[[Bookmark], None]):
+        super().__init__(convert_charrefs=True)
+        self.emit = emit
+        self.folders: List[str] = []
+        self._heading: Optional[List[str]] = None
+        self._pending_folder: Optional[str] = None
+        self._link: Optional[Dict] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "h3":
+            self._heading = []
+        elif tag == "dl":
+            # The root list has no heading
+            self.folders.append(self._pending_folder or "")
+            self._pending_folder = None
+        elif tag == "a":
+            attributes = dict(attrs)
+            href = attributes.get("href")
+            if href:
+                self._link = {"url": href, "add_date": attributes.get("add_date"), "title": []}
+
+    def handle_endtag(self, tag):
+        if tag == "h3" and self._heading is not None:
+            self._pending_folder = "".join(self._heading).strip()
+            self._heading = None
+        elif tag == "dl" and self.folders:
+            self.folders.pop()
+        elif tag == "a" and self._link is not None:
+            link, self._link = self._link, None
+            added_at = None
+            if link["add_date"] and link["add_date"].isdigit():
+                added_at = datetime.utcfromtimestamp(int(link["add_date"]))
+            self.emit(Bookmark(
+                url=link["url"],
+                title=" ".join("".join(link["title"]).split()),
+                folder=tuple(folder for folder in self.folders if folder),
+                added_at=added_at,
+            ))
+
+    def handle_data(self, data):
+        if self._heading is not None:
+            self._heading.append(data)
+        elif self._link is not None:
+            self._link["title"].append(data)
+
+
+def iter_bookmarks(path: Path, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Bookmark]:
+    """Bookmarks of an export file, in document order, reading `chunk_size` characters at a time"""
+    ready: deque = deque()
+    parser = BookmarkParser(ready.append)
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            while ready:
+                yield ready.popleft()
+    parser.close()
+    while ready:
+        yield ready.popleft()
+
+
+# Hint tables. Order matters: the first match wins.
+
+# (host pattern, organization, country)
+HOST_HINTS = [
+    (re.compile(pattern), organization, country)
+    for pattern, organization, country in [
+        (r"(^|\.)(tum\.de|mytum\.de)$", "Technical University of Munich", "Germany"),
+        (r"(^|\.)lmu\.de$", "LMU Munich", "Germany"),
+        (r"(^|\.)ethz\.ch$", "ETH Zurich", "Switzerland"),
+        (r"(^|\.)uzh\.ch$", "University of Zurich", "Switzerland"),
+        (r"(^|\.)epfl\.ch$", "EPFL", "Switzerland"),
+        (r"(^|\.)mit\.edu$", "Massachusetts Institute of Technology", "USA"),
+        (r"(^|\.)unimelb\.edu\.au$", "University of Melbourne", "Australia"),
+        (r"(^|\.)u-tokyo\.ac\.jp$", "University of Tokyo", "Japan"),
+        (r"(^|\.)ru\.nl$", "Radboud University", "Netherlands"),
+        (r"(^|\.)daad\.(de|az)$", "DAAD", "Germany"),
+        (r"(^|\.)bmwgroup\.(jobs|com)$", "BMW Group", "Germany"),
+        (r"(^|\.)allianz\.com$", "Allianz", "Germany"),
+        (r"(^|\.)lacaixafoundation\.org$", "\"la Caixa\" Foundation", "Spain"),
+        (r"(^|\.)euraxess\.", "EURAXESS", None),
+        (r"(^|\.)erasmusintern\.org$", "Erasmus Intern", None),
+    ]
+]
+
+# Country from the host's top-level domain when no organization matched
+TLD_COUNTRIES = {
+    "de": "Germany", "ch": "Switzerland", "at": "Austria", "nl": "Netherlands", "fr": "France",
+    "it": "Italy", "es": "Spain", "se": "Sweden", "dk": "Denmark", "fi": "Finland", "no": "Norway",
+    "uk": "United Kingdom", "ie": "Ireland", "be": "Belgium", "pl": "Poland", "cz": "Czech Republic",
+    "au": "Australia", "ca": "Canada", "jp": "Japan", "edu": "USA", "az": "Azerbaijan", "tr": "Turkey",
+}
+
+# Job board postings, whose titles read "<position> | <organization> | <site>"
+JOB_BOARD_HOST = re.compile(r"(^|\.)(linkedin\.com|indeed\.com|glassdoor\.com|stepstone\.de)$")
+JOB_POSTING_PATH = re.compile(r"/(jobs?|stellenangebote)/")
+SITE_SUFFIX = re.compile(r"\s*[|\-–]\s*(LinkedIn|Indeed|Glassdoor|StepStone|YouTube)\s*$", re.IGNORECASE)
+NOTIFICATION_COUNT = re.compile(r"^\(\d+\)\s*")
+
+# (title pattern, organization) for universities named in the title
+TITLE_UNIVERSITY = re.compile(
+    r"\b((?:University|Universität|Université|Universidad|Institute) of [A-Z][\w\-]+(?: [A-Z][\w\-]+)*"
+    r"|[A-Z][\w\-]+(?: [A-Z][\w\-]+)* (?:University|Universität|Institute of Technology))\b"
+)
+
+# (title pattern, degree type), using the labels of the seed catalog
+DEGREE_HINTS = [
+    (re.compile(pattern, re.IGNORECASE), degree)
+    for pattern, degree in [
+        (r"\b(ph\.?\s?d|doctoral|doctorate|doktorand\w*|promotion)\b", "PhD"),
+        (r"\b(m\.?\s?sc|master'?s?|yüksek lisans|magistr\w*)\b", "Master"),
+        (r"\b(b\.?\s?sc|bachelor'?s?|undergraduate)\b", "Bachelor"),
+        (r"\b(fellowships?|scholarships?|stipend\w*|təqaüd\w*|burs\w*)\b", "Fellowship/Scholarship"),
+        (r"\b(intern(ship)?s?|werkstudent\w*|working student|praktikum)\b", "Internship"),
+        (r"\b(research (scientist|assistant|associate|engineer|position)|postdoc\w*|scientific assistant|"
+         r"wissenschaftlich\w*|research group|lab)\b", "Research Position"),
+    ]
+]
+
+
+def _host(url: str) -> str:
+    host = urlsplit(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def _is_job_posting(host: str, url: str) -> bool:
+    return bool(JOB_BOARD_HOST.search(host) and JOB_POSTING_PATH.search(urlsplit(url).path))
+
+
+def bookmark_record(bookmark: Bookmark) -> Dict:
+    """A programs_seed_data.json record for one bookmark"""
+    title = NOTIFICATION_COUNT.sub("", bookmark.title)
+    host = _host(bookmark.url)
+
+    organization, country = None, None
+    for pattern, name, name_country in HOST_HINTS:
+        if pattern.search(host):
+            organization, country = name, name_country
+            break
+
+    if _is_job_posting(host, bookmark.url):
+        segments = [segment.strip() for segment in SITE_SUFFIX.sub("", title).split("|")]
+        if len(segments) >= 2 and segments[-1]:
+            organization = segments[-1]
+            title = " | ".join(segments[:-1])
+    else:
+        title = SITE_SUFFIX.sub("", title)
+
+    if organization is None:
+        match = TITLE_UNIVERSITY.search(title)
+        if match:
+            organization = match.group(1)
+
+    if country is None:
+        country = TLD_COUNTRIES.get(host.rsplit(".", 1)[-1])
+
+    degree_type = next((degree for pattern, degree in DEGREE_HINTS if pattern.search(title)), None)
+
+    return {
+        "title": title or bookmark.url,
+        "program_url": bookmark.url,
+        "university": organization,
+        "country": country,
+        "degree_type": degree_type,
+        "deadline": None,
+        "requirements": None,
+        "description": None,
+    }
+
+
+def records_for_batch(batch: List[Bookmark], keep_all: bool = False) -> List[Dict]:
+    """
+    Records for a batch of bookmarks. Unless `keep_all`, only bookmarks that
+    look like programs (an organization or a degree hint) are kept; the host
+    stands in for an unknown organization.
+    """
+    records = []
+    for bookmark in batch:
+        if not bookmark.url.startswith(("http://", "https://")):
+            continue
+        record = bookmark_record(bookmark)
+        if record["university"] is None:
+            if not (keep_all or record["degree_type"]):
+                continue
+            record["university"] = _host(bookmark.url)
+        records.append(record)
+    return records
+
+
+def _folder_batches(
+    bookmarks: Iterator[Bookmark],
+    batch_size: int,
+    folders: Optional[List[str]] = None,
+) -> Iterator[List[Bookmark]]:
+    """Consecutive bookmarks of the same folder, at most `batch_size` at a time"""
+    batch: List[Bookmark] = []
+    for bookmark in bookmarks:
+        if folders and not any(folder in bookmark.folder for folder in folders):
+            continue
+        if batch and (len(batch) >= batch_size or batch[-1].folder != bookmark.folder):
+            yield batch
+            batch = []
+        batch.append(bookmark)
+    if batch:
+        yield batch
+
+
+def iter_record_batches(
+    path: Path,
+    processes: int = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    folders: Optional[List[str]] = None,
+    keep_all: bool = False,
+) -> Iterator[List[Dict]]:
+    """
+    Record batches of an export, in document order. With `processes` > 1 the
+    batches are converted on a process pool with at most 2 x `processes`
+    batches in flight.
+    """
+    batches = _folder_batches(iter_bookmarks(path), batch_size, folders)
+    if processes <= 1:
+        for batch in batches:
+            yield records_for_batch(batch, keep_all)
+        return
+
+    with ProcessPoolExecutor(processes) as pool:
+        pending: deque = deque()
+        for batch in batches:
+            pending.append(pool.submit(records_for_batch, batch, keep_all))
+            if len(pending) >= processes * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,375 @@
+"""
+Program catalog statistics and health checks
+
+Computes, for the programs table:
+
+- coverage of every nullable field (plus degree_type / country, whose
+  placeholders DEFAULT_DEGREE_TYPE / DEFAULT_COUNTRY count as missing);
+  empty JSON lists count as missing
+- per-country, per-university, per-degree-type and per-deadline-month
+  distributions, with the share of complete programs in each group
+- deadline buckets relative to now
+- duplicates: programs sharing a normalized URL, and titles of the same
+  university that are identical or near-identical once normalized
+
+Everything except title similarity comes from one grouped statement: a
+single GROUPING SETS scan on PostgreSQL, a UNION ALL of grouped selects
+elsewhere. `streamed=True` computes the same numbers from one streamed scan
+instead, for tables where the grouped query is too heavy for the database.
+Title similarity always uses a streamed scan ordered by university and
+compares each title with its next few neighbors (sorted neighborhood), so it
+stays linear in the table size.
+"""
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import JSON, String, and_, case, cast, func, literal, literal_column, select, union_all
+from sqlalchemy.engine import Connection
+
+from app.services.program_import import DEFAULT_COUNTRY, DEFAULT_DEGREE_TYPE, programs_table
+
+STREAM_YIELD_PER = 5000
+DEFAULT_TOP = 20
+DEFAULT_SIMILARITY = 0.92
+SIMILARITY_WINDOW = 5
+DUPLICATE_EXAMPLES = 20
+
+PLACEHOLDERS = {"degree_type": DEFAULT_DEGREE_TYPE, "country": DEFAULT_COUNTRY}
+# A program is complete when all of these are present
+COMPLETENESS_FIELDS = ("degree_type", "country", "deadline", "description", "required_documents", "program_url")
+EMPTY_JSON = ("[]", "{}", "null")
+
+DIMENSIONS = ("country", "university", "degree_type", "deadline_month")
+# (name, lower bound in days, upper bound in days); None is unbounded
+DEADLINE_BUCKETS = (
+    ("past", None, 0),
+    ("next_30_days", 0, 30),
+    ("next_31_90_days", 30, 90),
+    ("next_91_365_days", 90, 365),
+    ("later", 365, None),
+)
+
+TITLE_NOISE = re.compile(r"[^\w]+")
+
+
+@dataclass
+class DuplicateGroup:
+    kind: str
+    key: str
+    program_ids: List[str]
+    titles: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {"kind": self.kind, "key": self.key, "program_ids": self.program_ids, "titles": self.titles}
+
+
+def coverage_fields() -> List[str]:
+    """Fields whose presence is measured: every nullable column plus the placeholder-defaulted ones"""
+    return [
+        column.name for column in programs_table.columns
+        if not column.primary_key and (column.nullable or column.name in PLACEHOLDERS)
+    ]
+
+
+def _present_sql(name: str):
+    column = programs_table.c[name]
+    condition = column.is_not(None)
+    if isinstance(column.type, JSON):
+        condition = and_(condition, cast(column, String).notin_(EMPTY_JSON))
+    if name in PLACEHOLDERS:
+        condition = and_(condition, column != PLACEHOLDERS[name])
+    return condition
+
+
+def _present(name: str, value) -> bool:
+    if value is None or value in ([], {}):
+        return False
+    return PLACEHOLDERS.get(name) != value
+
+
+def _deadline_bucket_sql(now: datetime, lower: Optional[int], upper: Optional[int]):
+    deadline = programs_table.c.deadline
+    conditions = [deadline.is_not(None)]
+    if lower is not None:
+        conditions.append(deadline >= now + timedelta(days=lower))
+    if upper is not None:
+        conditions.append(deadline < now + timedelta(days=upper))
+    return and_(*conditions)
+
+
+def _deadline_bucket(now: datetime, deadline: Optional[datetime]) -> Optional[str]:
+    if deadline is None:
+        return None
+    days = (deadline - now).total_seconds() / 86400
+    for name, lower, upper in DEADLINE_BUCKETS:
+        if (lower is None or days >= lower) and (upper is None or days < upper):
+            return name
+    return None
+
+
+def _deadline_month(dialect_name: str):
+    # Inline formats: PostgreSQL only matches GROUPING() arguments to the
+    # grouping expressions when they are textually identical
+    deadline = programs_table.c.deadline
+    if dialect_name == "postgresql":
+        return func.to_char(deadline, literal_column("'YYYY-MM'"))
+    return func.strftime(literal_column("'%Y-%m'"), deadline)
+
+
+def _aggregates(now: datetime) -> List:
+    """Aggregate columns shared by every group; additive, so groups sum to the totals"""
+    def count_if(condition, label):
+        return func.sum(case((condition, 1), else_=0)).label(label)
+
+    c = programs_table.c
+    return [
+        func.count().label("programs"),
+        count_if(c.is_active.is_(True), "active"),
+        count_if(and_(*[_present_sql(name) for name in COMPLETENESS_FIELDS]), "complete"),
+        *[count_if(_present_sql(name), f"has_{name}") for name in coverage_fields()],
+        *[count_if(_deadline_bucket_sql(now, lower, upper), f"deadline_{name}") for name, lower, upper in DEADLINE_BUCKETS],
+    ]
+
+
+def _dimension_columns(dialect_name: str) -> Dict:
+    c = programs_table.c
+    return {
+        "country": c.country,
+        "university": c.university_name,
+        "degree_type": c.degree_type,
+        "deadline_month": _deadline_month(dialect_name),
+    }
+
+
+def grouped_rows(connection: Connection, now: datetime) -> List[Dict]:
+    """One row per (dimension, value) with the aggregates, from a single statement"""
+    dialect_name = connection.dialect.name
+    dimensions = _dimension_columns(dialect_name)
+    aggregates = _aggregates(now)
+
+    if dialect_name == "postgresql":
+        # GROUPING() sets the bit of every column a row is not grouped by
+        full = (1 << len(DIMENSIONS)) - 1
+        by_mask = {full ^ (1 << (len(DIMENSIONS) - 1 - i)): name for i, name in enumerate(DIMENSIONS)}
+        columns = list(dimensions.values())
+        statement = (
+            select(func.grouping(*columns).label("grouping_mask"), *[column.label(name) for name, column in dimensions.items()], *aggregates)
+            .group_by(func.grouping_sets(*columns))
+        )
+        rows = []
+        for row in connection.execute(statement).mappings():
+            dimension = by_mask[row["grouping_mask"]]
+            rows.append({**row, "dimension": dimension, "value": row[dimension]})
+        return rows
+
+    statement = union_all(*[
+        select(literal(name).label("dimension"), cast(column, String).label("value"), *aggregates).group_by(column)
+        for name, column in dimensions.items()
+    ])
+    return [dict(row) for row in connection.execute(statement).mappings()]
+
+
+def streamed_rows(connection: Connection, now: datetime) -> List[Dict]:
+    """Same rows as grouped_rows, accumulated from one streamed scan"""
+    fields = coverage_fields()
+    c = programs_table.c
+    columns = sorted({"university_name", "is_active", *fields, *COMPLETENESS_FIELDS})
+    statement = select(*[c[name] for name in columns]).execution_options(yield_per=STREAM_YIELD_PER)
+
+    groups: Dict[Tuple[str, Optional[str]], Counter] = defaultdict(Counter)
+    for row in connection.execute(statement).mappings():
+        deadline = row["deadline"]
+        counts = Counter(programs=1)
+        counts["active"] = int(bool(row["is_active"]))
+        counts["complete"] = int(all(_present(name, row[name]) for name in COMPLETENESS_FIELDS))
+        for name in fields:
+            counts[f"has_{name}"] = int(_present(name, row[name]))
+        bucket = _deadline_bucket(now, deadline)
+        if bucket:
+            counts[f"deadline_{bucket}"] = 1
+        values = {
+            "country": row["country"],
+            "university": row["university_name"],
+            "degree_type": row["degree_type"],
+            "deadline_month": deadline.strftime("%Y-%m") if deadline else None,
+        }
+        for dimension, value in values.items():
+            groups[(dimension, value)].update(counts)
+
+    names = ["programs", "active", "complete", *[f"has_{name}" for name in fields],
+             *[f"deadline_{name}" for name, _, _ in DEADLINE_BUCKETS]]
+    return [
+        {"dimension": dimension, "value": value, **{name: counts[name] for name in names}}
+        for (dimension, value), counts in groups.items()
+    ]
+
+
+def url_duplicates(connection: Connection) -> List[DuplicateGroup]:
+    """Programs whose URLs are equal ignoring case and a trailing slash"""
+    c = programs_table.c
+    normalized = func.lower(func.rtrim(c.program_url, "/"))
+    duplicated = (
+        select(normalized.label("url"))
+        .where(c.program_url.is_not(None))
+        .group_by(normalized)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    rows = connection.execute(
+        select(duplicated.c.url, c.id, c.program_name)
+        .join(duplicated, normalized == duplicated.c.url)
+        .order_by(duplicated.c.url, c.created_at)
+    )
+    groups: Dict[str, DuplicateGroup] = {}
+    for url, program_id, title in rows:
+        group = groups.setdefault(url, DuplicateGroup(kind="url", key=url, program_ids=[]))
+        group.program_ids.append(program_id)
+        group.titles.append(title)
+    return list(groups.values())
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(TITLE_NOISE.sub(" ", title.lower()).split())
+
+
+def title_duplicates(
+    connection: Connection,
+    threshold: float = DEFAULT_SIMILARITY,
+    window: int = SIMILARITY_WINDOW,
+) -> List[DuplicateGroup]:
+    """
+    Programs of the same university whose normalized titles are equal or at
+    least `threshold` similar, comparing each title with the next `window`
+    titles in sorted order
+    """
+    c = programs_table.c
+    statement = (
+        select(c.university_name, c.id, c.program_name)
+        .order_by(c.university_name, c.program_name)
+        .execution_options(yield_per=STREAM_YIELD_PER)
+    )
+
+    groups: List[DuplicateGroup] = []
+
+    def scan(university: str, titles: List[Tuple[str, str, str]]):
+        titles.sort(key=lambda item: item[0])
+        parent = list(range(len(titles)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, (normalized, _, _) in enumerate(titles):
+            for j in range(i + 1, min(i + 1 + window, len(titles))):
+                other = titles[j][0]
+                matcher = SequenceMatcher(None, normalized, other, autojunk=False)
+                if normalized == other or (matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold):
+                    parent[find(j)] = find(i)
+
+        clusters: Dict[int, List[int]] = defaultdict(list)
+        for i in range(len(titles)):
+            clusters[find(i)].append(i)
+        for members in clusters.values():
+            if len(members) > 1:
+                groups.append(DuplicateGroup(
+                    kind="title",
+                    key=university,
+                    program_ids=[titles[i][1] for i in members],
+                    titles=[titles[i][2] for i in members],
+                ))
+
+    current, titles = None, []
+    for university, program_id, title in connection.execute(statement):
+        if university != current:
+            if titles:
+                scan(current, titles)
+            current, titles = university, []
+        titles.append((normalize_title(title or ""), program_id, title))
+    if titles:
+        scan(current, titles)
+    return groups
+
+
+def _ratio(part: int, total: int) -> float:
+    return round(part / total, 4) if total else 0.0
+
+
+def _distribution(rows: Iterable[Dict], top: Optional[int]) -> List[Dict]:
+    ordered = sorted(rows, key=lambda row: (-row["programs"], str(row["value"])))
+    if top:
+        ordered = ordered[:top]
+    return [
+        {"value": row["value"], "programs": row["programs"], "complete_ratio": _ratio(row["complete"], row["programs"])}
+        for row in ordered
+    ]
+
+
+def _duplicate_summary(groups: List[DuplicateGroup]) -> Dict:
+    return {
+        "groups": len(groups),
+        "programs": sum(len(group.program_ids) for group in groups),
+        # Programs that would go if each group kept one
+        "excess": sum(len(group.program_ids) - 1 for group in groups),
+        "examples": [group.to_dict() for group in groups[:DUPLICATE_EXAMPLES]],
+    }
+
+
+def catalog_stats(
+    connection: Connection,
+    top: Optional[int] = DEFAULT_TOP,
+    streamed: bool = False,
+    similarity: float = DEFAULT_SIMILARITY,
+    now: Optional[datetime] = None,
+) -> Dict:
+    """The catalog statistics report, as a JSON-serializable dict"""
+    started = time.perf_counter()
+    now = now or datetime.utcnow()
+    rows = streamed_rows(connection, now) if streamed else grouped_rows(connection, now)
+
+    by_dimension: Dict[str, List[Dict]] = defaultdict(list)
+    for row in rows:
+        by_dimension[row["dimension"]].append(row)
+    # Every program is in exactly one country group, so those rows sum to the totals
+    totals = Counter()
+    for row in by_dimension["country"]:
+        totals.update({name: value or 0 for name, value in row.items() if name not in ("dimension", "value", "grouping_mask", *DIMENSIONS)})
+    total = totals["programs"]
+
+    months = sorted(
+        (row for row in by_dimension["deadline_month"] if row["value"] is not None), key=lambda row: row["value"]
+    )
+    url_groups = url_duplicates(connection)
+    title_groups = title_duplicates(connection, similarity)
+
+    return {
+        "generated_at": now.isoformat(),
+        "mode": "streamed" if streamed else "grouped",
+        "programs": total,
+        "active": totals["active"],
+        "complete": {"programs": totals["complete"], "ratio": _ratio(totals["complete"], total)},
+        "coverage": {
+            name: {"present": totals[f"has_{name}"], "ratio": _ratio(totals[f"has_{name}"], total)}
+            for name in coverage_fields()
+        },
+        "deadlines": {
+            "missing": total - totals["has_deadline"],
+            **{name: totals[f"deadline_{name}"] for name, _, _ in DEADLINE_BUCKETS},
+            "by_month": {row["value"]: row["programs"] for row in months},
+        },
+        "distinct": {dimension: len(by_dimension[dimension]) for dimension in ("country", "university", "degree_type")},
+        "distributions": {
+            dimension: _distribution(by_dimension[dimension], top) for dimension in ("country", "university", "degree_type")
+        },
+        "duplicates": {
+            "url": _duplicate_summary(url_groups),
+            "title": _duplicate_summary(title_groups),
+        },
+        "seconds": round(time.perf_counter() - started, 3),
+    }
@@ -0,0 +1,286 @@
+"""
+Incremental program catalog sync
+
+Applies a scraped catalog (records in the programs_seed_data.json format) to
+the programs table without truncating it:
+
+1. Records are normalized by program_import, which gives each one a natural
+   key (canonical program_url, or university + title) and a content hash of
+   the synced fields.
+2. The keys are looked up in batches. Records with unknown keys are new,
+   records whose hash differs (or whose program was deactivated) changed,
+   the rest are skipped.
+3. New and changed rows are written with INSERT ... ON CONFLICT (natural_key)
+   DO UPDATE in batches of CATALOG_SYNC_BATCH_SIZE. The update only touches
+   the synced fields and is guarded by a content hash comparison, so a rerun
+   (or a concurrent run) writes nothing. Fields edited in the app (tags,
+   fees, match scores...) are never overwritten.
+4. Optionally, active programs missing from the catalog are deactivated.
+
+Every change is written to program_changes under one sync_id. Once the
+transaction has committed, the registered invalidation handlers receive the
+changed program ids (sync_programs.py publishes them on
+CATALOG_INVALIDATION_CHANNEL).
+"""
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.database import get_dialect_insert
+from app.models.program_change import ProgramChange
+from app.services.program_import import PROGRAM_COLUMNS, SYNCED_FIELDS, normalize_programs, programs_table
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_BATCH_SIZE = 1000
+INVALIDATION_MESSAGE_IDS = 1000
+
+CHANGE_CREATED = "created"
+CHANGE_UPDATED = "updated"
+CHANGE_REACTIVATED = "reactivated"
+CHANGE_DEACTIVATED = "deactivated"
+
+changes_table = ProgramChange.__table__
+
+
+@dataclass
+class SyncResult:
+    sync_id: str
+    dry_run: bool = False
+    received: int = 0
+    created: int = 0
+    updated: int = 0
+    reactivated: int = 0
+    deactivated: int = 0
+    unchanged: int = 0
+    rejected: List[Tuple[int, str]] = field(default_factory=list)
+    changed_ids: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def summary(self) -> Dict:
+        return {
+            "sync_id": self.sync_id,
+            "dry_run": self.dry_run,
+            "received": self.received,
+            "created": self.created,
+            "updated": self.updated,
+            "reactivated": self.reactivated,
+            "deactivated": self.deactivated,
+            "unchanged": self.unchanged,
+            "rejected": len(self.rejected),
+            "seconds": round(self.seconds, 3),
+        }
+
+
+InvalidationHandler = Callable[[SyncResult], None]
+_invalidation_handlers: List[InvalidationHandler] = []
+
+
+def register_invalidation_handler(handler: InvalidationHandler):
+    """Called with the result of every committed sync that changed programs"""
+    _invalidation_handlers.append(handler)
+
+
+def notify_invalidation(result: SyncResult):
+    if result.dry_run or not result.changed_ids:
+        return
+    for handler in _invalidation_handlers:
+        try:
+            handler(result)
+        except Exception as e:
+            logger.warning(f"Catalog invalidation handler failed: {e}")
+
+
+def redis_invalidation_handler(redis_url: str, channel: str) -> InvalidationHandler:
+    """Publishes changed program ids on a Redis channel, in chunks"""
+
+    def publish(result: SyncResult):
+        import redis
+
+        client = redis.Redis.from_url(redis_url)
+        try:
+            for start in range(0, len(result.changed_ids), INVALIDATION_MESSAGE_IDS):
+                client.publish(channel, json.dumps({
+                    "event": "programs.changed",
+                    "sync_id": result.sync_id,
+                    "program_ids": result.changed_ids[start:start + INVALIDATION_MESSAGE_IDS],
+                }))
+        finally:
+            client.close()
+
+    return publish
+
+
+def _batches(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _existing_by_key(connection: Connection, keys: Sequence[str]) -> Dict[str, Tuple[str, str, bool]]:
+    """natural_key -> (id, content_hash, is_active)"""
+    existing = {}
+    for batch in _batches(keys, LOOKUP_BATCH_SIZE):
+        rows = connection.execute(
+            select(programs_table.c.natural_key, programs_table.c.id, programs_table.c.content_hash, programs_table.c.is_active)
+            .where(programs_table.c.natural_key.in_(batch))
+        )
+        for key, program_id, content_hash, is_active in rows:
+            existing[key] = (program_id, content_hash, bool(is_active))
+    return existing
+
+
+def _changed_fields(connection: Connection, incoming: Dict[str, Dict], ids_by_key: Dict[str, str]) -> Dict[str, List[str]]:
+    """Synced fields whose value differs, per natural key"""
+    changed = {}
+    keys = list(ids_by_key)
+    for batch in _batches(keys, LOOKUP_BATCH_SIZE):
+        rows = connection.execute(
+            select(programs_table.c.natural_key, *[programs_table.c[name] for name in SYNCED_FIELDS])
+            .where(programs_table.c.natural_key.in_(batch))
+        ).mappings()
+        for row in rows:
+            new = incoming[row["natural_key"]]
+            changed[row["natural_key"]] = [name for name in SYNCED_FIELDS if row[name] != new[name]]
+    return changed
+
+
+def _upsert(connection: Connection, rows: List[Dict], batch_size: int) -> Dict[str, str]:
+    """Write rows keyed by natural_key; returns natural_key -> id of the rows actually written"""
+    dialect_insert = get_dialect_insert(connection.dialect.name)
+    written = {}
+    for batch in _batches(rows, batch_size):
+        statement = dialect_insert(programs_table).values(list(batch))
+        statement = statement.on_conflict_do_update(
+            index_elements=[programs_table.c.natural_key],
+            set_={
+                **{name: statement.excluded[name] for name in SYNCED_FIELDS},
+                "content_hash": statement.excluded.content_hash,
+                "updated_at": statement.excluded.updated_at,
+                "is_active": True,
+            },
+            where=or_(
+                programs_table.c.content_hash.is_distinct_from(statement.excluded.content_hash),
+                programs_table.c.is_active.is_not(True),
+            ),
+        ).returning(programs_table.c.natural_key, programs_table.c.id)
+        written.update(dict(connection.execute(statement).all()))
+    return written
+
+
+def apply_sync(
+    connection: Connection,
+    records: Sequence[Dict],
+    deactivate_missing: bool = False,
+    dry_run: bool = False,
+    batch_size: Optional[int] = None,
+) -> SyncResult:
+    """Diff `records` against the programs table and apply the delta in the caller's transaction"""
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    batch_size = batch_size or settings.CATALOG_SYNC_BATCH_SIZE
+    result = SyncResult(sync_id=str(uuid.uuid4()), dry_run=dry_run, received=len(records))
+
+    normalized = normalize_programs(records, now)
+    result.rejected = normalized.rejected
+    incoming = {row["natural_key"]: row for row in (dict(zip(PROGRAM_COLUMNS, values)) for values in normalized.rows)}
+    existing = _existing_by_key(connection, list(incoming))
+
+    to_write, changed_keys = [], {}
+    for key, row in incoming.items():
+        current = existing.get(key)
+        if current is None:
+            to_write.append({**row, "is_active": True})
+        elif current[1] != row["content_hash"] or not current[2]:
+            # id and created_at are not part of the conflict update
+            changed_keys[key] = current[0]
+            to_write.append({**row, "id": current[0], "is_active": True})
+        else:
+            result.unchanged += 1
+
+    changed_fields = _changed_fields(connection, incoming, changed_keys)
+
+    missing: List[Tuple[str, str]] = []
+    if deactivate_missing:
+        if not incoming:
+            raise ValueError("Refusing to deactivate the whole catalog: no valid incoming records")
+        active = connection.execute(
+            select(programs_table.c.id, programs_table.c.natural_key)
+            .where(programs_table.c.natural_key.is_not(None), programs_table.c.is_active.is_(True))
+        )
+        missing = [(program_id, key) for program_id, key in active if key not in incoming]
+
+    if dry_run:
+        written = {row["natural_key"]: row["id"] for row in to_write}
+    else:
+        written = _upsert(connection, to_write, batch_size)
+
+    changes = []
+    for key, program_id in written.items():
+        if key not in existing:
+            change_type, fields = CHANGE_CREATED, list(SYNCED_FIELDS)
+            result.created += 1
+        elif existing[key][2]:
+            change_type, fields = CHANGE_UPDATED, changed_fields.get(key, [])
+            result.updated += 1
+        else:
+            change_type, fields = CHANGE_REACTIVATED, changed_fields.get(key, [])
+            result.reactivated += 1
+        changes.append((program_id, key, change_type, fields))
+    # Rows skipped by the ON CONFLICT guard were written concurrently by someone else
+    result.unchanged += len(to_write) - len(written)
+
+    if missing:
+        if not dry_run:
+            for batch in _batches([program_id for program_id, _ in missing], LOOKUP_BATCH_SIZE):
+                connection.execute(
+                    update(programs_table).where(programs_table.c.id.in_(batch)).values(is_active=False, updated_at=now)
+                )
+        changes.extend((program_id, key, CHANGE_DEACTIVATED, ["is_active"]) for program_id, key in missing)
+        result.deactivated = len(missing)
+
+    result.changed_ids = [program_id for program_id, _, _, _ in changes]
+    if changes and not dry_run:
+        for batch in _batches(changes, batch_size):
+            connection.execute(insert(changes_table), [
+                {
+                    "id": str(uuid.uuid4()),
+                    "sync_id": result.sync_id,
+                    "program_id": program_id,
+                    "natural_key": key,
+                    "change_type": change_type,
+                    "changed_fields": fields,
+                    "created_at": now,
+                }
+                for program_id, key, change_type, fields in batch
+            ])
+
+    result.seconds = time.perf_counter() - started
+    logger.info(f"Catalog sync {result.sync_id}: {result.summary()}")
+    return result
+
+
+def sync_catalog(
+    engine: Engine,
+    records: Sequence[Dict],
+    deactivate_missing: bool = False,
+    dry_run: bool = False,
+    batch_size: Optional[int] = None,
+) -> SyncResult:
+    """Run apply_sync in its own transaction and notify invalidation handlers after commit"""
+    if dry_run:
+        # Nothing is written; the connection rolls back on close
+        with engine.connect() as connection:
+            return apply_sync(connection, records, deactivate_missing, dry_run=True, batch_size=batch_size)
+
+    with engine.begin() as connection:
+        result = apply_sync(connection, records, deactivate_missing, batch_size=batch_size)
+    notify_invalidation(result)
+    return result
@@ -0,0 +1,290 @@
+"""
+Deadline reminder scheduler
+
+Periodically scans applications with upcoming deadlines, keeps the stored
+`Application.days_left` column up to date and fans out DEADLINE notifications.
+
+All work is set-based: applications are read in keyset-paginated batches over
+the (deadline, id) index, `days_left` is written back with one executemany
+UPDATE per batch and reminders are inserted with multi-row INSERTs. Each
+reminder carries a dedupe key (`deadline:<application id>:<offset>`) so a given
+reminder is only ever sent once, no matter how often the scheduler runs.
+
+Usage:
+    python -m app.services.deadline_reminders [--dry-run]
+"""
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, bindparam, or_, select, text, update, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.application import Application, ApplicationStatus
+from app.models.notification import Notification, NotificationType
+from app.models.program import Program
+
+logger = logging.getLogger(__name__)
+
+# Only drafts still need action from the user before the deadline
+REMINDER_STATUSES = (ApplicationStatus.DRAFT,)
+
+# Keeps multi-row INSERTs well below driver bind-parameter limits
+INSERT_CHUNK_SIZE = 1000
+
+# Arbitrary application-wide key for the Postgres advisory lock
+ADVISORY_LOCK_KEY = 802_026
+
+applications_table = Application.__table__
+notifications_table = Notification.__table__
+
+
+@dataclass
+class ReminderRunResult:
+    scanned: int = 0
+    days_left_updated: int = 0
+    expired_cleared: int = 0
+    reminders_created: int = 0
+    reminders_skipped: int = 0
+    dry_run: bool = False
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def compute_days_left(deadline: datetime, now: datetime) -> int:
+    """Whole days until the deadline, matching the dashboard calculation"""
+    return max((deadline - now).days, 0)
+
+
+def reminder_offset(days_left: int, offsets: Sequence[int]) -> Optional[int]:
+    """
+    Return the reminder bucket a deadline falls into.
+
+    Uses the smallest configured offset that is >= days_left so a missed run
+    still produces the reminder on the next run instead of skipping it.
+    """
+    for offset in offsets:
+        if days_left <= offset:
+            return offset
+    return None
+
+
+def reminder_dedupe_key(application_id: str, offset: int) -> str:
+    return f"deadline:{application_id}:{offset}"
+
+
+def _reminder_message(days_left: int, program_name: Optional[str], university_name: Optional[str]) -> Dict[str, str]:
+    target = program_name or "your application"
+    if university_name:
+        target = f"{target} at {university_name}"
+    if days_left == 0:
+        when = "today"
+    elif days_left == 1:
+        when = "tomorrow"
+    else:
+        when = f"in {days_left} days"
+    return {
+        "title": f"Deadline {when}",
+        "message": f"The application deadline for {target} is {when}.",
+    }
+
+
+class DeadlineReminderScheduler:
+    """
+    Maintains `Application.days_left` and generates deadline reminders
+    """
+
+    def __init__(
+        self,
+        offsets: Optional[Sequence[int]] = None,
+        batch_size: Optional[int] = None,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.offsets = sorted(offsets or settings.get_deadline_reminder_offsets())
+        self.batch_size = batch_size or settings.DEADLINE_REMINDER_BATCH_SIZE
+        self.session_factory = session_factory
+
+    async def run_once(self, dry_run: bool = False, now: Optional[datetime] = None) -> ReminderRunResult:
+        """
+        Run a single scan. In dry-run mode everything is computed but the
+        transaction is rolled back.
+        """
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        result = ReminderRunResult(dry_run=dry_run)
+
+        async with self.session_factory() as session:
+            if not await self._acquire_run_lock(session):
+                logger.info("Deadline reminder run skipped: another run holds the lock")
+                return result
+
+            result.expired_cleared = await self._clear_expired(session, now)
+            await self._scan_upcoming(session, now, result)
+
+            if dry_run:
+                await session.rollback()
+            else:
+                await session.commit()
+
+        result.elapsed_seconds = round(time.perf_counter() - started, 3)
+        logger.info(f"Deadline reminder run finished: {result.to_dict()}")
+        return result
+
+    async def _acquire_run_lock(self, session: AsyncSession) -> bool:
+        """Ensure only one worker runs the scan at a time (Postgres only)"""
+        if session.bind.dialect.name != "postgresql":
+            return True
+        locked = await session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+        )
+        return bool(locked.scalar())
+
+    async def _clear_expired(self, session: AsyncSession, now: datetime) -> int:
+        """Zero out days_left for deadlines that have passed since the last run"""
+        result = await session.execute(
+            update(applications_table)
+            .where(and_(
+                applications_table.c.deadline < now,
+                applications_table.c.days_left > 0,
+            ))
+            .values(days_left=0, updated_at=applications_table.c.updated_at)
+        )
+        return result.rowcount or 0
+
+    async def _scan_upcoming(self, session: AsyncSession, now: datetime, result: ReminderRunResult):
+        horizon = now + timedelta(days=max(self.offsets, default=0) + 1)
+        last_deadline: Optional[datetime] = None
+        last_id: Optional[str] = None
+
+        while True:
+            query = (
+                select(
+                    applications_table.c.id,
+                    applications_table.c.user_id,
+                    applications_table.c.program_id,
+                    applications_table.c.status,
+                    applications_table.c.deadline,
+                    applications_table.c.days_left,
+                    Program.program_name,
+                    Program.university_name,
+                )
+                .join(Program, Program.id == applications_table.c.program_id)
+                .where(and_(
+                    applications_table.c.deadline >= now,
+                    applications_table.c.deadline < horizon,
+                ))
+                .order_by(applications_table.c.deadline, applications_table.c.id)
+                .limit(self.batch_size)
+            )
+            if last_deadline is not None:
+                # Keyset pagination over the (deadline, id) index
+                query = query.where(or_(
+                    applications_table.c.deadline > last_deadline,
+                    and_(
+                        applications_table.c.deadline == last_deadline,
+                        applications_table.c.id > last_id,
+                    ),
+                ))
+
+            rows = (await session.execute(query)).all()
+            if not rows:
+                break
+
+            result.scanned += len(rows)
+            await self._process_batch(session, rows, now, result)
+
+            last_deadline, last_id = rows[-1].deadline, rows[-1].id
+            if len(rows) < self.batch_size:
+                break
+
+    async def _process_batch(self, session: AsyncSession, rows, now: datetime, result: ReminderRunResult):
+        days_left_updates: List[Dict] = []
+        candidates: Dict[str, Dict] = {}
+
+        for row in rows:
+            days_left = compute_days_left(row.deadline, now)
+            if row.days_left != days_left:
+                days_left_updates.append({"b_id": row.id, "b_days_left": days_left})
+
+            if row.status not in REMINDER_STATUSES:
+                continue
+            offset = reminder_offset(days_left, self.offsets)
+            if offset is None:
+                continue
+
+            dedupe_key = reminder_dedupe_key(row.id, offset)
+            candidates[dedupe_key] = {
+                "id": str(uuid.uuid4()),
+                "user_id": row.user_id,
+                "notification_type": NotificationType.DEADLINE,
+                "related_application_id": row.id,
+                "related_program_id": row.program_id,
+                "dedupe_key": dedupe_key,
+                "is_read": False,
+                "is_deleted": False,
+                "created_at": now,
+                **_reminder_message(days_left, row.program_name, row.university_name),
+            }
+
+        if days_left_updates:
+            await session.execute(
+                update(applications_table)
+                .where(applications_table.c.id == bindparam("b_id"))
+                .values(
+                    days_left=bindparam("b_days_left"),
+                    # Keep updated_at untouched: this is maintenance, not a user edit
+                    updated_at=applications_table.c.updated_at,
+                ),
+                days_left_updates,
+            )
+            result.days_left_updated += len(days_left_updates)
+
+        if not candidates:
+            return
+
+        existing = await session.execute(
+            select(notifications_table.c.dedupe_key)
+            .where(notifications_table.c.dedupe_key.in_(list(candidates)))
+        )
+        for (dedupe_key,) in existing:
+            candidates.pop(dedupe_key, None)
+            result.reminders_skipped += 1
+
+        new_rows = list(candidates.values())
+        for start in range(0, len(new_rows), INSERT_CHUNK_SIZE):
+            chunk = new_rows[start:start + INSERT_CHUNK_SIZE]
+            await session.execute(insert(notifications_table).values(chunk))
+        result.reminders_created += len(new_rows)
+
+
+deadline_reminder_scheduler = DeadlineReminderScheduler()
+
+
+async def run_deadline_reminders():
+    """Entry point used by the periodic task registered in app.main"""
+    return await deadline_reminder_scheduler.run_once()
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Run the deadline reminder scan once")
+    parser.add_argument("--dry-run", action="store_true", help="Compute changes without writing them")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    result = asyncio.run(deadline_reminder_scheduler.run_once(dry_run=args.dry_run))
+    print(json.dumps(result.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
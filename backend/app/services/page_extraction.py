@@ -0,0 +1,255 @@
+"""
+Program page extraction
+
+Pulls catalog fields out of a program page's HTML: schema.org JSON-LD
+(EducationalOccupationalProgram, Course, JobPosting) first, then meta
+descriptions and plain-text patterns for the deadline, degree type and the
+list under a requirements heading.
+
+Pure functions over strings (stdlib only), so they can run in worker
+processes; see program_enrichment.
+"""
+import json
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+from app.services.bookmarks_import import DEGREE_HINTS
+
+MAX_DESCRIPTION_LENGTH = 2000
+MAX_REQUIREMENTS = 15
+MAX_REQUIREMENT_LENGTH = 300
+MIN_PARAGRAPH_LENGTH = 80
+
+EXTRACTED_FIELDS = ("deadline", "description", "degree_type", "required_documents")
+
+LD_TYPES = {"EducationalOccupationalProgram", "Course", "JobPosting", "EducationalOccupationalCredential"}
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "footer", "header"}
+BLOCK_TAGS = {"p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "dt", "dd", "td", "th", "div", "section", "br"}
+HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6", "dt"}
+
+REQUIREMENTS_HEADING = re.compile(
+    r"\b(requirements?|required documents|application documents|eligibility|admission criteria|"
+    r"what you need|your profile|qualifications)\b",
+    re.IGNORECASE,
+)
+
+MONTHS = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+    r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+DATE = (
+    r"(\d{4}-\d{2}-\d{2}"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)? {MONTHS}\.?,? \d{{4}}"
+    rf"|{MONTHS}\.? \d{{1,2}}(?:st|nd|rd|th)?,? \d{{4}}"
+    r"|\d{1,2}\.\d{1,2}\.\d{4})"
+)
+DEADLINE_TEXT = re.compile(
+    rf"\b(?:application )?(?:deadline|closing date|apply by|bewerbungsschluss|bewerbungsfrist)\b[^.\d]{{0,40}}?{DATE}",
+    re.IGNORECASE,
+)
+DATE_FORMATS = ("%Y-%m-%d", "%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y", "%d.%m.%Y")
+ORDINAL_SUFFIX = re.compile(r"(?<=\d)(st|nd|rd|th)\b")
+
+
+class PageParser(HTMLParser):
+    """Collects the page's title, meta descriptions, JSON-LD blocks and text blocks"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title: List[str] = []
+        self.meta: Dict[str, str] = {}
+        self.json_ld: List[str] = []
+        # (tag, text) for every block of visible text, in document order
+        self.blocks: List[tuple] = []
+        self._stack: List[str] = []
+        self._skip = 0
+        self._ld: Optional[List[str]] = None
+        self._text: List[str] = []
+        self._block_tag = "p"
+
+    def _flush(self):
+        text = " ".join("".join(self._text).split())
+        if text:
+            self.blocks.append((self._block_tag, text))
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            attributes = dict(attrs)
+            name = (attributes.get("name") or attributes.get("property") or "").lower()
+            if name in ("description", "og:description") and attributes.get("content"):
+                self.meta[name] = attributes["content"]
+            return
+        if tag == "script" and dict(attrs).get("type") == "application/ld+json":
+            self._ld = []
+        if tag in SKIPPED_TAGS:
+            self._skip += 1
+        elif tag in BLOCK_TAGS or tag in HEADINGS:
+            self._flush()
+            self._block_tag = tag
+        self._stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in self._stack:
+            return
+        while self._stack:
+            open_tag = self._stack.pop()
+            if open_tag in SKIPPED_TAGS:
+                self._skip -= 1
+            if open_tag == tag:
+                break
+        if tag == "script" and self._ld is not None:
+            self.json_ld.append("".join(self._ld))
+            self._ld = None
+        if tag in BLOCK_TAGS or tag in HEADINGS:
+            self._flush()
+            self._block_tag = "p"
+
+    def handle_data(self, data):
+        if self._ld is not None:
+            self._ld.append(data)
+        elif self._stack and self._stack[-1] == "title":
+            self.title.append(data)
+        elif not self._skip:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        pass
+    value = ORDINAL_SUFFIX.sub("", value).replace(",", "").replace(".", " ").strip()
+    value = " ".join(value.split())
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format.replace(".", " "))
+        except ValueError:
+            continue
+    return None
+
+
+def _ld_objects(blocks: List[str]) -> List[Dict]:
+    objects = []
+    pending = []
+    for block in blocks:
+        try:
+            pending.append(json.loads(block))
+        except ValueError:
+            continue
+    while pending:
+        item = pending.pop(0)
+        if isinstance(item, list):
+            pending.extend(item)
+        elif isinstance(item, dict):
+            if "@graph" in item:
+                pending.extend(item["@graph"] if isinstance(item["@graph"], list) else [item["@graph"]])
+            types = item.get("@type")
+            types = set(types) if isinstance(types, list) else {types}
+            if types & LD_TYPES:
+                objects.append(item)
+    return objects
+
+
+def _text_value(value) -> Optional[str]:
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("credentialCategory")
+    if isinstance(value, list):
+        value = next((item for item in (_text_value(item) for item in value) if item), None)
+    if isinstance(value, str):
+        return " ".join(value.split()) or None
+    return None
+
+
+def _strip_tags(value: str) -> str:
+    parser = PageParser()
+    parser.feed(value)
+    parser.close()
+    return " ".join(text for _, text in parser.blocks)
+
+
+def _degree(*texts: Optional[str]) -> Optional[str]:
+    for text in texts:
+        if not text:
+            continue
+        for pattern, degree in DEGREE_HINTS:
+            if pattern.search(text):
+                return degree
+    return None
+
+
+def _requirements(blocks: List[tuple]) -> List[str]:
+    """List items (or short paragraphs) following the first requirements heading"""
+    items: List[str] = []
+    in_section = False
+    for tag, text in blocks:
+        if tag in HEADINGS:
+            if in_section and items:
+                break
+            in_section = bool(REQUIREMENTS_HEADING.search(text)) and len(text) < 120
+            continue
+        if in_section and tag in ("li", "dd", "p") and len(text) <= MAX_REQUIREMENT_LENGTH:
+            items.append(text)
+            if len(items) >= MAX_REQUIREMENTS:
+                break
+    return items
+
+
+def extract_page(html: str) -> Dict:
+    """Catalog fields found on a program page; missing ones are None"""
+    parser = PageParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # Truncated or broken markup: keep what was parsed
+        pass
+
+    ld = _ld_objects(parser.json_ld)
+    title = " ".join("".join(parser.title).split())
+
+    description = None
+    deadline = None
+    degree_type = None
+    for item in ld:
+        description = description or _text_value(item.get("description"))
+        deadline = deadline or parse_date(_text_value(item.get("applicationDeadline") or item.get("validThrough")))
+        degree_type = degree_type or _degree(
+            _text_value(item.get("educationalCredentialAwarded")), _text_value(item.get("name")),
+        )
+    if description and "<" in description:
+        description = _strip_tags(description)
+
+    text_blocks = [text for tag, text in parser.blocks]
+    description = (
+        description
+        or parser.meta.get("og:description")
+        or parser.meta.get("description")
+        or next((text for tag, text in parser.blocks if tag == "p" and len(text) >= MIN_PARAGRAPH_LENGTH), None)
+    )
+    if deadline is None:
+        for text in text_blocks:
+            match = DEADLINE_TEXT.search(text)
+            if match:
+                deadline = parse_date(match.group(1))
+                if deadline:
+                    break
+    heading = next((text for tag, text in parser.blocks if tag == "h1"), None)
+    degree_type = degree_type or _degree(title, heading)
+
+    requirements = _requirements(parser.blocks)
+    return {
+        "deadline": deadline.isoformat() if deadline else None,
+        "description": description[:MAX_DESCRIPTION_LENGTH] if description else None,
+        "degree_type": degree_type,
+        "required_documents": requirements or None,
+    }
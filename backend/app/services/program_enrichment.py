@@ -0,0 +1,451 @@
+"""
+Program page enrichment
+
+Fills the catalog fields the scraped catalog usually lacks (deadline,
+description, degree type, required documents) from each program's page:
+
+1. Programs with a program_url and at least one missing field are loaded
+   together with their program_pages cache row.
+2. Pages are fetched with one pooled httpx client. At most
+   ENRICHMENT_PER_HOST_CONCURRENCY requests run per host; targets are
+   interleaved by host so one large host does not hold every connection.
+   Cached ETag / Last-Modified values are sent as conditional headers and a
+   304 reuses the fields extracted last time.
+3. HTML is parsed on a process pool (page_extraction), off the event loop.
+4. Results are written as they arrive, in batches: program_pages rows are
+   upserted, and programs get only the fields that are still missing
+   (COALESCE-guarded, so values from the catalog or edited in the app are
+   never overwritten). Each enriched program is logged in program_changes
+   and the ids go to the catalog invalidation handlers.
+
+Enriched values are not part of programs.content_hash, so a catalog sync of
+an unchanged record leaves them alone; if the catalog changes the record
+and clears them, the next run fills them again from the cached extraction.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import zip_longest
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy import JSON, DateTime, String, and_, bindparam, case, cast, func, insert, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import get_dialect_insert
+from app.models.program_page import ProgramPage
+from app.services.catalog_sync import SyncResult, changes_table, notify_invalidation
+from app.services.page_extraction import EXTRACTED_FIELDS, extract_page
+from app.services.program_import import DEFAULT_DEGREE_TYPE, programs_table
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH_SIZE = 200
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+MAX_ERROR_LENGTH = 255
+
+CHANGE_ENRICHED = "enriched"
+
+pages_table = ProgramPage.__table__
+
+
+@dataclass
+class EnrichmentTarget:
+    program_id: str
+    url: str
+    missing: Tuple[str, ...]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    cached: Optional[Dict] = None
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc.lower()
+
+
+@dataclass
+class PageResult:
+    target: EnrichmentTarget
+    status_code: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    extracted: Optional[Dict] = None
+    error: Optional[str] = None
+    not_modified: bool = False
+
+
+@dataclass
+class EnrichmentResult:
+    run_id: str
+    dry_run: bool = False
+    targets: int = 0
+    fetched: int = 0
+    not_modified: int = 0
+    failed: int = 0
+    enriched: int = 0
+    fields_filled: Counter = field(default_factory=Counter)
+    changed_ids: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def summary(self) -> Dict:
+        return {
+            "run_id": self.run_id,
+            "dry_run": self.dry_run,
+            "targets": self.targets,
+            "fetched": self.fetched,
+            "not_modified": self.not_modified,
+            "failed": self.failed,
+            "enriched": self.enriched,
+            "fields_filled": dict(self.fields_filled),
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def _missing_conditions():
+    c = programs_table.c
+    return {
+        "deadline": c.deadline.is_(None),
+        "description": c.description.is_(None),
+        "degree_type": or_(c.degree_type.is_(None), c.degree_type == DEFAULT_DEGREE_TYPE),
+        # Plain comparisons, not in_(): this also feeds the executemany UPDATE in
+        # apply_results, which cannot take expanding parameters
+        "required_documents": or_(
+            c.required_documents.is_(None),
+            cast(c.required_documents, String) == "[]",
+            cast(c.required_documents, String) == "null",
+        ),
+    }
+
+
+def load_targets(
+    connection: Connection,
+    only_missing: bool = True,
+    limit: Optional[int] = None,
+    hosts: Optional[Sequence[str]] = None,
+) -> List[EnrichmentTarget]:
+    """Active programs with a URL (and, if `only_missing`, a missing field), with their cached validators"""
+    conditions = _missing_conditions()
+    statement = (
+        select(
+            programs_table.c.id,
+            programs_table.c.program_url,
+            *[condition.label(f"missing_{name}") for name, condition in conditions.items()],
+            pages_table.c.url.label("cached_url"),
+            pages_table.c.etag,
+            pages_table.c.last_modified,
+            pages_table.c.extracted,
+        )
+        .select_from(programs_table.outerjoin(pages_table, pages_table.c.program_id == programs_table.c.id))
+        .where(programs_table.c.program_url.is_not(None), programs_table.c.is_active.is_(True))
+        .order_by(programs_table.c.id)
+    )
+    if only_missing:
+        statement = statement.where(or_(*conditions.values()))
+    if limit:
+        statement = statement.limit(limit)
+
+    targets = []
+    for row in connection.execute(statement).mappings():
+        url = row["program_url"]
+        if not url.startswith(("http://", "https://")):
+            continue
+        target = EnrichmentTarget(
+            program_id=row["id"],
+            url=url,
+            missing=tuple(name for name in EXTRACTED_FIELDS if row[f"missing_{name}"]),
+        )
+        if hosts and target.host not in hosts:
+            continue
+        # Validators only apply to the URL they were received for
+        if row["cached_url"] == url:
+            target.etag, target.last_modified, target.cached = row["etag"], row["last_modified"], row["extracted"]
+        targets.append(target)
+    return targets
+
+
+def interleave_by_host(targets: Sequence[EnrichmentTarget]) -> List[EnrichmentTarget]:
+    """Round-robin over hosts, so the per-host limit rarely idles the global pool"""
+    by_host: Dict[str, List[EnrichmentTarget]] = defaultdict(list)
+    for target in targets:
+        by_host[target.host].append(target)
+    return [target for group in zip_longest(*by_host.values()) for target in group if target is not None]
+
+
+class HostLimiter:
+    """One semaphore per host, created on first use"""
+
+    def __init__(self, per_host: int):
+        self.per_host = per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def __call__(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+
+async def fetch_page(
+    client: httpx.AsyncClient,
+    limiter: HostLimiter,
+    target: EnrichmentTarget,
+    max_bytes: int,
+) -> Tuple[PageResult, Optional[str]]:
+    """Conditional GET of a program page; returns the result and the HTML of a full response"""
+    headers = {}
+    if target.etag:
+        headers["If-None-Match"] = target.etag
+    if target.last_modified:
+        headers["If-Modified-Since"] = target.last_modified
+
+    result = PageResult(target=target)
+    async with limiter(target.host):
+        try:
+            async with client.stream("GET", target.url, headers=headers) as response:
+                result.status_code = response.status_code
+                result.etag = response.headers.get("etag")
+                result.last_modified = response.headers.get("last-modified")
+                if response.status_code == 304:
+                    result.not_modified = True
+                    result.etag = result.etag or target.etag
+                    result.last_modified = result.last_modified or target.last_modified
+                    return result, None
+                if response.status_code >= 400:
+                    result.error = f"HTTP {response.status_code}"
+                    return result, None
+                content_type = response.headers.get("content-type", "text/html").split(";")[0].strip().lower()
+                if content_type not in HTML_CONTENT_TYPES:
+                    result.error = f"Not HTML ({content_type})"
+                    return result, None
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) >= max_bytes:
+                        break
+                return result, bytes(body[:max_bytes]).decode(response.encoding or "utf-8", errors="replace")
+        except httpx.HTTPError as e:
+            result.error = f"{type(e).__name__}: {e}"[:MAX_ERROR_LENGTH]
+            return result, None
+
+
+def apply_results(
+    connection: Connection,
+    results: Sequence[PageResult],
+    run_id: str,
+    dry_run: bool = False,
+) -> List[Tuple[str, List[str]]]:
+    """
+    Upsert the program_pages rows and fill the missing program fields in the
+    caller's transaction. Returns (program_id, filled fields) per enriched program.
+    """
+    now = datetime.utcnow()
+    filled = []
+    updates = []
+    for result in results:
+        extracted = result.extracted or {}
+        fields = [name for name in result.target.missing if extracted.get(name)]
+        if not fields:
+            continue
+        filled.append((result.target.program_id, fields))
+        deadline = extracted.get("deadline") if "deadline" in fields else None
+        updates.append({
+            "program_id": result.target.program_id,
+            "new_deadline": datetime.fromisoformat(deadline) if deadline else None,
+            "new_description": extracted.get("description") if "description" in fields else None,
+            "new_degree_type": extracted.get("degree_type") if "degree_type" in fields else None,
+            "new_required_documents": extracted.get("required_documents") if "required_documents" in fields else None,
+        })
+    if dry_run:
+        return filled
+
+    pages = [
+        {
+            "program_id": result.target.program_id,
+            "url": result.target.url,
+            "etag": result.etag,
+            "last_modified": result.last_modified,
+            "status_code": result.status_code,
+            "error": result.error,
+            "extracted": result.extracted,
+            "fetched_at": now,
+        }
+        for result in results
+    ]
+    if pages:
+        statement = get_dialect_insert(connection.dialect.name)(pages_table).values(pages)
+        statement = statement.on_conflict_do_update(
+            index_elements=[pages_table.c.program_id],
+            set_={name: statement.excluded[name] for name in ("url", "status_code", "error", "fetched_at")},
+        )
+        connection.execute(statement)
+        # A failed or uncached response keeps the previous validators and extraction
+        succeeded = [page for page in pages if page["error"] is None and page["extracted"] is not None]
+        if succeeded:
+            connection.execute(
+                update(pages_table)
+                .where(pages_table.c.program_id == bindparam("page_id"))
+                .values(
+                    etag=bindparam("page_etag"),
+                    last_modified=bindparam("page_last_modified"),
+                    extracted=bindparam("page_extracted", type_=JSON(none_as_null=True)),
+                ),
+                [
+                    {
+                        "page_id": page["program_id"],
+                        "page_etag": page["etag"],
+                        "page_last_modified": page["last_modified"],
+                        "page_extracted": page["extracted"],
+                    }
+                    for page in succeeded
+                ],
+            )
+
+    if updates:
+        c = programs_table.c
+        missing = _missing_conditions()
+        new_degree_type = bindparam("new_degree_type", type_=String)
+        new_required_documents = bindparam("new_required_documents", type_=JSON(none_as_null=True))
+        connection.execute(
+            update(programs_table)
+            .where(c.id == bindparam("program_id"))
+            .values(
+                deadline=func.coalesce(c.deadline, bindparam("new_deadline", type_=DateTime)),
+                description=func.coalesce(c.description, bindparam("new_description", type_=String)),
+                degree_type=case(
+                    (and_(missing["degree_type"], new_degree_type.is_not(None)), new_degree_type),
+                    else_=c.degree_type,
+                ),
+                required_documents=case(
+                    (and_(missing["required_documents"], new_required_documents.is_not(None)), new_required_documents),
+                    else_=c.required_documents,
+                ),
+                updated_at=now,
+            ),
+            updates,
+        )
+        connection.execute(insert(changes_table), [
+            {
+                "id": str(uuid.uuid4()),
+                "sync_id": run_id,
+                "program_id": program_id,
+                "natural_key": None,
+                "change_type": CHANGE_ENRICHED,
+                "changed_fields": fields,
+                "created_at": now,
+            }
+            for program_id, fields in filled
+        ])
+    return filled
+
+
+ResultSink = Callable[[List[PageResult]], Awaitable[None]]
+
+
+async def crawl(
+    targets: Sequence[EnrichmentTarget],
+    sink: ResultSink,
+    executor: Optional[Executor] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    batch_size: int = WRITE_BATCH_SIZE,
+) -> None:
+    """
+    Fetch and extract every target, passing results to `sink` in batches as
+    they complete. `transport` replaces the network (e.g. httpx.MockTransport).
+    """
+    loop = asyncio.get_running_loop()
+    limiter = HostLimiter(settings.ENRICHMENT_PER_HOST_CONCURRENCY)
+    queue: deque = deque(interleave_by_host(targets))
+    pending: List[PageResult] = []
+    flush_lock = asyncio.Lock()
+
+    async def flush(force: bool = False):
+        async with flush_lock:
+            if pending and (force or len(pending) >= batch_size):
+                batch = pending[:]
+                pending.clear()
+                await sink(batch)
+
+    async def worker(client: httpx.AsyncClient):
+        while queue:
+            target = queue.popleft()
+            result, html = await fetch_page(client, limiter, target, settings.ENRICHMENT_MAX_PAGE_BYTES)
+            if html is not None:
+                try:
+                    result.extracted = await loop.run_in_executor(executor, extract_page, html)
+                except Exception as e:
+                    result.error = f"Extraction failed: {e}"[:MAX_ERROR_LENGTH]
+            elif result.not_modified:
+                result.extracted = target.cached
+            pending.append(result)
+            await flush()
+
+    client = httpx.AsyncClient(
+        transport=transport,
+        limits=httpx.Limits(
+            max_connections=settings.ENRICHMENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.ENRICHMENT_MAX_CONNECTIONS,
+        ),
+        timeout=settings.ENRICHMENT_TIMEOUT_SECONDS,
+        follow_redirects=True,
+        headers={"User-Agent": settings.ENRICHMENT_USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+    )
+    async with client:
+        workers = min(settings.ENRICHMENT_MAX_CONNECTIONS, len(queue))
+        await asyncio.gather(*[worker(client) for _ in range(workers)])
+    await flush(force=True)
+
+
+async def enrich_programs(
+    engine: AsyncEngine,
+    only_missing: bool = True,
+    limit: Optional[int] = None,
+    hosts: Optional[Sequence[str]] = None,
+    dry_run: bool = False,
+    processes: Optional[int] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> EnrichmentResult:
+    """Run one enrichment pass over the catalog; each result batch is committed on its own"""
+    started = time.perf_counter()
+    result = EnrichmentResult(run_id=str(uuid.uuid4()), dry_run=dry_run)
+
+    async with engine.connect() as conn:
+        targets = await conn.run_sync(load_targets, only_missing, limit, hosts)
+    result.targets = len(targets)
+
+    async def sink(batch: List[PageResult]):
+        for page in batch:
+            if page.not_modified:
+                result.not_modified += 1
+            elif page.error:
+                result.failed += 1
+            else:
+                result.fetched += 1
+        async with engine.begin() as conn:
+            filled = await conn.run_sync(apply_results, batch, result.run_id, dry_run)
+        for program_id, fields in filled:
+            result.changed_ids.append(program_id)
+            result.fields_filled.update(fields)
+        result.enriched += len(filled)
+
+    processes = settings.ENRICHMENT_PROCESSES if processes is None else processes
+    executor = ProcessPoolExecutor(processes) if processes > 1 else None
+    try:
+        await crawl(targets, sink, executor, transport)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    result.seconds = time.perf_counter() - started
+    if not dry_run:
+        notify_invalidation(SyncResult(sync_id=result.run_id, changed_ids=result.changed_ids))
+    logger.info(f"Program enrichment {result.run_id}: {result.summary()}")
+    return result
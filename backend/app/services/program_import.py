@@ -0,0 +1,187 @@
+"""
+Program catalog import
+
+Turns scraped program records ({title, university, country, degree_type,
+deadline, requirements, description, program_url}, the format of
+programs_seed_data.json) into `programs` rows and bulk loads them (see
+core.bulk_load).
+
+Normalization is a vectorized pandas pass over the whole batch: whitespace is
+collapsed, degree names are mapped to Bachelor/Master/PhD where recognizable,
+required columns get their defaults, values are cut to the column lengths and
+deadlines are parsed leniently. Records without a university or title, and
+repeats of an already seen program (same natural key), are rejected with a
+reason.
+
+Every row carries a natural key (a hash of the canonical program_url, or of
+university + title when there is no URL) and a hash of its synced fields, so
+catalog_sync can match incoming records to existing rows and skip unchanged
+ones.
+"""
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from app.core.bulk_load import DEFAULT_BATCH_SIZE, LoadReport, load_rows
+from app.models.program import Program
+
+SEED_DATA_PATH = Path(__file__).resolve().parents[2] / "programs_seed_data.json"
+
+SOURCE_FIELDS = ["title", "university", "country", "degree_type", "deadline", "requirements", "description", "program_url"]
+# Fields owned by the scraped catalog; everything else is edited in the app
+SYNCED_FIELDS = (
+    "university_name", "program_name", "degree_type", "country", "program_url",
+    "deadline", "description", "required_documents",
+)
+# Columns present since the first migration (the seed migration loads these)
+SEED_COLUMNS = ("id", *SYNCED_FIELDS, "created_at", "updated_at")
+PROGRAM_COLUMNS = (*SEED_COLUMNS, "natural_key", "content_hash")
+TEXT_FIELDS = ["title", "university", "country", "degree_type", "requirements", "description", "program_url"]
+
+DEFAULT_DEGREE_TYPE = "Other"
+DEFAULT_COUNTRY = "Not Specified"
+
+DEGREE_ALIASES = {
+    "bachelor": "Bachelor", "bachelors": "Bachelor", "bachelor's": "Bachelor", "bsc": "Bachelor",
+    "b.sc.": "Bachelor", "ba": "Bachelor", "undergraduate": "Bachelor",
+    "master": "Master", "masters": "Master", "master's": "Master", "msc": "Master", "m.sc.": "Master",
+    "ms": "Master", "ma": "Master", "mba": "Master",
+    "phd": "PhD", "ph.d.": "PhD", "ph.d": "PhD", "doctorate": "PhD", "doctoral": "PhD",
+}
+
+programs_table = Program.__table__
+
+
+def _max_length(column: str) -> Optional[int]:
+    return getattr(programs_table.c[column].type, "length", None)
+
+
+def canonical_url(url: str) -> str:
+    """Lowercase scheme and host, no fragment or trailing slash"""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+
+def natural_key(program_url: Optional[str], university_name: str, program_name: str) -> str:
+    """Stable identity of a catalog program across imports"""
+    if program_url:
+        basis = f"url:{canonical_url(program_url)}"
+    else:
+        basis = f"name:{university_name.casefold()}|{program_name.casefold()}"
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+
+def content_hash(values: Dict) -> str:
+    """Hash of the synced fields of one program (a row or a normalized record)"""
+    payload = json.dumps([values.get(name) for name in SYNCED_FIELDS], default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class NormalizedPrograms:
+    rows: List[Tuple]
+    rejected: List[Tuple[int, str]] = field(default_factory=list)  # (record index, reason)
+    seconds: float = 0.0
+
+
+def load_seed_records(path: Path = SEED_DATA_PATH) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def normalize_programs(records: Sequence[Dict], now: Optional[datetime] = None) -> NormalizedPrograms:
+    """Validate and normalize scraped records into rows in PROGRAM_COLUMNS order"""
+    started = time.perf_counter()
+    now = now or datetime.utcnow()
+    if not records:
+        return NormalizedPrograms(rows=[])
+
+    df = pd.DataFrame.from_records(list(records), columns=SOURCE_FIELDS)
+
+    for column in TEXT_FIELDS:
+        df[column] = (
+            df[column].astype("string").str.replace(r"\s+", " ", regex=True).str.strip().replace("", pd.NA)
+        )
+
+    rejected = []
+    missing_university = df["university"].isna()
+    missing_title = df["title"].isna() & ~missing_university
+    for mask, reason in ((missing_university, "missing university"), (missing_title, "missing title")):
+        rejected.extend((int(index), reason) for index in df.index[mask])
+    df = df[~(missing_university | missing_title)]
+
+    degree = df["degree_type"].str.lower().map(DEGREE_ALIASES)
+    df["degree_type"] = degree.fillna(df["degree_type"]).fillna(DEFAULT_DEGREE_TYPE)
+    df["country"] = df["country"].fillna(DEFAULT_COUNTRY)
+    df["deadline"] = pd.to_datetime(df["deadline"], errors="coerce", utc=True, format="mixed").dt.tz_localize(None)
+
+    out = pd.DataFrame({
+        "university_name": df["university"],
+        "program_name": df["title"],
+        "degree_type": df["degree_type"],
+        "country": df["country"],
+        "program_url": df["program_url"],
+        "deadline": df["deadline"],
+        "description": df["description"],
+        "required_documents": df["requirements"].astype(object).map(lambda value: [value], na_action="ignore"),
+    }, index=df.index)
+
+    for column in ("university_name", "program_name", "degree_type", "country", "program_url"):
+        length = _max_length(column)
+        if length:
+            out[column] = out[column].str.slice(0, length)
+
+    out = out.astype(object).where(out.notna(), None)
+    out["deadline"] = out["deadline"].map(lambda value: value.to_pydatetime() if value is not None else None)
+
+    out["natural_key"] = [
+        natural_key(url, university, title)
+        for url, university, title in zip(out["program_url"], out["university_name"], out["program_name"])
+    ]
+    duplicate = out["natural_key"].duplicated()
+    rejected.extend((int(index), "duplicate program") for index in out.index[duplicate])
+    out = out[~duplicate]
+
+    records_out = out[list(SYNCED_FIELDS)].to_dict("records")
+    out["content_hash"] = [content_hash(record) for record in records_out]
+    out["id"] = [str(uuid.uuid4()) for _ in range(len(out))]
+    out["created_at"] = now
+    out["updated_at"] = now
+
+    rejected.sort()
+    rows = list(out[list(PROGRAM_COLUMNS)].itertuples(index=False, name=None))
+    return NormalizedPrograms(rows=rows, rejected=rejected, seconds=time.perf_counter() - started)
+
+
+def count_programs(connection: Connection) -> int:
+    return connection.execute(select(func.count()).select_from(programs_table)).scalar_one()
+
+
+def import_programs(
+    connection: Connection,
+    records: Sequence[Dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    columns: Sequence[str] = PROGRAM_COLUMNS,
+) -> Tuple[NormalizedPrograms, LoadReport]:
+    """
+    Normalize `records` and bulk load them in the caller's transaction.
+    `columns` may be a subset of PROGRAM_COLUMNS, for schemas that predate
+    some of them.
+    """
+    normalized = normalize_programs(records)
+    rows = normalized.rows
+    if list(columns) != list(PROGRAM_COLUMNS):
+        positions = [PROGRAM_COLUMNS.index(column) for column in columns]
+        rows = [tuple(row[position] for position in positions) for row in rows]
+    report = load_rows(connection, programs_table, columns, rows, batch_size)
+    return normalized, report
@@ -0,0 +1,41 @@
+"""
+Program recommendation engines
+
+Engines are plugins of kind "recommender" (see app.plugins), selected with
+the RECOMMENDER setting and imported on first use, so an engine with heavy
+dependencies (embeddings, scikit-learn, an LLM client) costs nothing until
+the recommendations endpoint is called.
+
+An engine has one coroutine:
+
+    async def recommend(db, user, limit) -> List[ProgramRecommendation]
+"""
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.program import Program
+from app.models.user import User
+from app.schemas.program import ProgramRecommendation
+
+
+class MatchScoreRecommender:
+    """Programs ordered by their cached average match score"""
+
+    async def recommend(self, db: AsyncSession, user: User, limit: int) -> List[ProgramRecommendation]:
+        result = await db.execute(
+            select(Program)
+            .order_by(Program.average_match_score.desc().nullslast())
+            .limit(limit)
+        )
+        programs = result.scalars().all()
+
+        return [
+            ProgramRecommendation(
+                program=program,
+                match_score=program.average_match_score or 0.0,
+                match_reasons=["Profile match", "Academic fit", "Location preference"]
+            )
+            for program in programs
+        ]
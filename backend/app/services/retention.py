@@ -0,0 +1,134 @@
+"""
+Retention and compaction for notifications and activities
+
+On PostgreSQL the tables are partitioned by month, so retention detaches and
+drops (or archives) whole partitions and keeps upcoming partitions created in
+advance. On other dialects (SQLite in tests) the same policy is applied with
+batched DELETEs.
+
+Soft-deleted notifications are compacted (physically removed) once they are
+older than SOFT_DELETE_GRACE_DAYS.
+
+Usage:
+    python -m app.services.retention [--dry-run]
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core import partitioning
+from app.models.activity import Activity
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetentionRunResult:
+    dropped_partitions: Dict[str, List[str]] = field(default_factory=dict)
+    deleted_rows: Dict[str, int] = field(default_factory=dict)
+    compacted_notifications: int = 0
+    dry_run: bool = False
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class RetentionPolicy:
+    """
+    Applies the configured retention windows to the partitioned tables
+    """
+
+    def __init__(
+        self,
+        retention_months: Optional[Dict[str, int]] = None,
+        archive_schema: Optional[str] = None,
+        soft_delete_grace_days: Optional[int] = None,
+        months_ahead: Optional[int] = None,
+        batch_size: int = 5000,
+    ):
+        self.retention_months = retention_months or {
+            Notification.__tablename__: settings.NOTIFICATION_RETENTION_MONTHS,
+            Activity.__tablename__: settings.ACTIVITY_RETENTION_MONTHS,
+        }
+        self.archive_schema = archive_schema if archive_schema is not None else settings.RETENTION_ARCHIVE_SCHEMA
+        self.soft_delete_grace_days = (
+            soft_delete_grace_days if soft_delete_grace_days is not None else settings.SOFT_DELETE_GRACE_DAYS
+        )
+        self.months_ahead = months_ahead if months_ahead is not None else settings.PARTITION_MONTHS_AHEAD
+        self.batch_size = batch_size
+        self.tables = {
+            Notification.__tablename__: Notification.__table__,
+            Activity.__tablename__: Activity.__table__,
+        }
+
+    async def run_once(self, dry_run: bool = False, now: Optional[datetime] = None) -> RetentionRunResult:
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        result = RetentionRunResult(dry_run=dry_run)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(self._apply, now, dry_run, result)
+
+        result.elapsed_seconds = round(time.perf_counter() - started, 3)
+        logger.info(f"Retention run finished: {result.to_dict()}")
+        return result
+
+    def _apply(self, connection, now: datetime, dry_run: bool, result: RetentionRunResult):
+        for table_name, months in self.retention_months.items():
+            table = self.tables[table_name]
+            cutoff = partitioning.retention_cutoff(months, now)
+
+            if partitioning.is_partitioned(connection, table_name):
+                if not dry_run:
+                    partitioning.ensure_partitions(connection, table_name, self.months_ahead, now)
+                result.dropped_partitions[table_name] = partitioning.drop_expired_partitions(
+                    connection, table_name, cutoff, self.archive_schema, dry_run=dry_run
+                )
+            else:
+                result.deleted_rows[table_name] = partitioning.delete_rows_in_batches(
+                    connection, table, table.c.created_at < cutoff, self.batch_size, dry_run=dry_run
+                )
+
+        notifications = self.tables[Notification.__tablename__]
+        compact_before = now - timedelta(days=self.soft_delete_grace_days)
+        result.compacted_notifications = partitioning.delete_rows_in_batches(
+            connection,
+            notifications,
+            and_(notifications.c.is_deleted == True, notifications.c.created_at < compact_before),
+            self.batch_size,
+            dry_run=dry_run,
+        )
+
+
+retention_policy = RetentionPolicy()
+
+
+async def run_retention():
+    """Entry point used by the periodic task registered in app.main"""
+    return await retention_policy.run_once()
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Apply notification/activity retention once")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without removing it")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    result = asyncio.run(retention_policy.run_once(dry_run=args.dry_run))
+    print(json.dumps(result.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the application list serialization path.
+
+Seeds one user with N applications (each with its program) and compares:
+
+- legacy: ORM entities + selectinload, to_dict(), ApplicationWithProgram(**dict),
+  then FastAPI-style response_model validation and JSON encoding
+- fast path: the column-level select used by list_applications, rendered
+  straight to bytes by ORJSONResponse
+
+Query time and serialization time are reported separately, per item.
+
+Usage:
+    python benchmarks/bench_application_serialization.py --items 500
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from _common import configure_environment, reset_schema, report
+
+configure_environment()
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.api.v1.endpoints.applications import (  # noqa: E402
+    _application_with_program,
+    _application_with_program_query,
+)
+from app.core.database import AsyncSessionLocal, close_db  # noqa: E402
+from app.models import Application, ApplicationStatus, Program, User  # noqa: E402
+from app.schemas.application import ApplicationWithProgram  # noqa: E402
+
+response_adapter = TypeAdapter(List[ApplicationWithProgram])
+
+
+async def seed(items: int) -> str:
+    now = datetime.utcnow()
+    user_id = str(uuid.uuid4())
+    program_ids = [str(uuid.uuid4()) for _ in range(items)]
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(User.__table__), [{
+            "id": user_id,
+            "email": "bench@example.com",
+            "full_name": "Bench User",
+            "hashed_password": "x",
+            "created_at": now,
+            "updated_at": now,
+        }])
+        await session.execute(insert(Program.__table__), [
+            {
+                "id": program_id,
+                "university_name": f"University {i}",
+                "program_name": f"Program {i}",
+                "degree_type": "Master",
+                "country": "Germany",
+                "city": "Berlin",
+                "deadline": now + timedelta(days=i % 90),
+                "tags": ["Scholarships", "Fast Decision"],
+                "features": ["Online interview"],
+                "required_documents": ["Transcript", "CV", "Statement of Purpose"],
+                "description": "A two year research-oriented programme. " * 5,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, program_id in enumerate(program_ids)
+        ])
+        await session.execute(insert(Application.__table__), [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "program_id": program_id,
+                "application_id": f"BEN-{now.year}-{i:04d}",
+                "status": ApplicationStatus.DRAFT,
+                "deadline": now + timedelta(days=i % 90),
+                "days_left": i % 90,
+                "completion_percentage": i % 100,
+                "created_at": now - timedelta(minutes=i),
+                "updated_at": now,
+            }
+            for i, program_id in enumerate(program_ids)
+        ])
+        await session.commit()
+    return user_id
+
+
+async def fetch_legacy(user_id: str, limit: int):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Application)
+            .options(selectinload(Application.program))
+            .where(Application.user_id == user_id)
+            .order_by(Application.created_at.desc())
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+
+def serialize_legacy(applications) -> bytes:
+    response = []
+    for app in applications:
+        app_dict = app.to_dict()
+        app_dict["program"] = app.program.to_dict() if app.program else {}
+        response.append(ApplicationWithProgram(**app_dict))
+    # What FastAPI does with a response_model: validate, dump, encode
+    validated = response_adapter.validate_python(response, from_attributes=True)
+    content = jsonable_encoder(response_adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+async def fetch_fast(user_id: str, limit: int):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            _application_with_program_query()
+            .where(Application.user_id == user_id)
+            .order_by(Application.created_at.desc())
+            .limit(limit)
+        )
+        return result.mappings().all()
+
+
+def serialize_fast(rows) -> bytes:
+    return ORJSONResponse([_application_with_program(row) for row in rows]).body
+
+
+async def timed(label: str, coro_factory, repeat: int, items: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        value = await coro_factory()
+    report(label, (time.perf_counter() - started) / repeat, items)
+    return value
+
+
+def timed_sync(label: str, func, repeat: int, items: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        value = func()
+    elapsed = (time.perf_counter() - started) / repeat
+    report(label, elapsed, items)
+    print(f"    {elapsed / items * 1e6:.1f} us/item, {len(value):,} bytes")
+    return value
+
+
+async def main(args):
+    await reset_schema()
+    user_id = await seed(args.items)
+
+    entities = await timed("legacy query (ORM + selectinload)", lambda: fetch_legacy(user_id, args.items), args.repeat, args.items)
+    rows = await timed("fast path query (column select)", lambda: fetch_fast(user_id, args.items), args.repeat, args.items)
+
+    legacy = timed_sync("legacy serialization", lambda: serialize_legacy(entities), args.repeat, args.items)
+    fast = timed_sync("fast path serialization", lambda: serialize_fast(rows), args.repeat, args.items)
+
+    # Both paths must describe the same applications
+    assert [item["id"] for item in json.loads(legacy)] == [item["id"] for item in json.loads(fast)]
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
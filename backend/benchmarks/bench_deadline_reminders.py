@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the deadline reminder scheduler.
+
+Seeds N applications with deadlines spread over the next 60 days, then times a
+dry run, a real run and a second (fully deduplicated) run.
+
+Usage:
+    python benchmarks/bench_deadline_reminders.py --applications 200000
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from _common import configure_environment, reset_schema, report
+
+configure_environment()
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, close_db  # noqa: E402
+from app.models import Application, ApplicationStatus, Program, User  # noqa: E402
+from app.services.deadline_reminders import DeadlineReminderScheduler  # noqa: E402
+
+CHUNK = 1000
+
+
+async def seed(applications: int, users: int, programs: int):
+    now = datetime.utcnow()
+    rng = random.Random(42)
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    program_ids = [str(uuid.uuid4()) for _ in range(programs)]
+    statuses = [ApplicationStatus.DRAFT] * 3 + [ApplicationStatus.SUBMITTED, ApplicationStatus.REVIEW]
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(User.__table__), [
+            {
+                "id": user_id,
+                "email": f"bench-{i}@example.com",
+                "full_name": f"Bench User {i}",
+                "hashed_password": "x",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, user_id in enumerate(user_ids)
+        ])
+        await session.execute(insert(Program.__table__), [
+            {
+                "id": program_id,
+                "university_name": f"University {i}",
+                "program_name": f"Program {i}",
+                "degree_type": "Master",
+                "country": "Germany",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, program_id in enumerate(program_ids)
+        ])
+
+        for start in range(0, applications, CHUNK):
+            rows = []
+            for i in range(start, min(start + CHUNK, applications)):
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "user_id": rng.choice(user_ids),
+                    "program_id": rng.choice(program_ids),
+                    "application_id": f"BEN-{now.year}-{i:07d}",
+                    "status": rng.choice(statuses),
+                    "deadline": now + timedelta(minutes=rng.randint(-7 * 1440, 60 * 1440)),
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            await session.execute(insert(Application.__table__), rows)
+        await session.commit()
+
+
+async def main(args):
+    await reset_schema()
+
+    started = time.perf_counter()
+    await seed(args.applications, args.users, args.programs)
+    report("seed applications", time.perf_counter() - started, args.applications)
+
+    reminder_scheduler = DeadlineReminderScheduler(batch_size=args.batch_size)
+
+    for label, dry_run in (("dry run", True), ("first run", False), ("second run (deduplicated)", False)):
+        started = time.perf_counter()
+        result = await reminder_scheduler.run_once(dry_run=dry_run)
+        report(label, time.perf_counter() - started, result.scanned)
+        print(f"    {result.to_dict()}")
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--programs", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the program page enrichment crawler, against local fixture
+servers (no network access needed).
+
+Starts --hosts HTTP servers on 127.0.0.1 (each port counts as one host),
+each serving program pages with ETag / Last-Modified validators and a fixed
+latency, seeds --programs incomplete programs pointing at them, then runs:
+
+- first pass: every page is fetched and extracted, missing fields filled
+- second pass (--all): every request is conditional and answered with 304
+
+and checks that every fetched program was enriched, that the second pass
+changed nothing, and that no host saw more than
+ENRICHMENT_PER_HOST_CONCURRENCY concurrent requests.
+
+Usage:
+    python benchmarks/bench_enrichment.py --programs 2000 --hosts 8 --latency-ms 20
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from _common import configure_environment, reset_schema, report
+
+configure_environment()
+os.environ.setdefault("ENRICHMENT_PER_HOST_CONCURRENCY", "4")
+os.environ.setdefault("CATALOG_INVALIDATION_CHANNEL", "")
+
+from app.core.bulk_load import load_rows  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import close_db, engine  # noqa: E402
+from app.services.program_enrichment import enrich_programs  # noqa: E402
+from app.services.program_import import PROGRAM_COLUMNS, normalize_programs, programs_table  # noqa: E402
+
+LAST_MODIFIED = "Wed, 01 Oct 2025 08:00:00 GMT"
+PAGE = """<!DOCTYPE html>
+<html><head><title>MSc Program {n} | Fixture University</title>
+<meta name="description" content="Program {n}: a two-year master programme in applied data science with a research thesis.">
+<script type="application/ld+json">{{"@type": "EducationalOccupationalProgram", "name": "Program {n}",
+ "applicationDeadline": "2026-0{month}-15", "educationalCredentialAwarded": "Master of Science"}}</script>
+</head><body><nav>Home</nav><h1>Master Program {n}</h1>
+<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore.</p>
+<h2>Application documents</h2>
+<ul><li>Curriculum vitae</li><li>Transcript of records</li><li>Motivation letter</li></ul>
+</body></html>
+"""
+
+
+class FixtureServer:
+    """A threaded HTTP server serving /programs/<n>, tracking peak concurrency"""
+
+    def __init__(self, latency: float, missing_every: int):
+        fixture = self
+        self.latency = latency
+        self.missing_every = missing_every
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.responses = {200: 0, 304: 0, 404: 0}
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                fixture.enter()
+                try:
+                    time.sleep(fixture.latency)
+                    self.respond()
+                finally:
+                    fixture.leave()
+
+            def respond(self):
+                n = self.path.rsplit("/", 1)[-1]
+                if not n.isdigit() or (fixture.missing_every and int(n) % fixture.missing_every == 0):
+                    fixture.count(404)
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = f'"v1-{n}"'
+                if self.headers.get("If-None-Match") == etag:
+                    fixture.count(304)
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                body = PAGE.format(n=n, month=int(n) % 9 + 1).encode()
+                fixture.count(200)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def leave(self):
+        with self.lock:
+            self.active -= 1
+
+    def count(self, status: int):
+        with self.lock:
+            self.responses[status] += 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def seed(connection, servers, programs: int):
+    records = [
+        {
+            "title": f"Program {n}",
+            "university": "Fixture University",
+            "program_url": f"{servers[n % len(servers)].base_url}/programs/{n}",
+        }
+        for n in range(1, programs + 1)
+    ]
+    normalized = normalize_programs(records)
+    return load_rows(connection, programs_table, PROGRAM_COLUMNS, normalized.rows)
+
+
+def print_pass(name, result, servers):
+    summary = result.summary()
+    report(name, result.seconds, summary["targets"])
+    responses = {status: sum(server.responses[status] for server in servers) for status in (200, 304, 404)}
+    print(f"   fetched {summary['fetched']}, not modified {summary['not_modified']}, failed {summary['failed']}, "
+          f"enriched {summary['enriched']} {summary['fields_filled']}; server responses {responses}")
+    for server in servers:
+        server.responses = {200: 0, 304: 0, 404: 0}
+
+
+async def main(programs: int, hosts: int, latency_ms: float, processes: int):
+    await reset_schema()
+    with ExitStack() as stack:
+        servers = [stack.enter_context(FixtureServer(latency_ms / 1000, missing_every=50)) for _ in range(hosts)]
+        async with engine.begin() as conn:
+            await conn.run_sync(seed, servers, programs)
+
+        first = await enrich_programs(engine, processes=processes)
+        print_pass("first pass (200s, extraction)", first, servers)
+
+        second = await enrich_programs(engine, only_missing=False, processes=processes)
+        print_pass("second pass (conditional, 304s)", second, servers)
+
+        peak = max(server.peak for server in servers)
+        limit = settings.ENRICHMENT_PER_HOST_CONCURRENCY
+        print(f"   peak concurrent requests per host: {peak} (limit {limit})")
+    await close_db()
+    if peak > limit:
+        raise SystemExit(f"Per-host limit exceeded: {peak} > {limit}")
+    # Every seeded program misses the fields the fixture pages provide
+    if first.fetched == 0 or first.enriched != first.fetched:
+        raise SystemExit(f"First pass enriched {first.enriched} of {first.fetched} fetched programs")
+    if second.fetched or second.enriched:
+        raise SystemExit(f"Second pass refetched {second.fetched} pages, enriched {second.enriched} programs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--programs", type=int, default=1000)
+    parser.add_argument("--hosts", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.programs, args.hosts, args.latency_ms, args.processes))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark for loading a scraped program catalog.
+
+Builds N records in the programs_seed_data.json format (the real records,
+repeated with unique URLs) and compares:
+
+- row-by-row: one INSERT per program, as seed_programs.py used to do
+- bulk: normalize_programs + load_rows (COPY on PostgreSQL, executemany
+  batches elsewhere)
+
+Usage:
+    python benchmarks/bench_program_import.py --records 50000
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python benchmarks/bench_program_import.py
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+
+from _common import configure_environment, reset_schema, report
+
+configure_environment()
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core.bulk_load import load_rows  # noqa: E402
+from app.core.database import close_db, engine  # noqa: E402
+from app.services.program_import import (  # noqa: E402
+    PROGRAM_COLUMNS,
+    load_seed_records,
+    normalize_programs,
+    programs_table,
+)
+
+
+def build_records(count: int):
+    seed = load_seed_records()
+    return [
+        {**seed[i % len(seed)], "program_url": f"https://example.com/programs/{i}"}
+        for i in range(count)
+    ]
+
+
+def insert_row_by_row(connection, records) -> int:
+    statement = text(
+        "INSERT INTO programs (id, university_name, program_name, degree_type, country, program_url, "
+        "required_documents, created_at, updated_at) VALUES (:id, :university_name, :program_name, "
+        ":degree_type, :country, :program_url, :required_documents, :created_at, :updated_at)"
+    )
+    inserted = 0
+    for record in records:
+        if not record.get("university"):
+            continue
+        now = datetime.utcnow()
+        connection.execute(statement, {
+            "id": str(uuid.uuid4()),
+            "university_name": record["university"],
+            "program_name": record.get("title"),
+            "degree_type": record.get("degree_type") or "Other",
+            "country": record.get("country") or "Not Specified",
+            "program_url": record.get("program_url"),
+            "required_documents": json.dumps([record["requirements"]]) if record.get("requirements") else None,
+            "created_at": now,
+            "updated_at": now,
+        })
+        inserted += 1
+    return inserted
+
+
+async def main(records_count: int):
+    records = build_records(records_count)
+
+    await reset_schema()
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        inserted = await conn.run_sync(insert_row_by_row, records)
+    report("row-by-row INSERT", time.perf_counter() - started, inserted)
+
+    await reset_schema()
+    started = time.perf_counter()
+    normalized = normalize_programs(records)
+    report("normalize (vectorized)", time.perf_counter() - started, len(records))
+
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        load = await conn.run_sync(load_rows, programs_table, PROGRAM_COLUMNS, normalized.rows)
+    report(f"bulk load ({load.method})", time.perf_counter() - started, load.rows)
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.records))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the database step of worker startup (init_db) per DB_BOOT_MODE.
+
+Creates the schema, stamps alembic_version with the script head, then times
+init_db on a cold engine (disposed first, as in a freshly started worker)
+and counts the SQL statements it issues:
+
+- create_all: metadata.create_all, one introspection query per table
+- verify:     a single SELECT against alembic_version, no DDL
+- skip:       nothing
+
+Finally stamps an older revision and checks that verify fails fast.
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 20
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python benchmarks/bench_startup.py
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from _common import configure_environment, reset_schema
+
+configure_environment()
+
+from sqlalchemy import event, text  # noqa: E402
+
+from app.core.database import close_db, engine, init_db  # noqa: E402
+from app.core.schema_check import SchemaVersionError, revision_graph, script_heads  # noqa: E402
+
+MODES = ("create_all", "verify", "skip")
+
+
+async def stamp(revision: str):
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"))
+        await conn.execute(text("DELETE FROM alembic_version"))
+        await conn.execute(text("INSERT INTO alembic_version (version_num) VALUES (:revision)"), {"revision": revision})
+
+
+async def main(repeat: int):
+    await reset_schema()
+    graph = revision_graph()
+    heads = script_heads(graph)
+    await stamp(next(iter(heads)))
+
+    statements = []
+
+    def count_statement(*args):
+        statements.append(1)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    print(f"{'mode':<12} {'median':>10} {'p95':>10} {'statements':>12}")
+    for mode in MODES:
+        timings = []
+        for _ in range(repeat):
+            await engine.dispose()
+            statements.clear()
+            started = time.perf_counter()
+            await init_db(mode)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{mode:<12} {statistics.median(timings) * 1000:>8.1f}ms {p95 * 1000:>8.1f}ms {len(statements):>12}")
+
+    event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    # An outdated database must stop the worker
+    head = next(iter(heads))
+    previous = graph[head][0] if graph[head] else None
+    if previous:
+        await stamp(previous)
+        started = time.perf_counter()
+        try:
+            await init_db("verify")
+            raise SystemExit("verify accepted an outdated schema")
+        except SchemaVersionError as e:
+            print(f"\noutdated schema rejected in {(time.perf_counter() - started) * 1000:.1f} ms: {e}")
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
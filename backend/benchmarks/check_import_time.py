@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Cold-start import budget for the API worker.
+
+Imports app.main in fresh interpreters under `python -X importtime`, takes
+the median cumulative import time over --runs (after one warm-up run that
+writes the .pyc files), and fails when it exceeds the budget or when any
+optional heavy stack is imported at startup. Those must load on first use
+through app.core.plugins instead.
+
+Usage:
+    python benchmarks/check_import_time.py                 # budget from IMPORT_TIME_BUDGET_MS
+    python benchmarks/check_import_time.py --budget-ms 1200 --runs 7 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from _common import BACKEND_DIR, configure_environment
+
+DEFAULT_MODULE = "app.main"
+DEFAULT_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 2500))
+# Optional stacks that must never be imported when a worker starts
+FORBIDDEN = ("pandas", "numpy", "sklearn", "scipy", "openai", "boto3", "botocore", "PIL", "pyinstrument", "httpx")
+TOP = 15
+
+
+def run_importtime(module: str) -> List[Tuple[int, int, str]]:
+    """(self us, cumulative us, indented module name) per import, in -X importtime order"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header line
+        # One separator space, then two per nesting level
+        imports.append((int(self_us), int(cumulative_us), name.rstrip()[1:]))
+    return imports
+
+
+def summarize(imports: List[Tuple[int, int, str]]) -> Dict:
+    by_name = {name.strip(): (self_us, cumulative_us) for self_us, cumulative_us, name in imports}
+    # Top-level entries are not indented; they add up to the whole import
+    total_us = sum(cumulative_us for _, cumulative_us, name in imports if not name.startswith(" "))
+    top_packages: Dict[str, int] = {}
+    for self_us, _, name in imports:
+        package = name.strip().split(".")[0]
+        top_packages[package] = top_packages.get(package, 0) + self_us
+    return {
+        "total_ms": total_us / 1000,
+        "modules": len(imports),
+        "forbidden": sorted(
+            name for name in by_name if name.split(".")[0] in FORBIDDEN and "." not in name
+        ),
+        "top_packages_ms": dict(sorted(
+            ((package, us / 1000) for package, us in top_packages.items()), key=lambda item: -item[1]
+        )[:TOP]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the API worker's cold-start import time")
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    configure_environment()
+    run_importtime(args.module)  # warm-up: compile .pyc files
+    summaries = [summarize(run_importtime(args.module)) for _ in range(args.runs)]
+    median = statistics.median(summary["total_ms"] for summary in summaries)
+    last = summaries[-1]
+
+    result = {
+        "module": args.module,
+        "runs": args.runs,
+        "median_ms": round(median, 1),
+        "budget_ms": args.budget_ms,
+        "modules": last["modules"],
+        "forbidden_imports": last["forbidden"],
+        "top_packages_ms": {package: round(ms, 1) for package, ms in last["top_packages_ms"].items()},
+    }
+    result["passed"] = median <= args.budget_ms and not last["forbidden"]
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"import {args.module}: median {median:.1f} ms over {args.runs} runs "
+              f"({last['modules']} modules), budget {args.budget_ms:.0f} ms")
+        for package, ms in result["top_packages_ms"].items():
+            print(f"   {package:<30} {ms:>8.1f} ms")
+        if last["forbidden"]:
+            print(f"❌ imported at startup: {', '.join(last['forbidden'])}")
+        if median > args.budget_ms:
+            print(f"❌ over budget by {median - args.budget_ms:.1f} ms")
+        if result["passed"]:
+            print("✅ within budget")
+    return 0 if result["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
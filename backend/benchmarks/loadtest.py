@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+End-to-end API load test.
+
+Seeds a database with synthetic users, programs, applications, documents,
+activities and notifications (generate_synthetic_data, deterministic for a
+given --seed), boots the app
+in-process (lifespan included) and drives a weighted mix of workloads from
+--concurrency virtual users, each logged in as its own seeded account:
+
+    login       POST /auth/login (form data, bcrypt verification)
+    browse      GET  /programs/?view=summary, random page
+    search      GET  /programs/?search=<term>&view=summary
+    dashboard   GET  /dashboard/
+    bootstrap   GET  /bootstrap/
+    unread      GET  /notifications/unread-count
+    upload      POST /documents/upload/cv (multipart)
+
+Throughput and p50/p95/p99 latency per workload are printed as JSON, or
+written to --output for regression tracking. The event_loop_blocked_total
+counter from /metrics is included; --fail-on-blocked turns a non-zero value
+into a failing exit code.
+
+    python benchmarks/loadtest.py --scale 2 --duration 30 --output results.json
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python benchmarks/loadtest.py
+    python benchmarks/loadtest.py --base-url http://localhost:8000 --skip-seed
+
+With --base-url the requests go to a running server instead; it must use the
+database that was seeded (BENCH_DATABASE_URL) unless --skip-seed is given and
+the accounts already exist.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from _common import configure_environment, reset_schema
+
+DATABASE_URL = configure_environment()
+
+import httpx  # noqa: E402
+
+from app.core.database import close_db  # noqa: E402
+from generate_synthetic_data import (  # noqa: E402
+    DEFAULT_PASSWORD,
+    SUBJECTS,
+    GenerationPlan,
+    generate,
+    user_email,
+)
+
+API = "/api/v1"
+SEED_CHUNK_SIZE = 5000
+
+# Per unit of --scale
+USERS_PER_SCALE = 100
+PROGRAMS_PER_SCALE = 500
+APPLICATIONS_PER_USER = 5
+DOCUMENTS_PER_USER = 3
+ACTIVITIES_PER_USER = 10
+NOTIFICATIONS_PER_USER = 20
+
+DEFAULT_WEIGHTS = "login=1,browse=4,search=3,dashboard=3,bootstrap=2,unread=3,upload=1"
+
+PDF_BODY = b"%PDF-1.4\n" + b"0" * 50_000 + b"\n%%EOF\n"
+
+
+async def seed(scale: float, seed_value: int, processes: int) -> Dict[str, int]:
+    """Load the synthetic data set (see generate_synthetic_data); returns row counts per table"""
+    users = max(1, int(USERS_PER_SCALE * scale))
+    plan = GenerationPlan(
+        seed=seed_value,
+        users=users,
+        programs=max(1, int(PROGRAMS_PER_SCALE * scale)),
+        applications=users * APPLICATIONS_PER_USER,
+        documents_per_user=DOCUMENTS_PER_USER,
+        activities=users * ACTIVITIES_PER_USER,
+        notifications=users * NOTIFICATIONS_PER_USER,
+        chunk_size=SEED_CHUNK_SIZE,
+    )
+    return await asyncio.to_thread(generate, plan, DATABASE_URL, processes)
+
+
+def parse_weights(spec: str) -> Dict[str, int]:
+    weights = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in WORKLOADS:
+            raise SystemExit(f"Unknown workload {name!r}; choose from {', '.join(WORKLOADS)}")
+        weights[name] = int(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, email: str, rng: random.Random, search_terms: List[str], catalog_pages: int):
+        self.client = client
+        self.email = email
+        self.rng = rng
+        self.search_terms = search_terms
+        self.catalog_pages = catalog_pages
+        self.headers: Dict[str, str] = {}
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(f"{API}/auth/login", data={"username": self.email, "password": DEFAULT_PASSWORD})
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def browse(self) -> httpx.Response:
+        skip = self.rng.randrange(self.catalog_pages) * 20
+        return await self.client.get(f"{API}/programs/", params={"view": "summary", "skip": skip, "limit": 20}, headers=self.headers)
+
+    async def search(self) -> httpx.Response:
+        term = self.rng.choice(self.search_terms)
+        return await self.client.get(f"{API}/programs/", params={"view": "summary", "search": term, "limit": 20}, headers=self.headers)
+
+    async def dashboard(self) -> httpx.Response:
+        return await self.client.get(f"{API}/dashboard/", headers=self.headers)
+
+    async def bootstrap(self) -> httpx.Response:
+        return await self.client.get(f"{API}/bootstrap/", headers=self.headers)
+
+    async def unread(self) -> httpx.Response:
+        return await self.client.get(f"{API}/notifications/unread-count", headers=self.headers)
+
+    async def upload(self) -> httpx.Response:
+        files = {"file": ("cv.pdf", PDF_BODY, "application/pdf")}
+        return await self.client.post(f"{API}/documents/upload/cv", files=files, headers=self.headers)
+
+
+WORKLOADS = ["login", "browse", "search", "dashboard", "bootstrap", "unread", "upload"]
+
+
+async def run_load(client: httpx.AsyncClient, args, user_count: int, program_count: int) -> Dict:
+    weights = parse_weights(args.weights)
+    names, name_weights = list(weights), list(weights.values())
+    search_terms = SUBJECTS + ["University", "Institute", "Master", "PhD"]
+    catalog_pages = max(1, program_count // 20)
+
+    vusers = [
+        VirtualUser(client, user_email(i % user_count), random.Random(args.seed + i), search_terms, catalog_pages)
+        for i in range(args.concurrency)
+    ]
+    # Log every virtual user in before measuring
+    for response in await asyncio.gather(*(vuser.login() for vuser in vusers)):
+        if response.status_code != 200:
+            raise SystemExit(f"Warm-up login failed: {response.status_code} {response.text[:200]}")
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    status_codes: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    remaining = args.requests
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    async def worker(vuser: VirtualUser):
+        nonlocal remaining
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            else:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            name = vuser.rng.choices(names, weights=name_weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await getattr(vuser, name)()
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            latencies[name].append((time.perf_counter() - started) * 1000)
+            status_codes[name][status] += 1
+            if not 200 <= status < 300:
+                errors[name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(vuser) for vuser in vusers))
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in names:
+        values = sorted(latencies[name])
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "status_codes": {str(code): count for code, count in sorted(status_codes[name].items())},
+            "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+            "p50_ms": round(percentile(values, 0.50), 3),
+            "p95_ms": round(percentile(values, 0.95), 3),
+            "p99_ms": round(percentile(values, 0.99), 3),
+            "max_ms": round(values[-1], 3) if values else 0.0,
+        }
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "duration_seconds": round(elapsed, 3),
+        "requests": total,
+        "errors": sum(errors.values()),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+async def event_loop_blocked(client: httpx.AsyncClient) -> Optional[float]:
+    """event_loop_blocked_total from /metrics, or None if metrics are off"""
+    response = await client.get("/metrics")
+    if response.status_code != 200:
+        return None
+    match = re.search(r"^event_loop_blocked_total(?:\{[^}]*\})? ([0-9.eE+-]+)$", response.text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+async def main(args) -> int:
+    if args.skip_seed:
+        counts = {"users": args.users_hint, "programs": args.programs_hint}
+    else:
+        await reset_schema()
+        seed_started = time.perf_counter()
+        counts = await seed(args.scale, args.seed, args.seed_processes)
+        print(f"Seeded {counts} in {time.perf_counter() - seed_started:.1f} s", file=sys.stderr)
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        app_context = contextlib.nullcontext()
+    else:
+        from app.main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout)
+        app_context = app.router.lifespan_context(app)
+
+    async with app_context, client:
+        results = await run_load(client, args, counts["users"], counts["programs"])
+        blocked = await event_loop_blocked(client)
+
+    if not args.base_url:
+        await close_db()
+
+    report = {
+        "started_at": datetime.utcnow().isoformat(),
+        "target": args.base_url or "in-process",
+        "database": DATABASE_URL.split("://", 1)[0],
+        "config": {
+            "scale": args.scale,
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "requests": None if args.duration else args.requests,
+            "weights": parse_weights(args.weights),
+        },
+        "dataset": counts,
+        "event_loop_blocked_total": blocked,
+        **results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.fail_on_blocked and blocked:
+        print(f"FAIL: event loop blocked {blocked:.0f} times", file=sys.stderr)
+        return 1
+    if args.max_error_rate is not None and results["requests"]:
+        error_rate = results["errors"] / results["requests"]
+        if error_rate > args.max_error_rate:
+            print(f"FAIL: error rate {error_rate:.2%} above {args.max_error_rate:.2%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help=f"Data set size: {USERS_PER_SCALE} users and {PROGRAMS_PER_SCALE} programs per unit")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and request mix")
+    parser.add_argument("--seed-processes", type=int, default=0, help="Data generation processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=0, help="Run for this many seconds instead of --requests")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests when --duration is not set")
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS, help="Workload mix, e.g. browse=4,search=1")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--base-url", help="Load a running server instead of the in-process app")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded database")
+    parser.add_argument("--users-hint", type=int, default=USERS_PER_SCALE, help="Seeded users when using --skip-seed")
+    parser.add_argument("--programs-hint", type=int, default=PROGRAMS_PER_SCALE, help="Seeded programs when using --skip-seed")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--fail-on-blocked", action="store_true", help="Exit 1 if the event loop was blocked")
+    parser.add_argument("--max-error-rate", type=float, help="Exit 1 if the error rate exceeds this fraction")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for application number allocation.
+
+Fires N parallel POST /api/v1/applications/ requests (in-process, through the
+ASGI app) for users applying to programs of the same university and checks
+that every request succeeds and every application number is unique.
+
+SQLite serializes writers and times out ("database is locked") under heavy
+write concurrency, so on SQLite the run is scaled down to SQLITE_MAX_REQUESTS.
+For the full run point it at Postgres:
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python benchmarks/stress_application_numbers.py
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from _common import configure_environment, reset_schema, report
+
+DATABASE_URL = configure_environment()
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, close_db  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Program, User  # noqa: E402
+
+SQLITE_MAX_REQUESTS = 50
+
+
+async def seed(users: int, programs: int):
+    now = datetime.utcnow()
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    program_ids = [str(uuid.uuid4()) for _ in range(programs)]
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(User.__table__), [
+            {
+                "id": user_id,
+                "email": f"stress-{i}@example.com",
+                "full_name": f"Stress User {i}",
+                "hashed_password": "x",
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, user_id in enumerate(user_ids)
+        ])
+        # Same university everywhere so every request contends on one counter
+        await session.execute(insert(Program.__table__), [
+            {
+                "id": program_id,
+                "university_name": "Harvard University",
+                "program_name": f"Program {i}",
+                "degree_type": "Master",
+                "country": "United States",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, program_id in enumerate(program_ids)
+        ])
+        await session.commit()
+    return user_ids, program_ids
+
+
+async def main(args) -> int:
+    if DATABASE_URL.startswith("sqlite") and args.requests > SQLITE_MAX_REQUESTS:
+        print(f"SQLite: scaling down from {args.requests} to {SQLITE_MAX_REQUESTS} requests "
+              f"(set BENCH_DATABASE_URL to a Postgres database for the full run)")
+        args.requests = SQLITE_MAX_REQUESTS
+
+    await reset_schema()
+    user_ids, program_ids = await seed(args.users, args.programs)
+    tokens = {user_id: create_access_token({"sub": user_id}) for user_id in user_ids}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://stress", timeout=120) as client:
+        async def create(i: int):
+            user_id = user_ids[i % len(user_ids)]
+            return await client.post(
+                "/api/v1/applications/",
+                json={"program_id": program_ids[i % len(program_ids)]},
+                headers={"Authorization": f"Bearer {tokens[user_id]}"},
+            )
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*[create(i) for i in range(args.requests)], return_exceptions=True)
+        report(f"{args.requests} parallel creates", time.perf_counter() - started, args.requests)
+
+    responses = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+    errors = Counter(type(outcome).__name__ for outcome in outcomes if isinstance(outcome, BaseException))
+    statuses = Counter(response.status_code for response in responses)
+    numbers = [response.json()["application_id"] for response in responses if response.status_code == 201]
+    duplicates = [number for number, count in Counter(numbers).items() if count > 1]
+
+    print(f"status codes: {dict(statuses)}")
+    if errors:
+        print(f"exceptions: {dict(errors)}")
+    print(f"unique application numbers: {len(set(numbers))}/{len(numbers)}")
+    await close_db()
+
+    failures = args.requests - statuses.get(201, 0)
+    if failures or duplicates:
+        print(f"FAILED: {failures} failed requests, duplicates={duplicates[:10]}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--programs", type=int, default=20)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Fill missing program fields (deadline, description, degree type, required
+documents) from each program's page.
+
+Pages are fetched concurrently with per-host limits and conditional GETs
+against the program_pages cache, so a rerun mostly gets 304s. Only fields
+that are still empty are written.
+
+Usage:
+    python enrich_programs.py                         # programs with a missing field
+    python enrich_programs.py --all --limit 500       # recheck every program page
+    python enrich_programs.py --host www.ethz.ch --dry-run --json
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.config import settings
+from app.core.database import close_db, engine
+from app.services.catalog_sync import redis_invalidation_handler, register_invalidation_handler
+from app.services.program_enrichment import enrich_programs
+
+
+async def run(args):
+    try:
+        return await enrich_programs(
+            engine,
+            only_missing=not args.all,
+            limit=args.limit,
+            hosts=args.host,
+            dry_run=args.dry_run,
+            processes=args.processes,
+        )
+    finally:
+        await close_db()
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Enrich programs from their program pages")
+    parser.add_argument("--all", action="store_true", help="Fetch every program page, not only incomplete programs")
+    parser.add_argument("--limit", type=int, help="At most this many programs")
+    parser.add_argument("--host", action="append", help="Only programs on this host (repeatable)")
+    parser.add_argument("--processes", type=int, help="HTML extraction workers (default: ENRICHMENT_PROCESSES)")
+    parser.add_argument("--dry-run", action="store_true", help="Fetch and extract, but write nothing")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    if settings.CATALOG_INVALIDATION_CHANNEL and not args.dry_run:
+        register_invalidation_handler(redis_invalidation_handler(settings.REDIS_URL, settings.CATALOG_INVALIDATION_CHANNEL))
+
+    try:
+        result = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Enrichment interrupted; completed batches are saved.\n")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Enrichment failed: {str(e)}\n")
+        return 1
+
+    summary = result.summary()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"\n{'='*80}")
+    print(f"{'🔎 Dry run' if args.dry_run else '✅ Enrichment complete'} ({summary['run_id']}) in {summary['seconds']:.2f} s")
+    for name in ("targets", "fetched", "not_modified", "failed", "enriched"):
+        print(f"   {name:<14} {summary[name]:>8,}")
+    for name, count in sorted(summary["fields_filled"].items()):
+        print(f"   + {name:<12} {count:>8,}")
+    print(f"{'='*80}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
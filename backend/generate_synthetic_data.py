@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for scale testing.
+
+Generates coherent users, programs, applications, documents, activities and
+notifications. Programs are drawn from the real seed catalog
+(programs_seed_data.json): universities, countries and degree types keep the
+frequencies they have there. Applications follow a realistic status funnel,
+and activities and notifications reference the user's own applications.
+
+Rows are generated in chunks by a pool of worker processes. On PostgreSQL
+every worker streams its chunks straight into the table with
+COPY ... FROM STDIN (see app.core.bulk_load); on other databases (SQLite) the
+workers generate and the main process inserts with executemany batches. Parent tables are loaded
+before the tables that reference them.
+
+Output is deterministic: the same --seed, --as-of date, --chunk-size and
+counts always produce the same rows, whatever the number of processes.
+
+Usage:
+    python generate_synthetic_data.py --applications 1000000 --processes 8
+    python generate_synthetic_data.py --database-url postgresql://... --truncate
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from faker import Faker
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.core.bulk_load import load_rows
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.models.activity import ActivityType
+from app.models.application import ApplicationStatus
+from app.models.document import DocumentStatus, DocumentType
+from app.models.notification import NotificationType
+from app.models.user import UserRole
+from app.services.application_numbers import format_application_number
+
+SEED_DATA_PATH = Path(__file__).parent / "programs_seed_data.json"
+DEFAULT_PASSWORD = "synthetic-password"
+APPLICATION_PREFIX = "SYN"
+HISTORY_DAYS = 365
+
+# Status funnel for applications (weights, not percentages of a fixed total)
+STATUS_WEIGHTS = {
+    ApplicationStatus.DRAFT: 30,
+    ApplicationStatus.SUBMITTED: 25,
+    ApplicationStatus.REVIEW: 15,
+    ApplicationStatus.INTERVIEW: 7,
+    ApplicationStatus.OFFER: 5,
+    ApplicationStatus.ACCEPTED: 4,
+    ApplicationStatus.REJECTED: 10,
+    ApplicationStatus.WITHDRAWN: 4,
+}
+DECIDED_STATUSES = {ApplicationStatus.OFFER, ApplicationStatus.ACCEPTED, ApplicationStatus.REJECTED}
+
+SUBJECTS = [
+    "Computer Science", "Machine Learning", "Data Science", "Robotics", "Electrical Engineering",
+    "Mechanical Engineering", "Economics", "Finance", "Public Health", "Physics", "Mathematics",
+    "Biomedical Engineering", "Architecture", "Psychology", "Environmental Science", "Management",
+]
+DOCUMENT_TYPES = [
+    DocumentType.CV_RESUME, DocumentType.TRANSCRIPT, DocumentType.ENGLISH_TEST,
+    DocumentType.STATEMENT_OF_PURPOSE, DocumentType.RECOMMENDATION_LETTER,
+]
+TAGS = ["Scholarships", "Fast Decision", "STEM", "Online", "Research", "Part-time"]
+
+# Column order per table; rows are generated as tuples in this order
+COLUMNS = {
+    "users": (
+        "id", "email", "full_name", "hashed_password", "role", "is_active", "is_verified",
+        "location", "current_degree", "current_major", "gpa", "profile_completion", "created_at", "updated_at",
+    ),
+    "programs": (
+        "id", "university_name", "program_name", "degree_type", "country", "logo", "application_fee",
+        "deadline", "duration_months", "tuition_per_year", "tags", "features", "min_gpa",
+        "english_test_required", "required_documents", "program_url", "acceptance_rate",
+        "is_active", "is_featured", "created_at", "updated_at",
+    ),
+    "applications": (
+        "id", "user_id", "program_id", "application_id", "status", "submitted_date", "deadline",
+        "decision_date", "completion_percentage", "created_at", "updated_at",
+    ),
+    "documents": (
+        "id", "user_id", "document_type", "name", "filename", "file_path", "file_size", "mime_type",
+        "status", "is_verified", "created_at", "updated_at",
+    ),
+    "activities": (
+        "id", "user_id", "activity_type", "title", "description", "related_application_id",
+        "related_program_id", "created_at",
+    ),
+    "notifications": (
+        "id", "user_id", "notification_type", "title", "message", "is_read", "is_deleted",
+        "related_application_id", "related_program_id", "created_at", "read_at",
+    ),
+}
+# Tables in each stage only reference tables loaded in earlier stages
+STAGES = (("users", "programs"), ("applications", "documents"), ("activities", "notifications"))
+
+
+@dataclass
+class GenerationPlan:
+    seed: int = 42
+    users: int = 100_000
+    programs: int = 10_000
+    applications: int = 1_000_000
+    documents_per_user: int = 3
+    activities: int = 500_000
+    notifications: int = 1_000_000
+    chunk_size: int = 50_000
+    as_of: datetime = field(default_factory=lambda: datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0))
+    hashed_password: str = ""
+
+    def count(self, table: str) -> int:
+        if table == "documents":
+            return self.users * min(self.documents_per_user, len(DOCUMENT_TYPES))
+        return getattr(self, table)
+
+
+@dataclass
+class Templates:
+    """Weighted choices taken from the real program catalog"""
+
+    universities: List[Tuple[str, str]]
+    university_weights: List[int]
+    degrees: List[str]
+    degree_weights: List[int]
+
+    @classmethod
+    def load(cls, path: Path = SEED_DATA_PATH) -> "Templates":
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        universities = Counter(
+            (record["university"], record.get("country") or "Not Specified")
+            for record in records if record.get("university")
+        )
+        degrees = Counter(record["degree_type"] for record in records if record.get("degree_type"))
+        if not degrees:
+            degrees = Counter({"Master": 1})
+        return cls(
+            universities=list(universities),
+            university_weights=list(universities.values()),
+            degrees=list(degrees),
+            degree_weights=list(degrees.values()),
+        )
+
+
+def user_email(i: int) -> str:
+    return f"user{i}@synthetic.example.com"
+
+
+def entity_id(seed: int, kind: str, index: int) -> str:
+    """Stable UUID for the index-th row of a kind, so tables can reference each other"""
+    digest = hashlib.blake2b(f"{seed}:{kind}:{index}".encode(), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
+
+
+def row_rng(seed: int, kind: str, index: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def program_profile(plan: GenerationPlan, templates: Templates, index: int) -> Tuple[str, str, str, datetime]:
+    """(university, country, degree, deadline) of a program, recomputable from its index"""
+    rng = row_rng(plan.seed, "program", index)
+    university, country = rng.choices(templates.universities, weights=templates.university_weights)[0]
+    degree = rng.choices(templates.degrees, weights=templates.degree_weights)[0]
+    deadline = plan.as_of + timedelta(days=rng.randint(-60, 300))
+    return university, country, degree, deadline
+
+
+def _history(rng: random.Random, as_of: datetime) -> datetime:
+    return as_of - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+
+
+def _user_rows(plan, templates, start, stop, fake: Faker) -> Iterator[tuple]:
+    for i in range(start, stop):
+        rng = row_rng(plan.seed, "user", i)
+        created_at = _history(rng, plan.as_of)
+        yield (
+            entity_id(plan.seed, "user", i), user_email(i), fake.name(), plan.hashed_password, UserRole.STUDENT.name,
+            True, rng.random() < 0.8, fake.city(), rng.choice(["Bachelor", "Master"]),
+            rng.choice(SUBJECTS), f"{rng.uniform(2.5, 4.0):.2f}", str(rng.choice([20, 40, 60, 80, 100])),
+            created_at, created_at,
+        )
+
+
+def _program_rows(plan, templates, start, stop, fake: Faker) -> Iterator[tuple]:
+    for i in range(start, stop):
+        university, country, degree, deadline = program_profile(plan, templates, i)
+        rng = row_rng(plan.seed, "program-detail", i)
+        created_at = _history(rng, plan.as_of)
+        domain = "".join(ch for ch in university.lower() if ch.isalnum())[:24] or "university"
+        yield (
+            entity_id(plan.seed, "program", i), university, f"{degree} in {rng.choice(SUBJECTS)}", degree,
+            country, university[:1].upper(), f"${rng.choice([0, 50, 75, 100, 150])}", deadline,
+            rng.choice([12, 18, 24, 36, 48]), f"${rng.randint(0, 60)},000", rng.sample(TAGS, 2), [],
+            round(rng.uniform(2.5, 3.7), 1), rng.random() < 0.8, ["CV", "Transcript"],
+            f"https://www.{domain}.edu/programs/{i}", round(rng.uniform(0.05, 0.6), 2),
+            True, rng.random() < 0.05, created_at, created_at,
+        )
+
+
+def _application_rows(plan, templates, start, stop, fake: Faker) -> Iterator[tuple]:
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    for i in range(start, stop):
+        rng = row_rng(plan.seed, "application", i)
+        program = rng.randrange(plan.programs)
+        _, _, _, deadline = program_profile(plan, templates, program)
+        status = rng.choices(statuses, weights=weights)[0]
+        created_at = _history(rng, plan.as_of)
+        submitted = created_at + timedelta(days=rng.randint(1, 30)) if status != ApplicationStatus.DRAFT else None
+        decided = submitted + timedelta(days=rng.randint(14, 90)) if submitted and status in DECIDED_STATUSES else None
+        yield (
+            entity_id(plan.seed, "application", i), entity_id(plan.seed, "user", i % plan.users),
+            entity_id(plan.seed, "program", program),
+            format_application_number(APPLICATION_PREFIX, plan.as_of.year, i + 1), status.name,
+            submitted, deadline, decided, 100 if submitted else rng.randint(0, 90), created_at, decided or submitted or created_at,
+        )
+
+
+def _document_rows(plan, templates, start, stop, fake: Faker) -> Iterator[tuple]:
+    per_user = min(plan.documents_per_user, len(DOCUMENT_TYPES))
+    for i in range(start, stop):
+        rng = row_rng(plan.seed, "document", i)
+        user = i // per_user
+        document_type = DOCUMENT_TYPES[i % per_user]
+        user_id = entity_id(plan.seed, "user", user)
+        verified = rng.random() < 0.5
+        created_at = _history(rng, plan.as_of)
+        yield (
+            entity_id(plan.seed, "document", i), user_id, document_type.name,
+            document_type.value.replace("_", " ").title(), f"{document_type.value.lower()}.pdf",
+            f"documents/{user_id}/{entity_id(plan.seed, 'file', i)}.pdf", rng.randint(20_000, 5_000_000),
+            "application/pdf", (DocumentStatus.VERIFIED if verified else DocumentStatus.UPLOADED).name,
+            verified, created_at, created_at,
+        )
+
+
+def _user_application(plan: GenerationPlan, rng: random.Random, user: int) -> Optional[int]:
+    """Index of a random application belonging to `user` (applications go round-robin over users)"""
+    owned = (plan.applications - user + plan.users - 1) // plan.users if plan.applications > user else 0
+    return user + plan.users * rng.randrange(owned) if owned else None
+
+
+def _activity_rows(plan, templates, start, stop, fake: Faker) -> Iterator[tuple]:
+    activity_types = list(ActivityType)
+    for i in range(start, stop):
+        rng = row_rng(plan.seed, "activity", i)
+        user = i % plan.users
+        application = _user_application(plan, rng, user)
+        activity_type = rng.choice(activity_types)
+        yield (
+            entity_id(plan.seed, "activity", i), entity_id(plan.seed, "user", user), activity_type.name,
+            activity_type.value.replace("_", " ").capitalize(), fake.sentence(nb_words=10),
+            entity_id(plan.seed, "application", application) if application is not None else None,
+            None, _history(rng, plan.as_of),
+        )
+
+
+def _notification_rows(plan, templates, start, stop, fake: Faker) -> Iterator[tuple]:
+    notification_types = list(NotificationType)
+    for i in range(start, stop):
+        rng = row_rng(plan.seed, "notification", i)
+        user = i % plan.users
+        application = _user_application(plan, rng, user)
+        created_at = _history(rng, plan.as_of)
+        is_read = rng.random() < 0.6
+        yield (
+            entity_id(plan.seed, "notification", i), entity_id(plan.seed, "user", user),
+            rng.choice(notification_types).name, fake.sentence(nb_words=6), fake.sentence(nb_words=18),
+            is_read, rng.random() < 0.02,
+            entity_id(plan.seed, "application", application) if application is not None else None,
+            None, created_at, created_at + timedelta(hours=rng.randint(1, 72)) if is_read else None,
+        )
+
+
+GENERATORS = {
+    "users": _user_rows,
+    "programs": _program_rows,
+    "applications": _application_rows,
+    "documents": _document_rows,
+    "activities": _activity_rows,
+    "notifications": _notification_rows,
+}
+
+
+def generate_chunk(plan: GenerationPlan, templates: Templates, table: str, start: int, stop: int) -> List[tuple]:
+    fake = Faker()
+    fake.seed_instance(f"{plan.seed}:{table}:{start}")
+    return list(GENERATORS[table](plan, templates, start, stop, fake))
+
+
+# Per-process engine for the PostgreSQL COPY workers
+_worker_engine = None
+
+
+def _init_copy_worker(url: str):
+    global _worker_engine
+    _worker_engine = create_engine(url, poolclass=NullPool)
+
+
+def _load(engine, table: str, rows: List[tuple]):
+    with engine.begin() as connection:
+        load_rows(connection, Base.metadata.tables[table], COLUMNS[table], rows)
+
+
+def _copy_chunk(task) -> Tuple[str, int]:
+    plan, templates, table, start, stop = task
+    rows = generate_chunk(plan, templates, table, start, stop)
+    _load(_worker_engine, table, rows)
+    return table, len(rows)
+
+
+def _generate_chunk_task(task) -> Tuple[str, List[tuple]]:
+    plan, templates, table, start, stop = task
+    return table, generate_chunk(plan, templates, table, start, stop)
+
+
+def sync_database_url(database_url: str) -> str:
+    """Strip the async driver from a DATABASE_URL"""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://").replace("sqlite+aiosqlite://", "sqlite://")
+
+
+def _chunks(plan: GenerationPlan, tables: Sequence[str]) -> List[Tuple[str, int, int]]:
+    return [
+        (table, start, min(start + plan.chunk_size, plan.count(table)))
+        for table in tables
+        for start in range(0, plan.count(table), plan.chunk_size)
+    ]
+
+
+def _prepare_partitions(engine, plan: GenerationPlan):
+    """Monthly partitions covering the generated history (PostgreSQL partitioned tables only)"""
+    from app.core import partitioning
+
+    first_month = plan.as_of - timedelta(days=HISTORY_DAYS)
+    with engine.begin() as connection:
+        for table in ("activities", "notifications"):
+            if partitioning.is_partitioned(connection, table):
+                for statement in partitioning.partition_range_sql(table, first_month, plan.as_of):
+                    connection.execute(text(statement))
+
+
+def truncate(engine):
+    tables = [table for stage in reversed(STAGES) for table in reversed(stage)]
+    with engine.begin() as connection:
+        if engine.dialect.name == "postgresql":
+            connection.execute(text(f"TRUNCATE {', '.join(tables)} CASCADE"))
+        else:
+            for table in tables:
+                connection.execute(text(f"DELETE FROM {table}"))
+
+
+def generate(plan: GenerationPlan, database_url: str, processes: int = 0, progress: bool = False) -> Dict[str, int]:
+    """Generate and load every table; returns rows written per table"""
+    if not plan.hashed_password:
+        plan.hashed_password = CryptContext(schemes=["bcrypt"], deprecated="auto").hash(DEFAULT_PASSWORD)
+    templates = Templates.load()
+    url = sync_database_url(database_url)
+    engine = create_engine(url)
+    processes = processes or os.cpu_count() or 1
+    written: Dict[str, int] = Counter()
+    started = time.perf_counter()
+
+    def report(table: str, rows: int):
+        written[table] += rows
+        if progress:
+            total = sum(written.values())
+            elapsed = time.perf_counter() - started
+            print(f"  {table:<14} {written[table]:>12,} / {plan.count(table):,}   ({total / elapsed:,.0f} rows/s)")
+
+    try:
+        if engine.dialect.name == "postgresql":
+            _prepare_partitions(engine, plan)
+            worker_url = engine.url.render_as_string(hide_password=False)
+            with ProcessPoolExecutor(processes, initializer=_init_copy_worker, initargs=(worker_url,)) as pool:
+                for stage in STAGES:
+                    tasks = [(plan, templates, *chunk) for chunk in _chunks(plan, stage)]
+                    for table, rows in pool.map(_copy_chunk, tasks):
+                        report(table, rows)
+        else:
+            # Single writer: SQLite serializes writes anyway
+            with ProcessPoolExecutor(processes) as pool:
+                for stage in STAGES:
+                    tasks = [(plan, templates, *chunk) for chunk in _chunks(plan, stage)]
+                    for table, rows in pool.map(_generate_chunk_task, tasks):
+                        _load(engine, table, rows)
+                        report(table, len(rows))
+    finally:
+        engine.dispose()
+
+    return dict(written)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = GenerationPlan()
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL from the app settings")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--programs", type=int, default=defaults.programs)
+    parser.add_argument("--applications", type=int, default=defaults.applications)
+    parser.add_argument("--documents-per-user", type=int, default=defaults.documents_per_user)
+    parser.add_argument("--activities", type=int, default=defaults.activities)
+    parser.add_argument("--notifications", type=int, default=defaults.notifications)
+    parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size)
+    parser.add_argument("--as-of", type=datetime.fromisoformat, default=defaults.as_of,
+                        help="Reference date for generated timestamps (YYYY-MM-DD); defaults to today")
+    parser.add_argument("--processes", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument("--truncate", action="store_true", help="Empty the tables first")
+    parser.add_argument("--create-schema", action="store_true", help="Create missing tables first (metadata.create_all)")
+    args = parser.parse_args()
+
+    if args.users < 1 or args.programs < 1:
+        parser.error("--users and --programs must be at least 1")
+
+    if args.database_url:
+        database_url = args.database_url
+    else:
+        from app.core.config import settings
+
+        database_url = settings.DATABASE_URL
+
+    plan = GenerationPlan(
+        seed=args.seed,
+        users=args.users,
+        programs=args.programs,
+        applications=args.applications,
+        documents_per_user=args.documents_per_user,
+        activities=args.activities,
+        notifications=args.notifications,
+        chunk_size=args.chunk_size,
+        as_of=args.as_of,
+    )
+
+    if args.create_schema or args.truncate:
+        engine = create_engine(sync_database_url(database_url))
+        if args.create_schema:
+            Base.metadata.create_all(engine)
+        if args.truncate:
+            truncate(engine)
+        engine.dispose()
+
+    started = time.perf_counter()
+    print(f"\n📊 Generating synthetic data (seed {plan.seed})...\n")
+    written = generate(plan, database_url, args.processes, progress=True)
+    elapsed = time.perf_counter() - started
+    total = sum(written.values())
+    print(f"\n✅ {total:,} rows in {elapsed:.1f} s ({total / elapsed:,.0f} rows/s)")
+    for table, rows in written.items():
+        print(f"   {table:<14} {rows:>12,}")
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Import program bookmarks from a browser bookmarks export (Netscape HTML).
+
+The export is parsed incrementally and bookmarks that look like programs
+(known university/organization hosts, job postings, degree keywords) are
+turned into catalog records, folder batches in parallel.
+
+Modes:
+    load  bulk load into an empty programs table, batch by batch (default)
+    sync  apply to a populated table through the incremental catalog sync
+    json  write the records in the programs_seed_data.json format
+
+Usage:
+    python import_bookmarks.py
+    python import_bookmarks.py bookmarks.html --mode sync
+    python import_bookmarks.py bookmarks.html --mode json --output programs_from_bookmarks.json
+    python import_bookmarks.py bookmarks.html --folder "Links" --processes 4
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine
+from app.core.config import settings
+from app.services.bookmarks_import import DEFAULT_BATCH_SIZE, iter_record_batches
+from app.services.program_import import count_programs, import_programs, natural_key
+
+DEFAULT_EXPORT_PATH = Path(__file__).resolve().parent.parent / "archive" / "Extra_Data" / "bookmarks_12_1_25.html"
+
+
+def _unseen(records, seen):
+    """Drop records whose natural key was already loaded from an earlier batch"""
+    fresh = []
+    for record in records:
+        key = natural_key(record.get("program_url"), record.get("university") or "", record.get("title") or "")
+        if key not in seen:
+            seen.add(key)
+            fresh.append(record)
+    return fresh
+
+
+def load(engine, batches) -> int:
+    """Bulk load batches into an empty programs table in one transaction"""
+    seen = set()
+    total, rejected, load_seconds = 0, 0, 0.0
+    with engine.begin() as connection:
+        count = count_programs(connection)
+        if count > 0:
+            print(f"\n⚠️  Programs table already contains {count} records. Use --mode sync instead.\n")
+            return 0
+        for records in batches:
+            normalized, report = import_programs(connection, _unseen(records, seen))
+            total += report.rows
+            rejected += len(normalized.rejected)
+            load_seconds += report.seconds
+    print(f"✅ Loaded {total:,} programs in {load_seconds:.2f} s ({rejected} rejected)")
+    return total
+
+
+def sync(engine, batches) -> int:
+    """Apply all records through the catalog sync (never deactivates missing programs)"""
+    from app.services.catalog_sync import redis_invalidation_handler, register_invalidation_handler, sync_catalog
+
+    if settings.CATALOG_INVALIDATION_CHANNEL:
+        register_invalidation_handler(redis_invalidation_handler(settings.REDIS_URL, settings.CATALOG_INVALIDATION_CHANNEL))
+    records = [record for batch in batches for record in batch]
+    result = sync_catalog(engine, records)
+    summary = result.summary()
+    print(f"✅ Sync complete ({summary['sync_id']}) in {summary['seconds']:.2f} s")
+    for name in ("received", "created", "updated", "reactivated", "unchanged", "rejected"):
+        print(f"   {name:<12} {summary[name]:>8,}")
+    return result.created + result.updated + result.reactivated
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Import program bookmarks into the programs table")
+    parser.add_argument("path", nargs="?", type=Path, default=DEFAULT_EXPORT_PATH, help="Bookmarks export (HTML)")
+    parser.add_argument("--mode", choices=("load", "sync", "json"), default="load")
+    parser.add_argument("--output", type=Path, help="Output file for --mode json (default: stdout)")
+    parser.add_argument("--folder", action="append", help="Only import bookmarks under this folder (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Keep bookmarks without program hints")
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Worker processes for record extraction (1 = in process)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Bookmarks per batch")
+    args = parser.parse_args()
+
+    if not args.path.exists():
+        print(f"\n❌ Bookmarks export not found at {args.path}\n")
+        return 1
+
+    started = time.perf_counter()
+    batches = iter_record_batches(args.path, args.processes, args.batch_size, args.folder, args.all)
+
+    if args.mode == "json":
+        records = [record for batch in batches for record in batch]
+        payload = json.dumps(records, indent=2, ensure_ascii=False)
+        if args.output:
+            args.output.write_text(payload + "\n", encoding="utf-8")
+            print(f"✅ Wrote {len(records):,} records to {args.output} in {time.perf_counter() - started:.2f} s")
+        else:
+            print(payload)
+        return 0
+
+    sync_db_url = settings.DATABASE_URL.replace('postgresql+asyncpg://', 'postgresql://').replace('sqlite+aiosqlite://', 'sqlite://')
+    engine = create_engine(sync_db_url)
+    try:
+        print(f"\n📚 Importing bookmarks from {args.path} ({args.mode})...\n")
+        if args.mode == "load":
+            load(engine, batches)
+        else:
+            sync(engine, batches)
+    except Exception as e:
+        print(f"\n❌ Import failed: {str(e)}\n")
+        return 1
+    finally:
+        engine.dispose()
+
+    print(f"   total {time.perf_counter() - started:.2f} s\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
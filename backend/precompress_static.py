@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Build step: write brotli (.br) and gzip (.gz) variants of the frontend's text
+assets next to the originals, at maximum compression. The backend serves them
+through PrecompressedStaticFiles, so no CPU is spent compressing per request.
+
+Variants are only written when they are smaller than the original, and are
+skipped when already newer than their source.
+
+Usage:
+    python precompress_static.py               # ../frontend
+    python precompress_static.py path/to/dist --force
+"""
+import argparse
+import gzip
+import os
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+EXTENSIONS = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".xml", ".map"}
+MINIMUM_SIZE = 1024
+
+
+def _write_variant(source: Path, suffix: str, data: bytes, force: bool) -> bool:
+    target = source.with_name(source.name + suffix)
+    if not force and target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+        return False
+    raw_size = source.stat().st_size
+    if len(data) >= raw_size:
+        # Not worth serving; remove a stale variant so the original is used
+        if target.exists():
+            target.unlink()
+        return False
+    target.write_bytes(data)
+    os.utime(target, (source.stat().st_atime, source.stat().st_mtime))
+    return True
+
+
+def precompress(directory: Path, force: bool = False) -> int:
+    written = 0
+    for source in sorted(directory.rglob("*")):
+        if not source.is_file() or source.suffix not in EXTENSIONS:
+            continue
+        if source.stat().st_size < MINIMUM_SIZE:
+            continue
+
+        raw = source.read_bytes()
+        if _write_variant(source, ".gz", gzip.compress(raw, compresslevel=9, mtime=0), force):
+            written += 1
+            print(f"  {source.relative_to(directory)}.gz")
+        if brotli is not None:
+            if _write_variant(source, ".br", brotli.compress(raw, quality=11), force):
+                written += 1
+                print(f"  {source.relative_to(directory)}.br")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default=str(Path(__file__).parent.parent / "frontend"))
+    parser.add_argument("--force", action="store_true", help="Rewrite variants even if up to date")
+    args = parser.parse_args()
+
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"❌ {directory} is not a directory")
+        sys.exit(1)
+    if brotli is None:
+        print("⚠️  brotli is not installed, writing gzip variants only")
+
+    written = precompress(directory, args.force)
+    print(f"✅ {written} precompressed file(s) written in {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,154 +4,99 @@ Standalone script to seed Programs table with real academic program data.
 This script connects directly to the database and populates the Programs table
 if it is currently empty.
 
+Records are normalized in one vectorized pass and bulk loaded (COPY on
+PostgreSQL, batched executemany elsewhere), so large scraped catalogs load in
+seconds.
+
 Usage:
-    python seed_programs.py
+    python seed_programs.py                      # programs_seed_data.json
+    python seed_programs.py scraped_catalog.json # any file in the same format
+    python seed_programs.py --append             # load even if the table has rows
 """
 
-import asyncio
-import json
-import uuid
-from datetime import datetime
+import argparse
 from pathlib import Path
 import sys
+import time
 
 # Add the app directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from app.models.program import Program
+from sqlalchemy import create_engine
 from app.core.config import settings
+from app.services.program_import import SEED_DATA_PATH, count_programs, import_programs, load_seed_records
 
 
-async def seed_programs():
+def seed_programs(path: Path = SEED_DATA_PATH, append: bool = False) -> int:
     """
-    Seed the programs table with real academic program data.
-    Only inserts data if the table is currently empty.
+    Seed the programs table from a JSON file of scraped program records.
+    Only inserts data if the table is currently empty, unless `append`.
+    Returns the number of inserted programs.
     """
     # Create synchronous engine for direct database access
-    sync_db_url = settings.DATABASE_URL.replace('postgresql+asyncpg://', 'postgresql://')
-    engine = create_engine(sync_db_url, echo=True)
-    
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    
+    sync_db_url = settings.DATABASE_URL.replace('postgresql+asyncpg://', 'postgresql://').replace('sqlite+aiosqlite://', 'sqlite://')
+    engine = create_engine(sync_db_url)
+
     try:
-        # Check if programs table already has data
-        result = session.execute(text("SELECT COUNT(*) FROM programs"))
-        count = result.scalar()
-        
-        if count > 0:
-            print(f"\n✅ Programs table already contains {count} records. Skipping seed data.\n")
-            return
-        
-        # Load seed data from JSON file
-        json_path = Path(__file__).parent / "programs_seed_data.json"
-        
-        if not json_path.exists():
-            print(f"\n❌ Seed data file not found at {json_path}\n")
-            return
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            seed_data = json.load(f)
-        
-        print(f"\n📊 Loading {len(seed_data)} programs into database...\n")
-        
-        # Insert each program
-        inserted_count = 0
-        errors = []
-        
-        for idx, program in enumerate(seed_data, 1):
-            try:
-                # Generate UUID for program
-                program_id = str(uuid.uuid4())
-                now = datetime.utcnow()
-                
-                # Skip programs without required fields
-                if not program.get('university'):
-                    print(f"✗ [{idx}/{len(seed_data)}] Skipped (no university): {program.get('title')[:60]}...")
-                    continue
-                
-                # Prepare required_documents as JSON if requirements exists
-                required_docs = None
-                if program.get('requirements'):
-                    required_docs = [program['requirements']]
-                
-                # Use defaults for required NOT NULL fields
-                degree_type = program.get('degree_type') or 'Other'
-                country = program.get('country') or 'Not Specified'
-                
-                # Map JSON fields to database columns
-                insert_query = text("""
-                    INSERT INTO programs (
-                        id, university_name, program_name, degree_type, country, 
-                        program_url, deadline, description, required_documents,
-                        created_at, updated_at
-                    ) VALUES (
-                        :id, :university_name, :program_name, :degree_type, :country,
-                        :program_url, :deadline, :description, :required_documents,
-                        :created_at, :updated_at
-                    )
-                """)
-                
-                session.execute(insert_query, {
-                    'id': program_id,
-                    'university_name': program.get('university'),
-                    'program_name': program.get('title'),
-                    'degree_type': degree_type,
-                    'country': country,
-                    'program_url': program.get('program_url'),
-                    'deadline': program.get('deadline'),
-                    'description': program.get('description'),
-                    'required_documents': json.dumps(required_docs) if required_docs else None,
-                    'created_at': now,
-                    'updated_at': now
-                })
-                
-                inserted_count += 1
-                print(f"✓ [{idx}/{len(seed_data)}] Inserted: {program.get('title')[:60]}...")
-                
-            except Exception as e:
-                error_msg = f"✗ [{idx}/{len(seed_data)}] Error inserting '{program.get('title')}': {str(e)}"
-                errors.append(error_msg)
-                print(error_msg)
-                continue
-        
-        # Commit all changes
-        session.commit()
-        
-        print(f"\n{'='*80}")
-        print(f"✅ Successfully inserted {inserted_count} programs into database!")
-        
-        if errors:
-            print(f"\n⚠️  {len(errors)} errors occurred:")
-            for error in errors:
-                print(f"   {error}")
-        
+        with engine.begin() as connection:
+            # Check if programs table already has data
+            count = count_programs(connection)
+            if count > 0 and not append:
+                print(f"\n✅ Programs table already contains {count} records. Skipping seed data.")
+                print("   Use sync_programs.py to apply catalog updates incrementally.\n")
+                return 0
+
+            if not path.exists():
+                print(f"\n❌ Seed data file not found at {path}\n")
+                return 0
+
+            read_started = time.perf_counter()
+            records = load_seed_records(path)
+            read_seconds = time.perf_counter() - read_started
+
+            print(f"\n📊 Loading {len(records):,} programs into database...\n")
+            normalized, report = import_programs(connection, records)
+
+            final_count = count_programs(connection)
+
+        print(f"{'='*80}")
+        print(f"✅ Successfully inserted {report.rows:,} programs into database!")
+        print(f"   read       {read_seconds:8.2f} s")
+        print(f"   normalize  {normalized.seconds:8.2f} s  ({len(records) / max(normalized.seconds, 1e-9):,.0f} records/s)")
+        print(f"   load       {report.seconds:8.2f} s  ({report.rows_per_second:,.0f} rows/s via {report.method})")
+
+        if normalized.rejected:
+            print(f"\n⚠️  {len(normalized.rejected)} records rejected:")
+            for index, reason in normalized.rejected[:20]:
+                title = (records[index].get('title') or '')[:60]
+                print(f"   [{index + 1}] {reason}: {title}")
+            if len(normalized.rejected) > 20:
+                print(f"   ... and {len(normalized.rejected) - 20} more")
+
         print(f"{'='*80}\n")
-        
-        # Verify the data
-        result = session.execute(text("SELECT COUNT(*) FROM programs"))
-        final_count = result.scalar()
         print(f"📊 Programs table now contains {final_count} records.\n")
-        
+        return report.rows
+
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}\n")
-        session.rollback()
         raise
     finally:
-        session.close()
+        engine.dispose()
 
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Seed the programs table")
+    parser.add_argument("path", nargs="?", type=Path, default=SEED_DATA_PATH, help="JSON file of program records")
+    parser.add_argument("--append", action="store_true", help="Load even if the programs table is not empty")
+    args = parser.parse_args()
+
     print("\n" + "="*80)
     print("NoApplAI Programs Seeding Script")
     print("="*80 + "\n")
-    
+
     try:
-        # Run the async seeding function
-        asyncio.run(seed_programs())
+        seed_programs(args.path, args.append)
         print("✅ Seeding completed successfully!\n")
         return 0
     except KeyboardInterrupt:
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Incremental sync of the Programs table with a scraped catalog.
+
+Unlike seed_programs.py this works on a populated table: new programs are
+inserted, changed ones updated, unchanged ones left alone, and every change
+is recorded in program_changes. Changed program ids are published on the
+CATALOG_INVALIDATION_CHANNEL Redis channel after commit.
+
+Usage:
+    python sync_programs.py                          # programs_seed_data.json
+    python sync_programs.py scraped_catalog.json --deactivate-missing
+    python sync_programs.py scraped_catalog.json --dry-run --json
+"""
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine
+from app.core.config import settings
+from app.services.catalog_sync import redis_invalidation_handler, register_invalidation_handler, sync_catalog
+from app.services.program_import import SEED_DATA_PATH, load_seed_records
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Sync the programs table with a catalog file")
+    parser.add_argument("path", nargs="?", type=Path, default=SEED_DATA_PATH, help="JSON file of program records")
+    parser.add_argument("--deactivate-missing", action="store_true",
+                        help="Deactivate active programs that are not in the file (full catalog refresh)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    if not args.path.exists():
+        print(f"\n❌ Catalog file not found at {args.path}\n")
+        return 1
+
+    if settings.CATALOG_INVALIDATION_CHANNEL:
+        register_invalidation_handler(redis_invalidation_handler(settings.REDIS_URL, settings.CATALOG_INVALIDATION_CHANNEL))
+
+    sync_db_url = settings.DATABASE_URL.replace('postgresql+asyncpg://', 'postgresql://').replace('sqlite+aiosqlite://', 'sqlite://')
+    engine = create_engine(sync_db_url)
+    try:
+        records = load_seed_records(args.path)
+        result = sync_catalog(engine, records, deactivate_missing=args.deactivate_missing, dry_run=args.dry_run)
+    except Exception as e:
+        print(f"\n❌ Sync failed: {str(e)}\n")
+        return 1
+    finally:
+        engine.dispose()
+
+    if args.json:
+        print(json.dumps(result.summary(), indent=2))
+        return 0
+
+    summary = result.summary()
+    print(f"\n{'='*80}")
+    print(f"{'🔎 Dry run' if args.dry_run else '✅ Sync complete'} ({summary['sync_id']}) in {summary['seconds']:.2f} s")
+    for name in ("received", "created", "updated", "reactivated", "deactivated", "unchanged", "rejected"):
+        print(f"   {name:<12} {summary[name]:>8,}")
+    for index, reason in result.rejected[:20]:
+        print(f"   ⚠️  [{index + 1}] {reason}: {(records[index].get('title') or '')[:60]}")
+    print(f"{'='*80}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())